@@ -4,7 +4,27 @@ This package contains:
 - chess_pygame_original.py: Original pygame chess implementation
 - chess_game_runner.py: Clean architecture main runner
 - chess_board.py: Game logic and board state management
+- compact_board.py: Slotted bytearray board with the same API, for large game pools
+- board_snapshot.py: Binary save and restore of in-progress games
 - chess_renderer.py: Drawing and visual rendering
-- input_manager.py: Input event handling
+- input_manager.py: Input event handling, with recording to a file and replay
 - game_manager.py: Game state and flow control
+- zobrist.py: Position hashing keys
+- move_cache.py: LRU cache of legal moves keyed by position hash
+- movegen.py: Shared table-driven move generation for every frontend, with a differential check (python -m chess_pygame.movegen)
+- chess_engine.py: Computer player search
+- uci_runner.py: UCI protocol entry point for chess GUIs and match tools
+- notation.py: Standard Algebraic Notation (SAN) move conversion
+- pgn_reader.py: Streaming PGN reader with optional replay on ChessBoard
+- pgn_validator.py: Parallel PGN replay and validation (python -m chess_pygame.pgn_validator)
+- position_index.py: On-disk index of positions reached in a PGN archive
+- pgn_writer.py: PGN text output
+- game_archive.py: Compact binary game archive (one byte per move)
+- epd_runner.py: Parallel EPD test-suite runner for the engine
+- tournament.py: Concurrent self-play matches with Elo estimate and SPRT
+- game_server.py: Headless asyncio server hosting many games over a line protocol
+- benchmarks.py: Throughput measurements (python -m chess_pygame.benchmarks)
+- render_benchmark.py: Headless frame-time measurements for the renderer and the original game (python -m chess_pygame.render_benchmark)
+- frame_profiler.py: Per-phase frame timing with rolling percentiles (F3 overlay)
+- startup_profile.py: Lazy imports, startup timing (--startup-profile) and a cold-start budget check (python -m chess_pygame.startup_profile)
 """
\ No newline at end of file
@@ -0,0 +1,266 @@
+# Benchmarks.py - Throughput measurements for the chess core (run: python -m chess_pygame.benchmarks)
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List, Optional
+
+# Handle imports for both standalone and package execution
+try:
+    from .chess_board import ChessBoard
+    from . import pgn_reader
+    from . import game_archive
+    from .compact_board import CompactBoard
+    from .move_cache import LegalMoveCache
+    from . import movegen
+except ImportError:
+    from chess_board import ChessBoard
+    import pgn_reader
+    import game_archive
+    from compact_board import CompactBoard
+    from move_cache import LegalMoveCache
+    import movegen
+
+# ===== SAMPLE DATA =====
+
+def GenerateSampleFENs(count: int, seed: int = 1, max_plies: int = 60) -> List[str]:
+    """Make a reproducible list of positions by playing random games"""
+    rng = random.Random(seed)
+    chess_board = ChessBoard()
+    fens = []
+    while len(fens) < count:
+        chess_board.Reset()
+        for _ in range(rng.randint(0, max_plies)):
+            moves = chess_board.GetAllLegalMoves()
+            if not moves:
+                break
+            chess_board.MakeMove(*rng.choice(moves))
+        fens.append(chess_board.ToFEN())
+    return fens
+
+def LoadFENs(path: str) -> List[str]:
+    """Read one FEN per line (EPD lines work too: only the first four fields are kept)"""
+    fens = []
+    with open(path, encoding="utf-8") as fen_file:
+        for line in fen_file:
+            fields = line.split()
+            if len(fields) < 4:
+                continue
+            # FEN ends in two move counters, EPD has operations after field four
+            if len(fields) >= 6 and fields[4].isdigit() and fields[5].isdigit():
+                fens.append(" ".join(fields[:6]))
+            else:
+                fens.append(" ".join(fields[:4]))
+    return fens
+
+# ===== TIMING =====
+
+def TimeRepeated(action: Callable[[], None], repeat: int) -> float:
+    """Run an action several times, return the best wall time in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def ReportRate(label: str, count: int, seconds: float, unit: str):
+    """Print a throughput line"""
+    rate = count / seconds if seconds > 0 else float("inf")
+    print(f"{label:<28} {count:>9} {unit} in {seconds * 1000:9.1f} ms  = {rate:>12,.0f} {unit}/s")
+
+# ===== BENCHMARKS =====
+
+def BenchmarkFEN(fens: List[str], repeat: int = 5):
+    """Measure FromFEN and ToFEN throughput"""
+    chess_board = ChessBoard()
+
+    def ParseAll():
+        for fen in fens:
+            chess_board.FromFEN(fen)
+
+    def WriteAll():
+        for fen in fens:
+            chess_board.FromFEN(fen)
+            chess_board.ToFEN()
+
+    parse_seconds = TimeRepeated(ParseAll, repeat)
+    ReportRate("FromFEN", len(fens), parse_seconds, "fens")
+    # ToFEN alone = (parse + write) - parse
+    write_seconds = max(TimeRepeated(WriteAll, repeat) - parse_seconds, 1e-9)
+    ReportRate("ToFEN", len(fens), write_seconds, "fens")
+
+def BenchmarkPGN(path: str, replay: bool = False, chunk_size: int = pgn_reader.DEFAULT_CHUNK_SIZE):
+    """Measure streaming PGN throughput in games per second"""
+    games = moves = failed = 0
+    start = time.perf_counter()
+    for game in pgn_reader.ReadGames(path, chunk_size=chunk_size, replay=replay):
+        games += 1
+        moves += len(game.moves)
+        if game.error is not None:
+            failed += 1
+    seconds = time.perf_counter() - start
+
+    with open(path, "rb") as pgn_file:
+        size_mb = pgn_file.seek(0, 2) / (1024 * 1024)
+    ReportRate("PGN games" + (" (replayed)" if replay else ""), games, seconds, "games")
+    ReportRate("PGN moves", moves, seconds, "moves")
+    print(f"{'PGN data':<28} {size_mb:9.1f} MB   = {size_mb / seconds if seconds > 0 else 0:12.1f} MB/s")
+    if replay:
+        print(f"{'Games stopped by a bad move':<28} {failed:>9}")
+
+def BenchmarkArchive(pgn_path: str):
+    """Compare the binary archive with PGN for size and read speed"""
+    handle, archive_path = tempfile.mkstemp(suffix=".cpg")
+    os.close(handle)
+    try:
+        start = time.perf_counter()
+        games, truncated = game_archive.ConvertPgnToArchive(pgn_path, archive_path)
+        ReportRate("PGN -> archive", games, time.perf_counter() - start, "games")
+
+        pgn_size, archive_size = os.path.getsize(pgn_path), os.path.getsize(archive_path)
+        print(f"{'Size':<28} PGN {pgn_size:,} B, archive {archive_size:,} B "
+              f"({pgn_size / max(archive_size, 1):.1f}x smaller, {truncated} games cut short)")
+
+        start = time.perf_counter()
+        pgn_games = sum(1 for _ in pgn_reader.ReadGames(pgn_path))
+        ReportRate("Read PGN (SAN text only)", pgn_games, time.perf_counter() - start, "games")
+
+        start = time.perf_counter()
+        archive_games = sum(1 for _ in game_archive.ReadArchive(archive_path))
+        ReportRate("Read archive (move bytes)", archive_games, time.perf_counter() - start, "games")
+
+        start = time.perf_counter()
+        for _ in pgn_reader.ReadGames(pgn_path, replay=True):
+            pass
+        ReportRate("Read PGN + replay moves", pgn_games, time.perf_counter() - start, "games")
+
+        chess_board = ChessBoard()
+        start = time.perf_counter()
+        for game in game_archive.ReadArchive(archive_path):
+            game.GetMoves(chess_board)
+        ReportRate("Read archive + decode moves", archive_games, time.perf_counter() - start, "games")
+    finally:
+        os.remove(archive_path)
+
+def GenerateSampleGames(count: int, plies: int, seed: int = 1) -> List[list]:
+    """Random legal games as move lists, stopping before a king is taken"""
+    rng = random.Random(seed)
+    chess_board = ChessBoard()
+    games = []
+    for _ in range(count):
+        chess_board.Reset()
+        moves = []
+        for _ in range(plies):
+            legal_moves = chess_board.GetAllLegalMoves()
+            move = rng.choice(legal_moves) if legal_moves else None
+            if move is None or chess_board.GetPiece(*move[1]).lower() == 'k':
+                break
+            moves.append(move)
+            chess_board.MakeMove(*move)
+        games.append(moves)
+    return games
+
+def BenchmarkBoards(game_count: int = 10000, plies: int = 40):
+    """Compare ChessBoard with CompactBoard for memory per game and move speed"""
+    games = GenerateSampleGames(min(game_count, 500), plies)
+    for board_class in (ChessBoard, CompactBoard):
+        name = board_class.__name__
+        move_cache = LegalMoveCache(1)  # Effectively off, so every move is generated
+
+        # Memory of a pool of live games, each partway through
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        pool = [board_class(move_cache) for _ in range(game_count)]
+        for index, board in enumerate(pool):
+            for move in games[index % len(games)][:plies // 2]:
+                board.MakeMove(*move)
+        bytes_per_game = (tracemalloc.get_traced_memory()[0] - before) / game_count
+        tracemalloc.stop()
+        del pool
+        print(f"{name + ' memory':<28} {bytes_per_game:9,.0f} bytes per game (after {plies // 2} plies)")
+
+        board = board_class(move_cache)
+
+        def ValidateAll():
+            for moves in games:
+                board.Reset()
+                for move in moves:
+                    board.TryMakeMove(*move)
+
+        def MakeAndUndoAll():
+            for moves in games:
+                board.Reset()
+                for move in moves:
+                    board.MakeMove(*move)
+                while board.UndoMove():
+                    pass
+
+        move_count = sum(len(moves) for moves in games)
+        ReportRate(f"{name} validated moves", move_count, TimeRepeated(ValidateAll, 3), "moves")
+        ReportRate(f"{name} make + undo", move_count, TimeRepeated(MakeAndUndoAll, 3), "moves")
+
+def BenchmarkMoveGeneration(position_count: int = 2000, repeat: int = 5):
+    """Compare the shared movegen core with the readable piece classes it replaced"""
+    positions = []
+    for moves in GenerateSampleGames(max(1, position_count // 40), 40):
+        chess_board = ChessBoard(LegalMoveCache(1))
+        for move in moves:
+            chess_board.MakeMove(*move)
+            positions.append([board_row[:] for board_row in chess_board.board])
+    positions = positions[:position_count]
+    squares = [(board, row, col) for board in positions for row in range(8) for col in range(8)
+               if board[row][col] != "."]
+
+    for label, generate in (("pieces.py classes", movegen.ReferenceMoves), ("movegen core", movegen.GenerateMoves)):
+        def GenerateAll():
+            for board, row, col in squares:
+                generate(board, row, col)
+        ReportRate(label, len(squares), TimeRepeated(GenerateAll, repeat), "pieces")
+
+# ===== MAIN ENTRY POINT =====
+
+def main(argv: Optional[List[str]] = None):
+    """Run the benchmark named on the command line"""
+    parser = argparse.ArgumentParser(description="Chess core benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    fen_parser = subparsers.add_parser("fen", help="FEN import/export throughput")
+    fen_parser.add_argument("--file", help="FEN or EPD file to load (default: generated positions)")
+    fen_parser.add_argument("--count", type=int, default=20000, help="Generated positions")
+    fen_parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+
+    pgn_parser = subparsers.add_parser("pgn", help="Streaming PGN reader throughput")
+    pgn_parser.add_argument("file", help="PGN file to read")
+    pgn_parser.add_argument("--replay", action="store_true", help="Also play every game on a ChessBoard")
+    pgn_parser.add_argument("--chunk-size", type=int, default=pgn_reader.DEFAULT_CHUNK_SIZE, help="Bytes per read")
+
+    archive_parser = subparsers.add_parser("archive", help="Binary archive vs PGN size and speed")
+    archive_parser.add_argument("file", help="PGN file to convert and compare")
+
+    board_parser = subparsers.add_parser("board", help="ChessBoard vs CompactBoard memory and move speed")
+    board_parser.add_argument("--games", type=int, default=10000, help="Live games in the memory pool")
+    board_parser.add_argument("--plies", type=int, default=40, help="Moves per sample game")
+
+    movegen_parser = subparsers.add_parser("movegen", help="Shared move generator vs the pieces.py classes")
+    movegen_parser.add_argument("--positions", type=int, default=2000, help="Positions from random games")
+    movegen_parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+
+    args = parser.parse_args(argv)
+    if args.benchmark == "fen":
+        fens = LoadFENs(args.file) if args.file else GenerateSampleFENs(args.count)
+        BenchmarkFEN(fens, args.repeat)
+    elif args.benchmark == "pgn":
+        BenchmarkPGN(args.file, args.replay, args.chunk_size)
+    elif args.benchmark == "archive":
+        BenchmarkArchive(args.file)
+    elif args.benchmark == "board":
+        BenchmarkBoards(args.games, args.plies)
+    elif args.benchmark == "movegen":
+        BenchmarkMoveGeneration(args.positions, args.repeat)
+
+if __name__ == '__main__':
+    main()
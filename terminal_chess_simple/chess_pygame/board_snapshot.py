@@ -0,0 +1,184 @@
+# BoardSnapshot.py - Binary save and restore of in-progress games
+
+import argparse
+import gc
+import os
+import struct
+import time
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+# Handle imports for both standalone and package execution
+try:
+    from .chess_board import ChessBoard, MoveRecord
+    from . import zobrist
+    from .move_cache import shared_cache
+except ImportError:
+    from chess_board import ChessBoard, MoveRecord
+    import zobrist
+    from move_cache import shared_cache
+
+# Snapshot of one board: a fixed 53-byte header, then 8 bytes per move played.
+#   squares: 64 nibbles, a8 to h1 (0 = empty, 1-12 = index into PIECE_CODES)
+#   flags: bit 0 set when white is to move
+#   halfmove clock, fullmove number the game started at, Zobrist key, move count
+SNAPSHOT = struct.Struct("<32sBIIQI")
+# Per move: from square, to square, moved piece, captured piece (ASCII), halfmove clock before it
+MOVE = struct.Struct("<BBBBI")
+# Counters are 32-bit. The halfmove clock keeps growing on the server (nothing
+# ends a game at 50 moves), so 16 bits could be outgrown in play; 32 bits only
+# by a FEN with absurd counters, which SaveBoard refuses.
+MAX_COUNTER = 0xFFFFFFFF
+
+# Snapshot file: magic and game count, then per game a 4-byte id and its snapshot
+MAGIC = b"CPYSNAP2"
+FILE_HEADER = struct.Struct("<8sI")
+GAME_ID = struct.Struct("<I")
+
+PIECE_CODES = "." + zobrist.PIECE_CHARS
+_WHITE_TO_MOVE = 1
+
+# Two squares per byte: lookup tables between byte values and square pairs
+_PAIR_TO_BYTE = {a + b: (i << 4) | j for i, a in enumerate(PIECE_CODES) for j, b in enumerate(PIECE_CODES)}
+_BYTE_TO_PAIR = [""] * 256
+for _pair, _value in _PAIR_TO_BYTE.items():
+    _BYTE_TO_PAIR[_value] = _pair
+
+# Decoding tables for move records
+_SQUARES = [divmod(square, 8) for square in range(64)]
+_CHARS = [chr(code) for code in range(128)]
+
+# ===== SINGLE BOARD =====
+
+def SaveBoard(chess_board: ChessBoard) -> bytes:
+    """Serialize the position, counters, hash and move history of a board
+
+    Raises ValueError if a move counter doesn't fit in the snapshot (over MAX_COUNTER).
+    """
+    squares = "".join("".join(board_row) for board_row in chess_board.board)
+    packed = bytes(_PAIR_TO_BYTE[squares[i:i + 2]] for i in range(0, 64, 2))
+    history = chess_board.move_history
+    try:
+        record = bytearray(SNAPSHOT.pack(
+            packed, _WHITE_TO_MOVE if chess_board.current_turn_white else 0, chess_board.halfmove_clock,
+            chess_board.start_fullmove_number, chess_board.hash_key, len(history)))
+        for move in history:
+            record += MOVE.pack(move.from_pos[0] * 8 + move.from_pos[1], move.to_pos[0] * 8 + move.to_pos[1],
+                                ord(move.piece), ord(move.captured), move.halfmove_clock)
+    except struct.error:
+        raise ValueError(f"Move counters too large for a snapshot: {chess_board.ToFEN()}")
+    return bytes(record)
+
+def LoadBoard(data: Union[bytes, memoryview], position: int = 0,
+              chess_board: Optional[ChessBoard] = None) -> Tuple[ChessBoard, int]:
+    """Restore a board from a snapshot, returns (board, position after the snapshot)
+
+    Raises ValueError if the data is cut short or the stored hash doesn't match
+    the squares, which catches most corruption.
+    """
+    view = memoryview(data)
+    if position + SNAPSHOT.size > len(view):
+        raise ValueError("Snapshot is cut short")
+    packed, flags, halfmove_clock, fullmove_number, hash_key, move_count = SNAPSHOT.unpack_from(view, position)
+    position += SNAPSHOT.size
+    end = position + move_count * MOVE.size
+    if end > len(view):
+        raise ValueError("Snapshot move history is cut short")
+
+    squares, chars, make_record = _SQUARES, _CHARS, MoveRecord._make
+    history = [make_record((squares[from_square], squares[to_square], chars[piece], chars[captured], clock))
+               for from_square, to_square, piece, captured, clock in MOVE.iter_unpack(view[position:end])]
+    if chess_board is None:
+        # Skip the constructor's start position setup, LoadPosition replaces all of it
+        chess_board = ChessBoard.__new__(ChessBoard)
+        chess_board.move_cache = shared_cache
+    chess_board.LoadPosition("".join([_BYTE_TO_PAIR[value] for value in packed]), bool(flags & _WHITE_TO_MOVE),
+                             halfmove_clock, fullmove_number, history)
+    if chess_board.hash_key != hash_key:
+        raise ValueError("Snapshot hash does not match its position")
+    return chess_board, end
+
+# ===== MANY GAMES =====
+
+def SaveGames(path: str, games: Dict[int, ChessBoard]):
+    """Write every game to one file, built in memory and written in one go"""
+    data = bytearray(FILE_HEADER.pack(MAGIC, len(games)))
+    for game_id, chess_board in games.items():
+        data += GAME_ID.pack(game_id)
+        data += SaveBoard(chess_board)
+
+    # Write beside the old file and swap, so a crash mid-save can't lose both
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as snapshot_file:
+        snapshot_file.write(data)
+    os.replace(temp_path, path)
+
+def IterateGames(path: str) -> Iterator[Tuple[int, ChessBoard]]:
+    """Yield (game id, board) for every game in a snapshot file"""
+    with open(path, "rb") as snapshot_file:
+        view = memoryview(snapshot_file.read())
+    if len(view) < FILE_HEADER.size:
+        raise ValueError(f"Not a snapshot file: {path}")
+    magic, count = FILE_HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Not a snapshot file: {path}")
+
+    position = FILE_HEADER.size
+    for _ in range(count):
+        if position + GAME_ID.size > len(view):
+            raise ValueError("Snapshot file is cut short")
+        game_id, = GAME_ID.unpack_from(view, position)
+        chess_board, position = LoadBoard(view, position + GAME_ID.size)
+        yield game_id, chess_board
+
+def LoadGames(path: str) -> Dict[int, ChessBoard]:
+    """Restore every game of a snapshot file"""
+    # Hundreds of thousands of move records are created and none are garbage;
+    # collection passes during the load would only scan them
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return dict(IterateGames(path))
+    finally:
+        if was_enabled:
+            gc.enable()
+
+# ===== MAIN ENTRY POINT =====
+
+def main(argv=None):
+    """Time a save and restore of many in-progress games"""
+    parser = argparse.ArgumentParser(description="Benchmark bulk game snapshots")
+    parser.add_argument("--games", type=int, default=10000, help="Games to save and restore")
+    parser.add_argument("--plies", type=int, default=40, help="Moves played in each game")
+    parser.add_argument("--file", default="games.snap", help="Snapshot file to write")
+    args = parser.parse_args(argv)
+
+    # Imported here so the module itself doesn't depend on the benchmark helpers
+    try:
+        from .benchmarks import GenerateSampleGames
+    except ImportError:
+        from benchmarks import GenerateSampleGames
+
+    scripts = GenerateSampleGames(min(args.games, 500), args.plies)
+    games = {}
+    for game_id in range(args.games):
+        chess_board = ChessBoard()
+        for move in scripts[game_id % len(scripts)]:
+            chess_board.MakeMove(*move)
+        games[game_id] = chess_board
+
+    start = time.perf_counter()
+    SaveGames(args.file, games)
+    save_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    restored = LoadGames(args.file)
+    load_seconds = time.perf_counter() - start
+
+    mismatched = sum(1 for game_id, chess_board in games.items()
+                     if restored[game_id].ToFEN() != chess_board.ToFEN()
+                     or restored[game_id].move_history != chess_board.move_history)
+    size = os.path.getsize(args.file)
+    print(f"{len(games)} games, {size:,} bytes ({size / len(games):.0f} per game)")
+    print(f"Save {save_seconds * 1000:.1f} ms, restore {load_seconds * 1000:.1f} ms, {mismatched} mismatched")
+
+if __name__ == '__main__':
+    main()
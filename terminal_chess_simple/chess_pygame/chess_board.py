@@ -1,13 +1,17 @@
 # ChessBoard.py - Handles board state and game logic (like a GameManager in Unity)
 
-from typing import List, Tuple, Optional
+from typing import Dict, List, Set, Tuple, Optional, NamedTuple
 from enum import Enum
 
 # Handle imports for both standalone and package execution
 try:
-    from .pieces import PieceFactory
+    from . import movegen
+    from . import zobrist
+    from .move_cache import LegalMoveCache, shared_cache
 except ImportError:
-    from pieces import PieceFactory
+    import movegen
+    import zobrist
+    from move_cache import LegalMoveCache, shared_cache
 
 class PieceType(Enum):
     PAWN = 'p'
@@ -17,23 +21,136 @@ class PieceType(Enum):
     QUEEN = 'q'
     KING = 'k'
 
+class MoveRecord(NamedTuple):
+    """Everything needed to take a move back"""
+    from_pos: Tuple[int, int]
+    to_pos: Tuple[int, int]
+    piece: str       # Piece that moved (a pawn stays a pawn here even if it promoted)
+    captured: str    # Piece that stood on the target square, "." if none
+    halfmove_clock: int  # Clock value before the move
+
+# Forsyth-Edwards Notation of the starting position
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+_SQUARE_POSITIONS = [divmod(square, 8) for square in range(64)]  # Square index -> (row, col)
+
 class ChessBoard:
-    def __init__(self):
+    def __init__(self, move_cache: Optional[LegalMoveCache] = None):
+        self.move_cache = move_cache if move_cache is not None else shared_cache
         self.Reset()
     
     def Reset(self):
         """Initialize the board to starting position"""
-        self.board = [
-            ["r","n","b","q","k","b","n","r"],
-            ["p","p","p","p","p","p","p","p"],
-            [".",".",".",".",".",".",".","."],
-            [".",".",".",".",".",".",".","."],
-            [".",".",".",".",".",".",".","."],
-            [".",".",".",".",".",".",".","."],
-            ["P","P","P","P","P","P","P","P"],
-            ["R","N","B","Q","K","B","N","R"]
-        ]
-        self.current_turn_white = True
+        self.FromFEN(START_FEN)
+    
+    # ===== FEN IMPORT / EXPORT =====
+    
+    def FromFEN(self, fen: str):
+        """Load a position from FEN text, raises ValueError if it is malformed
+        
+        Squares, hash and piece lists are all filled in one pass over the text.
+        Castling and en passant fields are accepted but ignored, since the move
+        rules don't support them yet.
+        """
+        fields = fen.split()
+        if len(fields) < 2:
+            raise ValueError(f"FEN needs at least placement and side to move: {fen!r}")
+        
+        board = [[".", ".", ".", ".", ".", ".", ".", "."] for _ in range(8)]
+        piece_lists: Dict[str, Set[Tuple[int, int]]] = {piece: set() for piece in zobrist.PIECE_CHARS}
+        piece_keys = zobrist.PIECE_KEYS
+        hash_key = 0
+        row = col = 0
+        for char in fields[0]:
+            if char == "/":
+                if col != 8 or row == 7:
+                    raise ValueError(f"Bad rank in FEN: {fen!r}")
+                row += 1
+                col = 0
+            elif "1" <= char <= "8":
+                col += ord(char) - 48
+                if col > 8:
+                    raise ValueError(f"Rank too long in FEN: {fen!r}")
+            else:
+                keys = piece_keys.get(char)
+                if keys is None or col > 7:
+                    raise ValueError(f"Bad piece placement in FEN: {fen!r}")
+                board[row][col] = char
+                piece_lists[char].add((row, col))
+                hash_key ^= keys[row * 8 + col]
+                col += 1
+        if row != 7 or col != 8:
+            raise ValueError(f"FEN must describe 8 full ranks: {fen!r}")
+        
+        side = fields[1]
+        if side not in ("w", "b"):
+            raise ValueError(f"Bad side to move in FEN: {fen!r}")
+        try:
+            halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+            fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+        except ValueError:
+            raise ValueError(f"Bad move counters in FEN: {fen!r}")
+        if halfmove_clock < 0 or fullmove_number < 1:
+            raise ValueError(f"Bad move counters in FEN: {fen!r}")
+        
+        self.board = board
+        self.piece_lists = piece_lists
+        self.current_turn_white = side == "w"
+        self.hash_key = hash_key if self.current_turn_white else hash_key ^ zobrist.SIDE_KEY
+        self.halfmove_clock = halfmove_clock
+        self.start_fullmove_number = fullmove_number
+        self.start_turn_white = self.current_turn_white
+        self.move_history: List[MoveRecord] = []
+    
+    def LoadPosition(self, squares: str, white_to_move: bool, halfmove_clock: int = 0,
+                     start_fullmove_number: int = 1, move_history: Optional[List[MoveRecord]] = None):
+        """Set up a position from 64 piece characters (a8 to h1), e.g. when restoring a snapshot
+
+        move_history holds the moves that led here; the start of the game is
+        the position before the first of them.
+        """
+        if len(squares) != 64:
+            raise ValueError(f"Position needs 64 squares, got {len(squares)}")
+        piece_lists: Dict[str, Set[Tuple[int, int]]] = {piece: set() for piece in zobrist.PIECE_CHARS}
+        piece_keys = zobrist.PIECE_KEYS
+        hash_key = 0
+        for square, piece in enumerate(squares):
+            if piece != ".":
+                keys = piece_keys.get(piece)
+                if keys is None:
+                    raise ValueError(f"Unknown piece {piece!r}")
+                piece_lists[piece].add(_SQUARE_POSITIONS[square])
+                hash_key ^= keys[square]
+
+        move_history = list(move_history or [])
+        self.board = [list(squares[row * 8:row * 8 + 8]) for row in range(8)]
+        self.piece_lists = piece_lists
+        self.current_turn_white = white_to_move
+        self.hash_key = hash_key if white_to_move else hash_key ^ zobrist.SIDE_KEY
+        self.halfmove_clock = halfmove_clock
+        self.start_fullmove_number = start_fullmove_number
+        self.start_turn_white = white_to_move == (len(move_history) % 2 == 0)
+        self.move_history = move_history
+
+    def ToFEN(self) -> str:
+        """Describe the current position as FEN text"""
+        ranks = []
+        for board_row in self.board:
+            rank = ""
+            empty = 0
+            for piece in board_row:
+                if piece == ".":
+                    empty += 1
+                else:
+                    if empty:
+                        rank += str(empty)
+                        empty = 0
+                    rank += piece
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+        side = "w" if self.current_turn_white else "b"
+        return f"{'/'.join(ranks)} {side} - - {self.halfmove_clock} {self.GetFullmoveNumber()}"
     
     # ===== BOARD QUERIES =====
     
@@ -44,10 +161,22 @@ class ChessBoard:
         return "."
     
     def SetPiece(self, row: int, col: int, piece: str):
-        """Set piece at position"""
+        """Set piece at position (keeps the position hash up to date)"""
         if self.IsValidPosition(row, col):
+            old_piece = self.board[row][col]
+            square = row * 8 + col
+            if old_piece != ".":
+                self.hash_key ^= zobrist.PIECE_KEYS[old_piece][square]
+                self.piece_lists[old_piece].discard((row, col))
+            if piece != ".":
+                self.hash_key ^= zobrist.PIECE_KEYS[piece][square]
+                self.piece_lists[piece].add((row, col))
             self.board[row][col] = piece
     
+    def GetPieceSquares(self, piece: str) -> Set[Tuple[int, int]]:
+        """Get the squares holding a given piece (e.g. 'N' for white knights)"""
+        return self.piece_lists.get(piece, set())
+    
     def IsValidPosition(self, row: int, col: int) -> bool:
         """Check if coordinates are within board bounds"""
         return 0 <= row < 8 and 0 <= col < 8
@@ -85,13 +214,28 @@ class ChessBoard:
         if piece_char == ".":
             return []
         
-        try:
-            piece = PieceFactory.create_piece(piece_char)
-            return piece.get_moves(row, col, self)
-        except ValueError:
-            return []
+        # Same position and square as before - reuse the earlier result
+        square = row * 8 + col
+        moves = self.move_cache.Get(self.hash_key, square)
+        if moves is not None:
+            return moves
+        
+        moves = movegen.GenerateMoves(self.board, row, col)
+        self.move_cache.Put(self.hash_key, square, moves)
+        return moves
     
-
+    def GetAllLegalMoves(self) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Get every (from_pos, to_pos) move for the player to move, in board order"""
+        all_moves = []
+        for row, col in self.GetPlayerPieceSquares():
+            for to_pos in self.GetLegalMoves(row, col):
+                all_moves.append(((row, col), to_pos))
+        return all_moves
+    
+    def GetPlayerPieceSquares(self) -> List[Tuple[int, int]]:
+        """Get the squares of the current player's pieces, in board order (a8 to h1)"""
+        own_pieces = "PNBRQK" if self.current_turn_white else "pnbrqk"
+        return sorted(square for piece in own_pieces for square in self.piece_lists[piece])
     
     # ===== GAME ACTIONS =====
     
@@ -109,8 +253,26 @@ class ChessBoard:
         if to_pos not in legal_moves:
             return False
         
+        self.MakeMove(from_pos, to_pos)
+        return True
+    
+    def MakeMove(self, from_pos: Tuple[int, int], to_pos: Tuple[int, int]) -> bool:
+        """Play a move without validating it (used by search), returns True on promotion"""
+        from_row, from_col = from_pos
+        to_row, to_col = to_pos
+        
+        # Remember what is needed to take the move back
+        piece = self.board[from_row][from_col]
+        captured = self.board[to_row][to_col]
+        self.move_history.append(MoveRecord(from_pos, to_pos, piece, captured, self.halfmove_clock))
+        
+        # Pawn moves and captures reset the fifty-move clock
+        if piece.lower() == 'p' or captured != ".":
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        
         # Execute move
-        piece = self.GetPiece(from_row, from_col)
         self.SetPiece(to_row, to_col, piece)
         self.SetPiece(from_row, from_col, ".")
         
@@ -118,10 +280,27 @@ class ChessBoard:
         promoted = self._HandlePawnPromotion(to_row, to_col)
         
         # Switch turns
-        self.current_turn_white = not self.current_turn_white
+        self._SwitchTurn()
+        
+        return promoted
+    
+    def UndoMove(self) -> bool:
+        """Take back the last move, returns False if there is nothing to undo"""
+        if not self.move_history:
+            return False
         
+        record = self.move_history.pop()
+        self.SetPiece(record.from_pos[0], record.from_pos[1], record.piece)
+        self.SetPiece(record.to_pos[0], record.to_pos[1], record.captured)
+        self.halfmove_clock = record.halfmove_clock
+        self._SwitchTurn()
         return True
     
+    def _SwitchTurn(self):
+        """Hand the move to the other player"""
+        self.current_turn_white = not self.current_turn_white
+        self.hash_key ^= zobrist.SIDE_KEY
+    
     def _HandlePawnPromotion(self, row: int, col: int) -> bool:
         """Handle pawn promotion to queen"""
         piece = self.GetPiece(row, col)
@@ -142,4 +321,13 @@ class ChessBoard:
     
     def IsWhiteTurn(self) -> bool:
         """Check if it's white's turn"""
-        return self.current_turn_white
\ No newline at end of file
+        return self.current_turn_white
+    
+    def GetFullmoveNumber(self) -> int:
+        """Get the move number (starts at 1, goes up after each black move)"""
+        plies = len(self.move_history) + (0 if self.start_turn_white else 1)
+        return self.start_fullmove_number + plies // 2
+    
+    def GetHash(self) -> int:
+        """Get the Zobrist key of the current position"""
+        return self.hash_key
\ No newline at end of file
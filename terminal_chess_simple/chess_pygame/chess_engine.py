@@ -0,0 +1,335 @@
+# ChessEngine.py - Computer player search (like an AI controller in Unity)
+
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+# Handle imports for both standalone and package execution
+try:
+    from .chess_board import ChessBoard
+except ImportError:
+    from chess_board import ChessBoard
+
+Move = Tuple[Tuple[int, int], Tuple[int, int]]
+
+# Material values in centipawns. The king is worth "the game": the rules here
+# have no check detection, so losing the king is how a game is lost.
+PIECE_VALUES = {'p': 100, 'n': 320, 'b': 330, 'r': 500, 'q': 900, 'k': 0}
+MATE_SCORE = 100000
+INFINITE_SCORE = 1000000
+MAX_DEPTH = 64
+
+# Small bonus for pieces near the centre of the board (indexed by row/col)
+_CENTRE_BONUS = [0, 2, 6, 10, 10, 6, 2, 0]
+
+def MoveToUci(move: Move, board: Optional[ChessBoard] = None) -> str:
+    """Convert ((row, col), (row, col)) to UCI text like 'e2e4' or 'e7e8q'"""
+    (from_row, from_col), (to_row, to_col) = move
+    text = f"{chr(ord('a')+from_col)}{8-from_row}{chr(ord('a')+to_col)}{8-to_row}"
+    if board is not None:
+        piece = board.GetPiece(from_row, from_col)
+        if piece.lower() == 'p' and to_row in (0, 7):
+            text += 'q'  # Pawns always promote to a queen
+    return text
+
+def UciToMove(text: str) -> Move:
+    """Convert UCI text like 'e2e4' to ((row, col), (row, col))"""
+    text = text.strip().lower()
+    if len(text) not in (4, 5) or (len(text) == 5 and text[4] != 'q'):
+        raise ValueError(f"Unsupported move: {text}")
+    squares = []
+    for file_char, rank_char in (text[0:2], text[2:4]):
+        col = ord(file_char) - ord('a')
+        row = 8 - (ord(rank_char) - ord('0'))
+        if not (0 <= row < 8 and 0 <= col < 8):
+            raise ValueError(f"Invalid square in move: {text}")
+        squares.append((row, col))
+    return squares[0], squares[1]
+
+class SearchLimits:
+    """How long a search may run (all times in milliseconds)"""
+    def __init__(self):
+        self.depth: Optional[int] = None
+        self.nodes: Optional[int] = None
+        self.movetime: Optional[int] = None
+        self.wtime: Optional[int] = None
+        self.btime: Optional[int] = None
+        self.winc: int = 0
+        self.binc: int = 0
+        self.movestogo: Optional[int] = None
+        self.infinite: bool = False
+        self.ponder: bool = False  # Thinking on the opponent's time until ponderhit
+        self.white_to_move: bool = True  # Side to move at the root, whose clock a ponderhit uses
+
+    def GetTimeBudget(self, white_to_move: bool) -> Optional[float]:
+        """Seconds to spend on this move, or None for no time limit"""
+        if self.infinite or self.ponder:
+            return None
+        if self.movetime is not None:
+            return self.movetime / 1000.0
+        remaining = self.wtime if white_to_move else self.btime
+        if remaining is None:
+            return None
+        increment = self.winc if white_to_move else self.binc
+        moves_left = self.movestogo or 30
+        budget = remaining / moves_left + increment * 0.8
+        # Never plan to use more than half of the clock on one move
+        return max(0.01, min(budget, remaining * 0.5)) / 1000.0
+
+class SearchResult:
+    """Outcome of a finished search"""
+    def __init__(self, best_move: Optional[Move], ponder_move: Optional[Move], score: int, depth: int, nodes: int):
+        self.best_move = best_move
+        self.ponder_move = ponder_move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+
+class TranspositionTable:
+    """Fixed-size table of earlier search results, indexed by position hash"""
+    ENTRY_BYTES = 64  # Rough size of one entry (tuple + ints) in CPython
+    EXACT, LOWER, UPPER = 0, 1, 2
+
+    def __init__(self, size_mb: int = 16):
+        self.Resize(size_mb)
+
+    def Resize(self, size_mb: int):
+        """Reallocate the table to roughly size_mb megabytes (clears it)"""
+        self.size = max(1024, size_mb * 1024 * 1024 // self.ENTRY_BYTES)
+        self.entries: List[Optional[tuple]] = [None] * self.size
+
+    def Clear(self):
+        """Forget all stored positions"""
+        self.entries = [None] * self.size
+
+    def Probe(self, key: int) -> Optional[tuple]:
+        """Return (key, depth, score, flag, move) for this position, if stored"""
+        entry = self.entries[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def Store(self, key: int, depth: int, score: int, flag: int, move: Optional[Move]):
+        """Store a search result, replacing whatever shared the slot"""
+        self.entries[key % self.size] = (key, depth, score, flag, move)
+
+class ChessEngine:
+    """Iterative-deepening alpha-beta search over ChessBoard positions"""
+    def __init__(self, hash_mb: int = 16):
+        self.transposition_table = TranspositionTable(hash_mb)
+        self.stop_event = threading.Event()
+        self.nodes = 0
+        self._deadline: Optional[float] = None
+        self._node_limit: Optional[int] = None
+        self._next_check = 0  # Node count at which _Negamax next checks the limits
+
+    # ===== CONFIGURATION =====
+
+    def SetHashSize(self, size_mb: int):
+        """Resize the transposition table"""
+        self.transposition_table.Resize(size_mb)
+
+    def NewGame(self):
+        """Forget everything learned in the previous game"""
+        self.transposition_table.Clear()
+
+    # ===== SEARCH CONTROL =====
+
+    def Stop(self):
+        """Ask a running search to finish as soon as possible"""
+        self.stop_event.set()
+
+    def SetDeadline(self, seconds_from_now: Optional[float]):
+        """Change the time limit of a running search (used on ponderhit)"""
+        self._deadline = None if seconds_from_now is None else time.perf_counter() + seconds_from_now
+
+    def Search(self, chess_board: ChessBoard, limits: SearchLimits,
+               info_callback: Optional[Callable[[dict], None]] = None) -> SearchResult:
+        """Search the position and return the best move found before the limits ran out"""
+        self.stop_event.clear()
+        self.nodes = 0
+        self._node_limit = limits.nodes
+        self._next_check = 0
+        self.SetDeadline(limits.GetTimeBudget(chess_board.IsWhiteTurn()))
+        start_time = time.perf_counter()
+
+        root_moves = chess_board.GetAllLegalMoves()
+        if not root_moves:
+            return SearchResult(None, None, 0, 0, 0)
+
+        best_move, ponder_move, best_score, completed_depth = root_moves[0], None, 0, 0
+        max_depth = min(limits.depth or MAX_DEPTH, MAX_DEPTH)
+        for depth in range(1, max_depth + 1):
+            score = self._Negamax(chess_board, depth, 0, -INFINITE_SCORE, INFINITE_SCORE)
+            if self._ShouldStop() and completed_depth > 0:
+                break  # Partial iteration - keep the last complete result
+
+            entry = self.transposition_table.Probe(chess_board.GetHash())
+            if entry is not None and entry[4] is not None:
+                best_move, best_score, completed_depth = entry[4], score, depth
+                pv = self._ExtractPV(chess_board, depth)
+                ponder_move = pv[1] if len(pv) > 1 else None
+                if info_callback is not None:
+                    elapsed = time.perf_counter() - start_time
+                    info_callback({
+                        'depth': depth,
+                        'score': score,
+                        'nodes': self.nodes,
+                        'time_ms': int(elapsed * 1000),
+                        'nps': int(self.nodes / elapsed) if elapsed > 0 else 0,
+                        'pv': pv,
+                    })
+
+            if self._ShouldStop() or abs(score) >= MATE_SCORE - MAX_DEPTH:
+                break
+
+        return SearchResult(best_move, ponder_move, best_score, completed_depth, self.nodes)
+
+    def _ShouldStop(self) -> bool:
+        """Check the stop flag and the time/node limits, setting the flag once a limit is reached
+
+        The whole search unwinds on the flag, so a reached limit must set it.
+        """
+        if self.stop_event.is_set():
+            return True
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            self.stop_event.set()
+            return True
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            self.stop_event.set()
+            return True
+        # Look at the clock every 1024 nodes, but stop right at the node limit
+        self._next_check = self.nodes + 1024
+        if self._node_limit is not None:
+            self._next_check = min(self._next_check, self._node_limit)
+        return False
+
+    # ===== SEARCH =====
+
+    def _Negamax(self, chess_board: ChessBoard, depth: int, ply: int, alpha: int, beta: int) -> int:
+        """Alpha-beta search, score is from the side to move's point of view"""
+        self.nodes += 1
+        if self.nodes >= self._next_check and self._ShouldStop():
+            return 0
+
+        if depth <= 0:
+            return self._Quiescence(chess_board, ply, alpha, beta)
+
+        key = chess_board.GetHash()
+        entry = self.transposition_table.Probe(key)
+        tt_move = None
+        if entry is not None:
+            tt_move = entry[4]
+            if ply > 0 and entry[1] >= depth:
+                score, flag = entry[2], entry[3]
+                if flag == TranspositionTable.EXACT:
+                    return score
+                if flag == TranspositionTable.LOWER and score >= beta:
+                    return score
+                if flag == TranspositionTable.UPPER and score <= alpha:
+                    return score
+
+        moves = self._OrderMoves(chess_board, chess_board.GetAllLegalMoves(), tt_move)
+        if not moves:
+            return 0  # No moves at all - treat as a draw
+
+        original_alpha = alpha
+        best_score, best_move = -INFINITE_SCORE, None
+        for move in moves:
+            captured = chess_board.GetPiece(*move[1])
+            if captured.lower() == 'k':
+                score = MATE_SCORE - ply  # Capturing the king wins immediately
+            else:
+                chess_board.MakeMove(move[0], move[1])
+                score = -self._Negamax(chess_board, depth - 1, ply + 1, -beta, -alpha)
+                chess_board.UndoMove()
+
+            if self.stop_event.is_set():
+                return 0
+
+            if score > best_score:
+                best_score, best_move = score, move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if self.stop_event.is_set():
+            return 0  # Scores of an interrupted search must not reach the table
+        if best_score <= original_alpha:
+            flag = TranspositionTable.UPPER
+        elif best_score >= beta:
+            flag = TranspositionTable.LOWER
+        else:
+            flag = TranspositionTable.EXACT
+        self.transposition_table.Store(key, depth, best_score, flag, best_move)
+        return best_score
+
+    def _Quiescence(self, chess_board: ChessBoard, ply: int, alpha: int, beta: int) -> int:
+        """Search captures only, so the evaluation is not taken mid-exchange"""
+        self.nodes += 1
+        stand_pat = self.Evaluate(chess_board)
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        captures = [move for move in chess_board.GetAllLegalMoves()
+                    if not chess_board.IsEmpty(*move[1])]
+        for move in self._OrderMoves(chess_board, captures, None):
+            if chess_board.GetPiece(*move[1]).lower() == 'k':
+                return MATE_SCORE - ply
+            chess_board.MakeMove(move[0], move[1])
+            score = -self._Quiescence(chess_board, ply + 1, -beta, -alpha)
+            chess_board.UndoMove()
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def _OrderMoves(self, chess_board: ChessBoard, moves: List[Move], tt_move: Optional[Move]) -> List[Move]:
+        """Try the remembered best move first, then captures by most valuable victim"""
+        def MoveOrderKey(move: Move) -> int:
+            if move == tt_move:
+                return -10 * INFINITE_SCORE
+            victim = chess_board.GetPiece(*move[1])
+            if victim == ".":
+                return 0
+            attacker = chess_board.GetPiece(*move[0])
+            victim_value = MATE_SCORE if victim.lower() == 'k' else PIECE_VALUES[victim.lower()]
+            return -(victim_value * 10 - PIECE_VALUES[attacker.lower()])
+        return sorted(moves, key=MoveOrderKey)
+
+    def _ExtractPV(self, chess_board: ChessBoard, max_length: int) -> List[Move]:
+        """Follow best moves through the transposition table"""
+        pv = []
+        seen = set()
+        while len(pv) < max_length:
+            entry = self.transposition_table.Probe(chess_board.GetHash())
+            if entry is None or entry[4] is None or chess_board.GetHash() in seen:
+                break
+            move = entry[4]
+            if not chess_board.CanPlayerMovePiece(*move[0]) or move[1] not in chess_board.GetLegalMoves(*move[0]):
+                break  # Slot was overwritten by another position
+            seen.add(chess_board.GetHash())
+            pv.append(move)
+            chess_board.MakeMove(move[0], move[1])
+        for _ in pv:
+            chess_board.UndoMove()
+        return pv
+
+    # ===== EVALUATION =====
+
+    def Evaluate(self, chess_board: ChessBoard) -> int:
+        """Static evaluation from the side to move's point of view"""
+        score = 0
+        for row in range(8):
+            for col in range(8):
+                piece = chess_board.board[row][col]
+                if piece == ".":
+                    continue
+                piece_type = piece.lower()
+                value = PIECE_VALUES[piece_type]
+                if piece_type in 'nbp':
+                    value += _CENTRE_BONUS[row] + _CENTRE_BONUS[col]
+                score += value if piece.isupper() else -value
+        return score if chess_board.IsWhiteTurn() else -score
@@ -1,34 +1,59 @@
 # ChessGameRunner.py - Main entry point and game runner (like a main Unity scene)
 
-import pygame
+import argparse
 import sys
+from typing import List, Optional
 
 # Handle imports for both standalone and package execution
 try:
     from .chess_board import ChessBoard
     from .chess_renderer import ChessRenderer, DisplaySettings
-    from .input_manager import InputManager
+    from .input_manager import InputManager, LoadRecording
     from .game_manager import GameManager
+    from .frame_profiler import FrameProfiler
+    from .startup_profile import LazyImport, StartupProfile
 except ImportError:
     from chess_board import ChessBoard
     from chess_renderer import ChessRenderer, DisplaySettings
-    from input_manager import InputManager
+    from input_manager import InputManager, LoadRecording
     from game_manager import GameManager
+    from frame_profiler import FrameProfiler
+    from startup_profile import LazyImport, StartupProfile
+
+pygame = LazyImport("pygame")  # Loaded when the window opens, so e.g. --help stays instant
+
+IDLE_TIMEOUT_MS = 500  # Longest sleep while idle, so Update() still runs now and then
 
 class ChessGameRunner:
-    def __init__(self):
+    def __init__(self, idle_mode: bool = True, show_profiler: bool = False, profile_csv: Optional[str] = None,
+                 startup: Optional[StartupProfile] = None):
+        self.idle_mode = idle_mode
+        self.startup = startup or StartupProfile()
+        
+        # Frame timing is always recorded (it costs microseconds), F3 shows it
+        self.profile_csv = profile_csv
+        self.profiler = FrameProfiler(keep_all=profile_csv is not None)
+        self.profiler.overlay_visible = show_profiler
+        
         self._InitializePygame()
-        self._CreateGameObjects()
+        with self.startup.Measure("game objects"):
+            self._CreateGameObjects()
         self._InitializeGame()
     
     # ===== INITIALIZATION =====
     
     def _InitializePygame(self):
         """Initialize pygame and create window"""
-        pygame.init()
-        self.screen = pygame.display.set_mode((DisplaySettings.WINDOW_WIDTH, DisplaySettings.WINDOW_HEIGHT))
-        pygame.display.set_caption("Pygame Chess - Clean Architecture")
-        self.clock = pygame.time.Clock()
+        self.startup.Load("pygame")
+        with self.startup.Measure("pygame display + font init"):
+            # Only what the game uses; pygame.init() would also start sound and joysticks
+            pygame.display.init()
+            pygame.font.init()
+        with self.startup.Measure("window"):
+            self.screen = pygame.display.set_mode((DisplaySettings.WINDOW_WIDTH, DisplaySettings.WINDOW_HEIGHT),
+                                                  pygame.RESIZABLE)
+            pygame.display.set_caption("Pygame Chess - Clean Architecture")
+            self.clock = pygame.time.Clock()
         print("Pygame initialized successfully")
     
     def _CreateGameObjects(self):
@@ -39,7 +64,8 @@ class ChessGameRunner:
         self.input_manager = InputManager()
         
         # Create game manager with dependencies
-        self.game_manager = GameManager(self.chess_board, self.renderer, self.input_manager)
+        self.game_manager = GameManager(self.chess_board, self.renderer, self.input_manager, dirty_rects=True,
+                                        profiler=self.profiler)
         
         print("Game objects created and wired up")
     
@@ -56,8 +82,11 @@ class ChessGameRunner:
         
         try:
             while self.game_manager.IsRunning():
-                self._ProcessFrame()
-                self._LimitFrameRate()
+                if self.idle_mode and not self.game_manager.NeedsContinuousFrames():
+                    self._ProcessIdleFrame()
+                else:
+                    self._ProcessFrame()
+                    self._LimitFrameRate()
             
         except Exception as e:
             print(f"Error in main game loop: {e}")
@@ -70,13 +99,34 @@ class ChessGameRunner:
     def _ProcessFrame(self):
         """Process a single frame"""
         # Process input events
-        self.input_manager.ProcessEvents()
+        with self.profiler.Measure("ProcessEvents"):
+            self.input_manager.ProcessEvents()
         
         # Update game logic
-        self.game_manager.Update()
+        with self.profiler.Measure("Update"):
+            self.game_manager.Update()
         
-        # Render the frame
+        # Render the frame (GameManager times the drawing phases)
         self.game_manager.Render()
+        self.profiler.EndFrame()
+    
+    def _ProcessIdleFrame(self):
+        """Sleep until input arrives, and render only if something changed"""
+        # The sleep itself is not part of any phase
+        self.input_manager.WaitForEvents(IDLE_TIMEOUT_MS)
+        with self.profiler.Measure("ProcessEvents"):
+            self.input_manager.ProcessEvents()
+        with self.profiler.Measure("Update"):
+            self.game_manager.Update()
+        
+        # Both flags must be cleared, so don't let 'or' skip the second call
+        input_dirty = self.input_manager.ConsumeDirty()
+        state_dirty = self.game_manager.ConsumeDirty()
+        if input_dirty or state_dirty:
+            self.game_manager.Render()
+            self.profiler.EndFrame()
+        else:
+            self.profiler.DiscardFrame()
     
     def _LimitFrameRate(self):
         """Maintain consistent frame rate"""
@@ -85,19 +135,41 @@ class ChessGameRunner:
     def _Cleanup(self):
         """Clean up resources when game ends"""
         print("Cleaning up and closing...")
+        self.input_manager.StopRecording()
+        if self.profile_csv:
+            self.profiler.WriteCSV(self.profile_csv)
+            print(f"Frame timings written to {self.profile_csv}")
         pygame.quit()
         # Note: Not calling sys.exit() to allow calling script to continue
 
 # ===== MAIN ENTRY POINT =====
 
-def main():
-    """Main entry point for the chess game"""
+def main(argv: Optional[List[str]] = None, startup_profile: Optional[StartupProfile] = None):
+    """Main entry point for the chess game, startup_profile may hold steps timed before (e.g. by the launcher)"""
+    parser = argparse.ArgumentParser(description="Pygame chess (clean architecture version)")
+    parser.add_argument("--profile", action="store_true", help="Show the frame time overlay at start (F3 toggles it)")
+    parser.add_argument("--profile-csv", metavar="PATH", help="Write every frame's phase times to a CSV file on exit")
+    parser.add_argument("--record", metavar="PATH", help="Record input events to a file")
+    parser.add_argument("--replay", metavar="PATH", help="Play back recorded input instead of reading the mouse and keyboard")
+    parser.add_argument("--real-time", action="store_true", help="Replay with the recorded timing instead of as fast as possible")
+    parser.add_argument("--startup-profile", action="store_true", help="Print import and initialization times once the first frame is shown")
+    args = parser.parse_args(argv)
+    startup = startup_profile or StartupProfile()
+    
     print("=" * 50)
     print("PYGAME CHESS - CLEAN ARCHITECTURE VERSION")
     print("=" * 50)
     
     try:
-        game_runner = ChessGameRunner()
+        game_runner = ChessGameRunner(show_profiler=args.profile, profile_csv=args.profile_csv, startup=startup)
+        if args.startup_profile:
+            with startup.Measure("first frame"):
+                game_runner.game_manager.Render()
+            startup.Report("chess_pygame.chess_game_runner")
+        if args.replay:
+            game_runner.input_manager.StartReplay(LoadRecording(args.replay), real_time=args.real_time)
+        if args.record:
+            game_runner.input_manager.StartRecording(args.record)
         game_runner.Run()
         
     except Exception as e:
@@ -1,12 +1,19 @@
 # Pygame Chess - Graphical version of the terminal chess game
 # Same game logic, beautiful graphical interface
 
-import pygame
 import sys
 from typing import List, Tuple, Optional, Set
 
-# Initialize Pygame
-pygame.init()
+# Handle imports for both standalone and package execution
+try:
+    from . import movegen
+    from .startup_profile import LazyImport, StartupProfile
+except ImportError:
+    import movegen
+    from startup_profile import LazyImport, StartupProfile
+
+# Pygame is loaded and started when the game window opens, not on import
+pygame = LazyImport("pygame")
 
 # CONSTANTS
 WINDOW_WIDTH = 800
@@ -15,6 +22,7 @@ BOARD_SIZE = 480
 BOARD_OFFSET_X = (WINDOW_WIDTH - BOARD_SIZE) // 2
 BOARD_OFFSET_Y = 50
 SQUARE_SIZE = BOARD_SIZE // 8
+IDLE_TIMEOUT_MS = 500  # Longest wait for an event before looping again
 
 # COLORS
 WHITE = (240, 217, 181)
@@ -39,18 +47,26 @@ board = [
 ]
 
 class ChessGame:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("Pygame Chess")
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 24)
-        self.piece_font = pygame.font.Font(None, 48)
+    def __init__(self, startup: Optional[StartupProfile] = None):
+        startup = startup or StartupProfile()
+        startup.Load("pygame")
+        with startup.Measure("pygame display + font init"):
+            # Only what the game uses; pygame.init() would also start sound and joysticks
+            pygame.display.init()
+            pygame.font.init()
+        with startup.Measure("window and fonts"):
+            self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+            pygame.display.set_caption("Pygame Chess")
+            self.clock = pygame.time.Clock()
+            self.font = pygame.font.Font(None, 24)
+            self.piece_font = pygame.font.Font(None, 48)
         
         # Game state
         self.turn_white = True
         self.selected_piece = None  # (row, col) of selected piece
         self.highlighted_moves = set()  # Set of (row, col) for valid moves
         self.running = True
+        self.needs_redraw = True  # Only draw when something changed
         
     def screen_to_board(self, x: int, y: int) -> Optional[Tuple[int, int]]:
         """Convert screen coordinates to board position"""
@@ -161,88 +177,9 @@ class ChessGame:
     
     # ===== GAME LOGIC (Same as terminal version) =====
     
-    def inside(self, r: int, c: int) -> bool:
-        """Check if coordinates are within board"""
-        return 0 <= r < 8 and 0 <= c < 8
-    
-    def is_enemy(self, piece: str, target: str) -> bool:
-        """Check if target is an enemy piece"""
-        if target == ".":
-            return False
-        return piece.isupper() != target.isupper()
-    
     def legal_moves_from(self, r: int, c: int) -> List[Tuple[int, int]]:
-        """Generate all legal moves for piece at (r,c) - same logic as terminal version"""
-        piece = board[r][c]
-        if piece == ".":
-            return []
-        
-        moves = []
-        white = piece.isupper()
-        p = piece.lower()
-        
-        # PAWN MOVEMENT
-        if p == 'p':
-            step = -1 if white else 1
-            
-            # Forward movement
-            if self.inside(r+step, c) and board[r+step][c] == ".":
-                moves.append((r+step, c))
-                
-                # Double move from start
-                start_row = 6 if white else 1
-                if r == start_row and board[r+2*step][c] == ".":
-                    moves.append((r+2*step, c))
-            
-            # Captures
-            for dc in (-1, 1):
-                nr, nc = r+step, c+dc
-                if self.inside(nr, nc) and board[nr][nc] != "." and self.is_enemy(piece, board[nr][nc]):
-                    moves.append((nr, nc))
-        
-        # KNIGHT MOVEMENT
-        elif p == 'n':
-            knight_moves = [(2,1),(2,-1),(-2,1),(-2,-1),(1,2),(1,-2),(-1,2),(-1,-2)]
-            for dr, dc in knight_moves:
-                nr, nc = r+dr, c+dc
-                if self.inside(nr, nc):
-                    target = board[nr][nc]
-                    if target == '.' or self.is_enemy(piece, target):
-                        moves.append((nr, nc))
-        
-        # SLIDING PIECES (Rook, Bishop, Queen)
-        elif p in 'brq':
-            dirs = []
-            if p in 'bq':  # Bishop/Queen diagonals
-                dirs += [(-1,-1),(-1,1),(1,-1),(1,1)]
-            if p in 'rq':  # Rook/Queen straight lines
-                dirs += [(-1,0),(1,0),(0,-1),(0,1)]
-            
-            for dr, dc in dirs:
-                nr, nc = r+dr, c+dc
-                while self.inside(nr, nc):
-                    if board[nr][nc] == ".":
-                        moves.append((nr, nc))
-                    else:
-                        if self.is_enemy(piece, board[nr][nc]):
-                            moves.append((nr, nc))
-                        break
-                    nr += dr
-                    nc += dc
-        
-        # KING MOVEMENT
-        elif p == 'k':
-            for dr in (-1, 0, 1):
-                for dc in (-1, 0, 1):
-                    if dr == 0 and dc == 0:
-                        continue
-                    nr, nc = r+dr, c+dc
-                    if self.inside(nr, nc):
-                        target = board[nr][nc]
-                        if target == '.' or self.is_enemy(piece, target):
-                            moves.append((nr, nc))
-        
-        return moves
+        """Generate all legal moves for piece at (r,c) - same rules as the terminal version"""
+        return movegen.GenerateMoves(board, r, c)
     
     def promote_if_needed(self, r: int, c: int):
         """Handle pawn promotion"""
@@ -320,8 +257,13 @@ class ChessGame:
         print("Game loop starting...")
         try:
             while self.running:
+                # Sleep until something happens instead of spinning at 60 FPS
+                first_event = pygame.event.wait(IDLE_TIMEOUT_MS)
+                events = [first_event] if first_event.type != pygame.NOEVENT else []
+                events += pygame.event.get()
+                
                 # Handle events
-                for event in pygame.event.get():
+                for event in events:
                     if event.type == pygame.QUIT:
                         print("Quit event received")
                         self.running = False
@@ -332,15 +274,20 @@ class ChessGame:
                     elif event.type == pygame.MOUSEBUTTONDOWN:
                         if event.button == 1:  # Left click
                             self.handle_click(event.pos)
+                            self.needs_redraw = True
+                    elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE, pygame.WINDOWRESTORED):
+                        self.needs_redraw = True
                 
-                # Draw everything
-                self.screen.fill(BG_COLOR)
-                self.draw_board()
-                self.draw_pieces()
-                self.draw_ui()
-                
-                pygame.display.flip()
-                self.clock.tick(60)
+                # Draw everything, but only when the picture changed
+                if self.needs_redraw and self.running:
+                    self.screen.fill(BG_COLOR)
+                    self.draw_board()
+                    self.draw_pieces()
+                    self.draw_ui()
+                    
+                    pygame.display.flip()
+                    self.needs_redraw = False
+                    self.clock.tick(60)
                 
         except Exception as e:
             print(f"Error in game loop: {e}")
@@ -351,13 +298,15 @@ class ChessGame:
             pygame.quit()
             # Don't call sys.exit() to allow the program to continue
 
-def main():
-    """Start the Pygame chess game"""
+def main(startup_profile: Optional[StartupProfile] = None):
+    """Start the Pygame chess game, printing startup times first if a StartupProfile is given"""
     print("Starting Pygame Chess...")
     print("Click pieces to select them, click highlighted squares to move!")
     
     try:
-        game = ChessGame()
+        game = ChessGame(startup_profile)
+        if startup_profile is not None:
+            startup_profile.Report("chess_pygame.chess_pygame_original")
         game.run()
     except Exception as e:
         print(f"Error occurred: {e}")
@@ -366,4 +315,4 @@ def main():
         input("Press Enter to exit...")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main(StartupProfile() if "--startup-profile" in sys.argv[1:] else None)
\ No newline at end of file
@@ -1,13 +1,18 @@
 # ChessRenderer.py - Handles all drawing and visual elements (like a UI Manager in Unity)
 
-import pygame
-from typing import Tuple, Set
+from __future__ import annotations  # pygame types in signatures must not load pygame at import
+
+from typing import Dict, List, Optional, Tuple, Set
 
 # Handle imports for both standalone and package execution
 try:
     from .chess_board import ChessBoard
+    from .startup_profile import LazyImport
 except ImportError:
     from chess_board import ChessBoard
+    from startup_profile import LazyImport
+
+pygame = LazyImport("pygame")  # Loaded on first use, so importing this module stays cheap
 
 class GameColors:
     """Color constants organized in a class"""
@@ -21,37 +26,183 @@ class GameColors:
     TEXT = (255, 255, 255)
 
 class DisplaySettings:
-    """Display constants organized in a class"""
+    """Display constants organized in a class (the layout for the default window size)"""
     WINDOW_WIDTH = 800
     WINDOW_HEIGHT = 600
     BOARD_SIZE = 480
     BOARD_OFFSET_X = (WINDOW_WIDTH - BOARD_SIZE) // 2
     BOARD_OFFSET_Y = 50
     SQUARE_SIZE = BOARD_SIZE // 8
+    
+    # Layout rules for other window sizes
+    MIN_WINDOW_WIDTH = 400
+    MIN_WINDOW_HEIGHT = 360
+    SIDE_MARGIN = 40          # Room for rank labels
+    BOTTOM_MARGIN = 70        # Room for file labels and instructions
+    MIN_SQUARE_SIZE = 24
+    PIECE_FONT_SCALE = 0.8    # Piece glyph size relative to the square
+    MAX_CACHED_ATLASES = 4    # Sprite atlases kept for recently used sizes
 
 class ChessRenderer:
     def __init__(self, screen: pygame.Surface):
         self.screen = screen
         self.font = pygame.font.Font(None, 24)
-        self.piece_font = pygame.font.Font(None, 48)
+        self.colors = GameColors
+        
+        # Board geometry, recomputed from the window size by UpdateLayout
+        self.board_size = DisplaySettings.BOARD_SIZE
+        self.board_offset_x = DisplaySettings.BOARD_OFFSET_X
+        self.board_offset_y = DisplaySettings.BOARD_OFFSET_Y
+        self.square_size = DisplaySettings.SQUARE_SIZE
+        
+        # Piece sprites: one atlas surface per square size, with each piece's area in it
+        self.piece_atlases: Dict[int, Tuple[pygame.Surface, Dict[str, pygame.Rect]]] = {}
+        self.piece_atlas: Optional[pygame.Surface] = None
+        self.piece_rects: Dict[str, pygame.Rect] = {}
+        
+        # Everything that only changes with size or theme is drawn once and reused
+        self.static_layer: Optional[pygame.Surface] = None
+        self.text_cache: Dict[Tuple[str, Tuple[int, int, int]], pygame.Surface] = {}
+        
+        # Frame profiler overlay, rendered again only when its text changes
+        self.overlay_font: Optional[pygame.font.Font] = None
+        self.overlay_rows: List[Tuple[str, ...]] = []
+        self.overlay_surface: Optional[pygame.Surface] = None
+        
+        self.UpdateLayout()
+    
+    # ===== LAYOUT =====
+    
+    def UpdateLayout(self):
+        """Fit the board to the current window size"""
+        width, height = self.screen.get_size()
+        available = min(width - 2 * DisplaySettings.SIDE_MARGIN,
+                        height - DisplaySettings.BOARD_OFFSET_Y - DisplaySettings.BOTTOM_MARGIN)
+        self.square_size = max(DisplaySettings.MIN_SQUARE_SIZE, available // 8)
+        self.board_size = self.square_size * 8
+        self.board_offset_x = (width - self.board_size) // 2
+        spare_height = height - DisplaySettings.BOARD_OFFSET_Y - DisplaySettings.BOTTOM_MARGIN - self.board_size
+        self.board_offset_y = DisplaySettings.BOARD_OFFSET_Y + max(0, spare_height // 2)
+        self.RebuildPieceSprites()
+        self.InvalidateLayers()
+    
+    def Resize(self, size: Tuple[int, int]):
+        """Adapt to a resized window (never smaller than the minimum size)"""
+        width = max(DisplaySettings.MIN_WINDOW_WIDTH, size[0])
+        height = max(DisplaySettings.MIN_WINDOW_HEIGHT, size[1])
+        screen = pygame.display.get_surface()
+        if screen is None or screen.get_size() != (width, height):
+            screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+        self.screen = screen
+        self.UpdateLayout()
+    
+    # ===== SPRITE CACHE =====
+    
+    def RebuildPieceSprites(self):
+        """Select the sprite atlas for the current square size, rendering it if not cached"""
+        atlas = self.piece_atlases.pop(self.square_size, None)
+        if atlas is None:
+            atlas = self._RenderPieceAtlas(self.square_size)
+            while len(self.piece_atlases) >= DisplaySettings.MAX_CACHED_ATLASES:
+                del self.piece_atlases[next(iter(self.piece_atlases))]  # Oldest size
+        self.piece_atlases[self.square_size] = atlas  # Most recently used goes last
+        self.piece_atlas, self.piece_rects = atlas
+    
+    def _RenderPieceAtlas(self, square_size: int) -> Tuple[pygame.Surface, Dict[str, pygame.Rect]]:
+        """Render the 12 outlined piece glyphs side by side on one surface"""
+        piece_font = pygame.font.Font(None, max(8, int(square_size * DisplaySettings.PIECE_FONT_SCALE)))
+        outline = max(1, square_size // 60)  # 1 pixel at the default size, thicker on big boards
+        sprites = {piece: self._RenderPieceSprite(piece, piece_font, outline) for piece in "PNBRQKpnbrqk"}
+        
+        atlas = pygame.Surface((sum(sprite.get_width() for sprite in sprites.values()),
+                                max(sprite.get_height() for sprite in sprites.values())), pygame.SRCALPHA)
+        rects = {}
+        x = 0
+        for piece, sprite in sprites.items():
+            rects[piece] = atlas.blit(sprite, (x, 0))
+            x += sprite.get_width()
+        return atlas, rects
+    
+    def _RenderPieceSprite(self, piece: str, piece_font: pygame.font.Font, outline: int = 1) -> pygame.Surface:
+        """Compose one piece glyph with its outline on a transparent surface"""
+        if piece.isupper():  # White pieces
+            piece_color = self.colors.PIECE_WHITE
+            outline_color = self.colors.PIECE_BLACK
+        else:  # Black pieces
+            piece_color = self.colors.PIECE_BLACK
+            outline_color = self.colors.PIECE_WHITE
+        
+        piece_surface = piece_font.render(piece, True, piece_color)
+        outline_surface = piece_font.render(piece, True, outline_color)
+        width, height = piece_surface.get_size()
+        
+        # Margin on every side for the outline
+        sprite = pygame.Surface((width + 2 * outline, height + 2 * outline), pygame.SRCALPHA)
+        for dx in [-outline, 0, outline]:
+            for dy in [-outline, 0, outline]:
+                if dx == 0 and dy == 0:
+                    continue
+                sprite.blit(outline_surface, (outline + dx, outline + dy))
+        sprite.blit(piece_surface, (outline, outline))
+        return sprite
+    
+    # ===== CACHED LAYERS =====
+    
+    def SetTheme(self, colors):
+        """Switch to another set of colors (any class with GameColors' attributes)"""
+        self.colors = colors
+        self.piece_atlases.clear()
+        self.RebuildPieceSprites()
+        self.InvalidateLayers()
+    
+    def InvalidateLayers(self):
+        """Drop the cached board layer and text (call after a resize or theme change)"""
+        self.static_layer = None
+        self.text_cache.clear()
+        self.overlay_surface = None
+    
+    def RenderText(self, text: str, color: Optional[Tuple[int, int, int]] = None) -> pygame.Surface:
+        """Get a rendered text surface, rendering each string only once"""
+        color = color or self.colors.TEXT
+        key = (text, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            surface = self.font.render(text, True, color)
+            self.text_cache[key] = surface
+        return surface
+    
+    def GetStaticLayer(self) -> pygame.Surface:
+        """Get the background, plain board, labels and instructions as one surface"""
+        if self.static_layer is None or self.static_layer.get_size() != self.screen.get_size():
+            layer = pygame.Surface(self.screen.get_size(), 0, self.screen)
+            layer.fill(self.colors.BACKGROUND)
+            for row in range(8):
+                for col in range(8):
+                    square_rect = self.GetSquareRect(row, col)
+                    pygame.draw.rect(layer, self._GetBaseSquareColor(row, col), square_rect)
+                    pygame.draw.rect(layer, (0, 0, 0), square_rect, 1)
+            self._DrawInstructions(layer)
+            self._DrawBoardLabels(layer)
+            self.static_layer = layer
+        return self.static_layer
     
     # ===== COORDINATE CONVERSION =====
     
     def ScreenToBoard(self, screen_x: int, screen_y: int) -> Tuple[int, int]:
         """Convert screen coordinates to board position"""
-        board_x = screen_x - DisplaySettings.BOARD_OFFSET_X
-        board_y = screen_y - DisplaySettings.BOARD_OFFSET_Y
+        board_x = screen_x - self.board_offset_x
+        board_y = screen_y - self.board_offset_y
         
-        if 0 <= board_x < DisplaySettings.BOARD_SIZE and 0 <= board_y < DisplaySettings.BOARD_SIZE:
-            col = board_x // DisplaySettings.SQUARE_SIZE
-            row = board_y // DisplaySettings.SQUARE_SIZE
+        if 0 <= board_x < self.board_size and 0 <= board_y < self.board_size:
+            col = board_x // self.square_size
+            row = board_y // self.square_size
             return (row, col)
         return (-1, -1)  # Invalid position
     
     def BoardToScreen(self, row: int, col: int) -> Tuple[int, int]:
         """Convert board position to screen coordinates"""
-        x = DisplaySettings.BOARD_OFFSET_X + col * DisplaySettings.SQUARE_SIZE
-        y = DisplaySettings.BOARD_OFFSET_Y + row * DisplaySettings.SQUARE_SIZE
+        x = self.board_offset_x + col * self.square_size
+        y = self.board_offset_y + row * self.square_size
         return (x, y)
     
     def IsValidBoardPosition(self, row: int, col: int) -> bool:
@@ -61,30 +212,44 @@ class ChessRenderer:
     # ===== DRAWING METHODS =====
     
     def DrawBackground(self):
-        """Clear screen with background color"""
-        self.screen.fill(GameColors.BACKGROUND)
+        """Clear screen to the cached layer: background, plain board, labels and instructions"""
+        self.screen.blit(self.GetStaticLayer(), (0, 0))
     
     def DrawBoard(self, selected_pos: Tuple[int, int], highlighted_moves: Set[Tuple[int, int]]):
-        """Draw the chess board with highlights"""
-        for row in range(8):
-            for col in range(8):
-                # Determine base square color
-                is_light_square = (row + col) % 2 == 0
-                color = GameColors.WHITE_SQUARE if is_light_square else GameColors.BLACK_SQUARE
-                
-                # Apply highlights
-                if (row, col) == selected_pos:
-                    color = GameColors.HIGHLIGHT_SELECT
-                elif (row, col) in highlighted_moves:
-                    color = GameColors.HIGHLIGHT_MOVE
-                
-                # Draw square
-                x, y = self.BoardToScreen(row, col)
-                square_rect = (x, y, DisplaySettings.SQUARE_SIZE, DisplaySettings.SQUARE_SIZE)
-                pygame.draw.rect(self.screen, color, square_rect)
-                
-                # Draw border
-                pygame.draw.rect(self.screen, (0, 0, 0), square_rect, 1)
+        """Draw the highlighted squares over the plain board from DrawBackground"""
+        for row, col in highlighted_moves:
+            self.DrawSquare(row, col, self.GetSquareColor(row, col, selected_pos, highlighted_moves))
+        if self.IsValidBoardPosition(*selected_pos):
+            self.DrawSquare(selected_pos[0], selected_pos[1], self.colors.HIGHLIGHT_SELECT)
+    
+    def GetSquareColor(self, row: int, col: int, selected_pos: Tuple[int, int],
+                       highlighted_moves: Set[Tuple[int, int]]) -> Tuple[int, int, int]:
+        """Get the fill color of a square, including highlights"""
+        if (row, col) == selected_pos:
+            return self.colors.HIGHLIGHT_SELECT
+        if (row, col) in highlighted_moves:
+            return self.colors.HIGHLIGHT_MOVE
+        return self._GetBaseSquareColor(row, col)
+    
+    def _GetBaseSquareColor(self, row: int, col: int) -> Tuple[int, int, int]:
+        """Get the checkerboard color of a square"""
+        is_light_square = (row + col) % 2 == 0
+        return self.colors.WHITE_SQUARE if is_light_square else self.colors.BLACK_SQUARE
+    
+    def DrawSquare(self, row: int, col: int, color: Tuple[int, int, int]):
+        """Draw one square and its border"""
+        square_rect = self.GetSquareRect(row, col)
+        if color == self._GetBaseSquareColor(row, col):
+            # Plain squares are copied from the cached layer
+            self.screen.blit(self.GetStaticLayer(), square_rect, square_rect)
+            return
+        pygame.draw.rect(self.screen, color, square_rect)
+        pygame.draw.rect(self.screen, (0, 0, 0), square_rect, 1)
+    
+    def GetSquareRect(self, row: int, col: int) -> pygame.Rect:
+        """Get the screen area covered by a square"""
+        x, y = self.BoardToScreen(row, col)
+        return pygame.Rect(x, y, self.square_size, self.square_size)
     
     def DrawPieces(self, chess_board: ChessBoard):
         """Draw all chess pieces on the board"""
@@ -94,50 +259,62 @@ class ChessRenderer:
                 if piece != '.':
                     self._DrawSinglePiece(row, col, piece)
     
+    def DrawPiece(self, row: int, col: int, piece: str):
+        """Draw the piece standing on one square (nothing for an empty square)"""
+        if piece != '.':
+            self._DrawSinglePiece(row, col, piece)
+    
     def _DrawSinglePiece(self, row: int, col: int, piece: str):
-        """Draw a single chess piece with outline"""
+        """Draw a single chess piece with outline (from the sprite atlas)"""
+        source_rect = self.piece_rects.get(piece)
+        if source_rect is None:
+            return
         x, y = self.BoardToScreen(row, col)
+        sprite_rect = source_rect.copy()
+        sprite_rect.center = (x + self.square_size // 2, y + self.square_size // 2)
+        self.screen.blit(self.piece_atlas, sprite_rect, source_rect)
+    
+    def DrawUI(self, current_player: str) -> pygame.Rect:
+        """Draw user interface elements, returns the area of the current player text
         
-        # Determine colors
-        if piece.isupper():  # White pieces
-            piece_color = GameColors.PIECE_WHITE
-            outline_color = GameColors.PIECE_BLACK
-        else:  # Black pieces
-            piece_color = GameColors.PIECE_BLACK
-            outline_color = GameColors.PIECE_WHITE
-        
-        # Draw outline (multiple offsets for thick outline)
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                
-                outline_surface = self.piece_font.render(piece, True, outline_color)
-                outline_rect = outline_surface.get_rect()
-                center_x = x + DisplaySettings.SQUARE_SIZE // 2 + dx
-                center_y = y + DisplaySettings.SQUARE_SIZE // 2 + dy
-                outline_rect.center = (center_x, center_y)
-                self.screen.blit(outline_surface, outline_rect)
+        Instructions and board labels never change, so they are part of the static layer.
+        """
+        return self.DrawCurrentPlayer(current_player)
+    
+    def DrawCurrentPlayer(self, current_player: str) -> pygame.Rect:
+        """Draw current player indicator, returns the area it covers"""
+        text_surface = self.RenderText(f"Current Player: {current_player}")
+        return self.screen.blit(text_surface, (10, 10))
+    
+    def DrawOverlay(self, rows: List[Tuple[str, ...]]) -> pygame.Rect:
+        """Draw a table of text in a translucent box at the top right, returns the area it covers
         
-        # Draw main piece
-        piece_surface = self.piece_font.render(piece, True, piece_color)
-        piece_rect = piece_surface.get_rect()
-        piece_rect.center = (x + DisplaySettings.SQUARE_SIZE // 2, y + DisplaySettings.SQUARE_SIZE // 2)
-        self.screen.blit(piece_surface, piece_rect)
-    
-    def DrawUI(self, current_player: str):
-        """Draw user interface elements"""
-        self._DrawCurrentPlayer(current_player)
-        self._DrawInstructions()
-        self._DrawBoardLabels()
-    
-    def _DrawCurrentPlayer(self, current_player: str):
-        """Draw current player indicator"""
-        player_text = f"Current Player: {current_player}"
-        text_surface = self.font.render(player_text, True, GameColors.TEXT)
-        self.screen.blit(text_surface, (10, 10))
-    
-    def _DrawInstructions(self):
+        The first column is left aligned and the others right aligned, so numbers
+        line up without needing a monospace font.
+        """
+        if rows != self.overlay_rows or self.overlay_surface is None:
+            if self.overlay_font is None:
+                self.overlay_font = pygame.font.Font(None, 18)
+            cells = [[self.overlay_font.render(text, True, self.colors.TEXT) for text in row] for row in rows]
+            column_widths = [max(cell.get_width() for cell in column) for column in zip(*cells)]
+            line_height = self.overlay_font.get_linesize()
+            overlay = pygame.Surface((sum(column_widths) + 10 * len(column_widths) + 2,
+                                      line_height * len(rows) + 12), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 180))
+            for i, row_cells in enumerate(cells):
+                x = 6
+                for j, (cell, column_width) in enumerate(zip(row_cells, column_widths)):
+                    offset = 0 if j == 0 else column_width - cell.get_width()
+                    overlay.blit(cell, (x + offset, 6 + i * line_height))
+                    x += column_width + 10
+            self.overlay_rows, self.overlay_surface = list(rows), overlay
+        return self.screen.blit(self.overlay_surface, (self.screen.get_width() - self.overlay_surface.get_width() - 10, 10))
+    
+    def ClearArea(self, area: pygame.Rect):
+        """Restore part of the screen from the static layer"""
+        self.screen.blit(self.GetStaticLayer(), area, area)
+    
+    def _DrawInstructions(self, target: pygame.Surface):
         """Draw game instructions"""
         instructions = [
             "Click a piece to select it",
@@ -145,32 +322,37 @@ class ChessRenderer:
             "ESC to quit"
         ]
         
-        base_y = DisplaySettings.WINDOW_HEIGHT - 80
+        base_y = self.screen.get_height() - 80
         for i, instruction in enumerate(instructions):
-            text_surface = self.font.render(instruction, True, GameColors.TEXT)
-            self.screen.blit(text_surface, (10, base_y + i * 25))
+            text_surface = self.RenderText(instruction)
+            target.blit(text_surface, (10, base_y + i * 25))
     
-    def _DrawBoardLabels(self):
+    def _DrawBoardLabels(self, target: pygame.Surface):
         """Draw file and rank labels around the board"""
         files = "abcdefgh"
         ranks = "87654321"
         
         # File labels (bottom of board)
         for col in range(8):
-            x = DisplaySettings.BOARD_OFFSET_X + col * DisplaySettings.SQUARE_SIZE + DisplaySettings.SQUARE_SIZE // 2
-            y = DisplaySettings.BOARD_OFFSET_Y + DisplaySettings.BOARD_SIZE + 10
-            text_surface = self.font.render(files[col], True, GameColors.TEXT)
+            x = self.board_offset_x + col * self.square_size + self.square_size // 2
+            y = self.board_offset_y + self.board_size + 10
+            text_surface = self.RenderText(files[col])
             text_rect = text_surface.get_rect(center=(x, y))
-            self.screen.blit(text_surface, text_rect)
+            target.blit(text_surface, text_rect)
         
         # Rank labels (left side of board)
         for row in range(8):
-            x = DisplaySettings.BOARD_OFFSET_X - 20
-            y = DisplaySettings.BOARD_OFFSET_Y + row * DisplaySettings.SQUARE_SIZE + DisplaySettings.SQUARE_SIZE // 2
-            text_surface = self.font.render(ranks[row], True, GameColors.TEXT)
+            x = self.board_offset_x - 20
+            y = self.board_offset_y + row * self.square_size + self.square_size // 2
+            text_surface = self.RenderText(ranks[row])
             text_rect = text_surface.get_rect(center=(x, y))
-            self.screen.blit(text_surface, text_rect)
+            target.blit(text_surface, text_rect)
     
     def RefreshDisplay(self):
         """Update the display"""
-        pygame.display.flip()
\ No newline at end of file
+        pygame.display.flip()
+    
+    def RefreshAreas(self, areas: List[pygame.Rect]):
+        """Update only the given parts of the display"""
+        if areas:
+            pygame.display.update(areas)
@@ -0,0 +1,270 @@
+# CompactBoard.py - Memory-compact board for hosting large numbers of games
+
+import struct
+from typing import List, Optional, Set, Tuple
+
+# Handle imports for both standalone and package execution
+try:
+    from . import movegen
+    from . import zobrist
+    from .move_cache import LegalMoveCache, shared_cache
+    from .chess_board import ChessBoard, MoveRecord, START_FEN
+except ImportError:
+    import movegen
+    import zobrist
+    from move_cache import LegalMoveCache, shared_cache
+    from chess_board import ChessBoard, MoveRecord, START_FEN
+
+EMPTY = ord(".")
+
+# Packed state bits: side to move, side to move at the start position,
+# halfmove clock and fullmove number of the start position
+_WHITE_TO_MOVE = 1
+_START_WHITE = 2
+_CLOCK_SHIFT = 2
+_CLOCK_MASK = 0xFFFF
+_FULLMOVE_SHIFT = 18
+
+# One history entry: from square, to square, moved piece, captured piece, halfmove clock before the move
+HISTORY_RECORD = struct.Struct("<BBBBH")
+
+_FEN_BOARD = ChessBoard()  # Reused to parse FEN text
+
+class CompactBoard:
+    """Same query and move API as ChessBoard, in a fraction of the memory
+
+    The 64 squares are one bytearray of piece characters, side to move and the
+    move counters share one int, and the move history is a bytearray of packed
+    records. There are no piece lists; scanning 64 bytes is cheap.
+    """
+    __slots__ = ("squares", "state", "hash_key", "history", "move_cache")
+
+    def __init__(self, move_cache: Optional[LegalMoveCache] = None):
+        self.move_cache = move_cache if move_cache is not None else shared_cache
+        self.Reset()
+
+    def Reset(self):
+        """Initialize the board to starting position"""
+        self.FromFEN(START_FEN)
+
+    # ===== FEN IMPORT / EXPORT =====
+
+    def FromFEN(self, fen: str):
+        """Load a position from FEN text, raises ValueError if it is malformed"""
+        # ChessBoard already validates FEN; copying its result keeps both boards in agreement
+        board = _FEN_BOARD
+        board.FromFEN(fen)
+        self.squares = bytearray(b"".join(piece.encode("ascii") for board_row in board.board for piece in board_row))
+        self.hash_key = board.hash_key
+        self.state = ((_WHITE_TO_MOVE | _START_WHITE) if board.current_turn_white else 0) \
+            | (min(board.halfmove_clock, _CLOCK_MASK) << _CLOCK_SHIFT) \
+            | (board.start_fullmove_number << _FULLMOVE_SHIFT)
+        self.history = bytearray()
+
+    def ToFEN(self) -> str:
+        """Describe the current position as FEN text"""
+        ranks = []
+        for row in range(8):
+            rank = ""
+            empty = 0
+            for code in self.squares[row * 8:row * 8 + 8]:
+                if code == EMPTY:
+                    empty += 1
+                else:
+                    if empty:
+                        rank += str(empty)
+                        empty = 0
+                    rank += chr(code)
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+        side = "w" if self.current_turn_white else "b"
+        return f"{'/'.join(ranks)} {side} - - {self.halfmove_clock} {self.GetFullmoveNumber()}"
+
+    @classmethod
+    def FromBoard(cls, chess_board: ChessBoard) -> "CompactBoard":
+        """Make a compact copy of a ChessBoard position (without its move history)"""
+        compact_board = cls(chess_board.move_cache)
+        compact_board.FromFEN(chess_board.ToFEN())
+        return compact_board
+
+    # ===== PACKED STATE =====
+
+    @property
+    def current_turn_white(self) -> bool:
+        return bool(self.state & _WHITE_TO_MOVE)
+
+    @property
+    def halfmove_clock(self) -> int:
+        return (self.state >> _CLOCK_SHIFT) & _CLOCK_MASK
+
+    def _SetHalfmoveClock(self, clock: int):
+        self.state = (self.state & ~(_CLOCK_MASK << _CLOCK_SHIFT)) | (min(clock, _CLOCK_MASK) << _CLOCK_SHIFT)
+
+    @property
+    def move_history(self) -> List[MoveRecord]:
+        """The played moves, decoded into the same records ChessBoard keeps"""
+        return [MoveRecord(divmod(from_square, 8), divmod(to_square, 8), chr(piece), chr(captured), clock)
+                for from_square, to_square, piece, captured, clock in HISTORY_RECORD.iter_unpack(self.history)]
+
+    # ===== BOARD QUERIES =====
+
+    def GetPiece(self, row: int, col: int) -> str:
+        """Get piece at position"""
+        if 0 <= row < 8 and 0 <= col < 8:
+            return chr(self.squares[row * 8 + col])
+        return "."
+
+    def SetPiece(self, row: int, col: int, piece: str):
+        """Set piece at position (keeps the position hash up to date)"""
+        if self.IsValidPosition(row, col):
+            square = row * 8 + col
+            old_piece = chr(self.squares[square])
+            if old_piece != ".":
+                self.hash_key ^= zobrist.PIECE_KEYS[old_piece][square]
+            if piece != ".":
+                self.hash_key ^= zobrist.PIECE_KEYS[piece][square]
+            self.squares[square] = ord(piece)
+
+    def GetPieceSquares(self, piece: str) -> Set[Tuple[int, int]]:
+        """Get the squares holding a given piece (e.g. 'N' for white knights)"""
+        code = ord(piece)
+        return {divmod(square, 8) for square, value in enumerate(self.squares) if value == code}
+
+    def IsValidPosition(self, row: int, col: int) -> bool:
+        """Check if coordinates are within board bounds"""
+        return 0 <= row < 8 and 0 <= col < 8
+
+    def IsEmpty(self, row: int, col: int) -> bool:
+        """Check if square is empty"""
+        return self.GetPiece(row, col) == "."
+
+    def IsWhitePiece(self, piece: str) -> bool:
+        """Check if piece belongs to white player"""
+        return piece.isupper() and piece != "."
+
+    def IsBlackPiece(self, piece: str) -> bool:
+        """Check if piece belongs to black player"""
+        return piece.islower() and piece != "."
+
+    def IsEnemyPiece(self, piece: str, target: str) -> bool:
+        """Check if target is an enemy piece"""
+        if target == ".":
+            return False
+        return piece.isupper() != target.isupper()
+
+    def CanPlayerMovePiece(self, row: int, col: int) -> bool:
+        """Check if current player can move this piece"""
+        piece = self.GetPiece(row, col)
+        if piece == ".":
+            return False
+        return self.IsWhitePiece(piece) == self.current_turn_white
+
+    # ===== MOVE VALIDATION =====
+
+    def GetLegalMoves(self, row: int, col: int) -> List[Tuple[int, int]]:
+        """Get all legal moves for piece at position"""
+        piece_char = self.GetPiece(row, col)
+        if piece_char == ".":
+            return []
+
+        # Same Zobrist keys as ChessBoard, so the two board types can share a cache
+        square = row * 8 + col
+        moves = self.move_cache.Get(self.hash_key, square)
+        if moves is not None:
+            return moves
+
+        text = self.squares.decode("ascii")
+        moves = movegen.GenerateMoves([text[start:start + 8] for start in range(0, 64, 8)], row, col)
+        self.move_cache.Put(self.hash_key, square, moves)
+        return moves
+
+    def GetAllLegalMoves(self) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Get every (from_pos, to_pos) move for the player to move, in board order"""
+        all_moves = []
+        for row, col in self.GetPlayerPieceSquares():
+            for to_pos in self.GetLegalMoves(row, col):
+                all_moves.append(((row, col), to_pos))
+        return all_moves
+
+    def GetPlayerPieceSquares(self) -> List[Tuple[int, int]]:
+        """Get the squares of the current player's pieces, in board order (a8 to h1)"""
+        # Uppercase letters are 65-90, lowercase 97-122, "." is 46
+        if self.current_turn_white:
+            return [divmod(square, 8) for square, code in enumerate(self.squares) if 65 <= code <= 90]
+        return [divmod(square, 8) for square, code in enumerate(self.squares) if code >= 97]
+
+    # ===== GAME ACTIONS =====
+
+    def TryMakeMove(self, from_pos: Tuple[int, int], to_pos: Tuple[int, int]) -> bool:
+        """Attempt to make a move, returns success"""
+        if not self.CanPlayerMovePiece(*from_pos):
+            return False
+        if to_pos not in self.GetLegalMoves(*from_pos):
+            return False
+        self.MakeMove(from_pos, to_pos)
+        return True
+
+    def MakeMove(self, from_pos: Tuple[int, int], to_pos: Tuple[int, int]) -> bool:
+        """Play a move without validating it (used by search), returns True on promotion"""
+        from_square = from_pos[0] * 8 + from_pos[1]
+        to_square = to_pos[0] * 8 + to_pos[1]
+        squares = self.squares
+        piece = squares[from_square]
+        captured = squares[to_square]
+        clock = self.halfmove_clock
+        self.history += HISTORY_RECORD.pack(from_square, to_square, piece, captured, clock)
+
+        # Pawn moves and captures reset the fifty-move clock
+        piece_char = chr(piece)
+        self._SetHalfmoveClock(0 if piece_char in "Pp" or captured != EMPTY else clock + 1)
+
+        # Execute move, updating the hash directly rather than through SetPiece
+        piece_keys = zobrist.PIECE_KEYS
+        hash_key = self.hash_key ^ piece_keys[piece_char][from_square]
+        if captured != EMPTY:
+            hash_key ^= piece_keys[chr(captured)][to_square]
+
+        # Pawn promotion to queen
+        promoted = (piece_char == "P" and to_pos[0] == 0) or (piece_char == "p" and to_pos[0] == 7)
+        if promoted:
+            piece_char = "Q" if piece_char == "P" else "q"
+        squares[to_square] = ord(piece_char)
+        squares[from_square] = EMPTY
+        self.hash_key = hash_key ^ piece_keys[piece_char][to_square] ^ zobrist.SIDE_KEY
+        self.state ^= _WHITE_TO_MOVE
+        return promoted
+
+    def UndoMove(self) -> bool:
+        """Take back the last move, returns False if there is nothing to undo"""
+        if not self.history:
+            return False
+
+        from_square, to_square, piece, captured, clock = HISTORY_RECORD.unpack_from(
+            self.history, len(self.history) - HISTORY_RECORD.size)
+        del self.history[-HISTORY_RECORD.size:]
+        self.SetPiece(to_square >> 3, to_square & 7, chr(captured))
+        self.SetPiece(from_square >> 3, from_square & 7, chr(piece))
+        self._SetHalfmoveClock(clock)
+        self.state ^= _WHITE_TO_MOVE
+        self.hash_key ^= zobrist.SIDE_KEY
+        return True
+
+    # ===== GAME STATE =====
+
+    def GetCurrentPlayer(self) -> str:
+        """Get current player name"""
+        return "White" if self.current_turn_white else "Black"
+
+    def IsWhiteTurn(self) -> bool:
+        """Check if it's white's turn"""
+        return self.current_turn_white
+
+    def GetFullmoveNumber(self) -> int:
+        """Get the move number (starts at 1, goes up after each black move)"""
+        plies = len(self.history) // HISTORY_RECORD.size + (0 if self.state & _START_WHITE else 1)
+        return (self.state >> _FULLMOVE_SHIFT) + plies // 2
+
+    def GetHash(self) -> int:
+        """Get the Zobrist key of the current position"""
+        return self.hash_key
@@ -0,0 +1,173 @@
+# EPDRunner.py - Runs EPD test suites ("bm"/"am" positions) against the engine
+
+import argparse
+import json
+import multiprocessing
+import os
+import shlex
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Handle imports for both standalone and package execution
+try:
+    from .chess_board import ChessBoard
+    from .chess_engine import ChessEngine, SearchLimits, MoveToUci
+    from .notation import SanToMove
+except ImportError:
+    from chess_board import ChessBoard
+    from chess_engine import ChessEngine, SearchLimits, MoveToUci
+    from notation import SanToMove
+
+DEFAULT_MOVETIME_MS = 1000
+DEFAULT_HASH_MB = 16
+
+# ===== PARSING =====
+
+def ParseEPD(line: str) -> Tuple[str, Dict[str, List[str]]]:
+    """Split an EPD line into (FEN, operations), e.g. {'bm': ['Nf3'], 'id': ['WAC.001']}"""
+    fields = line.split(None, 4)
+    if len(fields) < 4:
+        raise ValueError(f"EPD needs four position fields: {line!r}")
+    fen = " ".join(fields[:4]) + " 0 1"
+
+    operations: Dict[str, List[str]] = {}
+    for operation in (fields[4] if len(fields) > 4 else "").split(";"):
+        tokens = shlex.split(operation) if '"' in operation else operation.split()
+        if tokens:
+            operations[tokens[0]] = tokens[1:]
+    return fen, operations
+
+def LoadSuite(path: str) -> List[str]:
+    """Read the non-empty, non-comment lines of an EPD file"""
+    with open(path, encoding="utf-8") as epd_file:
+        return [line.strip() for line in epd_file if line.strip() and not line.startswith("#")]
+
+# ===== WORKER =====
+
+def RunPosition(task: Tuple[int, str, int, int]) -> dict:
+    """Search one EPD position for a fixed time (runs in a worker process)"""
+    index, line, movetime_ms, hash_mb = task
+    result = {'index': index, 'epd': line, 'id': None, 'solved': False, 'error': None}
+    try:
+        fen, operations = ParseEPD(line)
+        chess_board = ChessBoard()
+        chess_board.FromFEN(fen)
+        best_moves = {MoveToUci(SanToMove(chess_board, san), chess_board) for san in operations.get('bm', [])}
+        avoid_moves = {MoveToUci(SanToMove(chess_board, san), chess_board) for san in operations.get('am', [])}
+    except ValueError as e:
+        result['error'] = str(e)  # e.g. a castling 'bm' the move rules can't express
+        return result
+    result['id'] = " ".join(operations.get('id', [])) or None
+    result['bm'] = sorted(best_moves)
+    result['am'] = sorted(avoid_moves)
+
+    def IsSolution(move_text: str) -> bool:
+        if best_moves and move_text not in best_moves:
+            return False
+        return move_text not in avoid_moves
+
+    # Time-to-solution: when the engine last switched to a correct move
+    solution_time_ms: Optional[int] = None
+
+    def OnIteration(info: dict):
+        nonlocal solution_time_ms
+        if not info['pv']:
+            return
+        if IsSolution(MoveToUci(info['pv'][0], chess_board)):
+            if solution_time_ms is None:
+                solution_time_ms = info['time_ms']
+        else:
+            solution_time_ms = None
+
+    engine = ChessEngine(hash_mb)
+    limits = SearchLimits()
+    limits.movetime = movetime_ms
+    start = time.perf_counter()
+    search = engine.Search(chess_board, limits, OnIteration)
+    elapsed = time.perf_counter() - start
+
+    best_move = MoveToUci(search.best_move, chess_board) if search.best_move else None
+    solved = best_move is not None and IsSolution(best_move)
+    result.update({
+        'best_move': best_move,
+        'solved': solved,
+        'solution_time_ms': solution_time_ms if solved else None,
+        'depth': search.depth,
+        'nodes': search.nodes,
+        'time_ms': int(elapsed * 1000),
+        'nps': int(search.nodes / elapsed) if elapsed > 0 else 0,
+    })
+    return result
+
+# ===== DRIVER =====
+
+def RunSuite(lines: List[str], movetime_ms: int = DEFAULT_MOVETIME_MS, workers: Optional[int] = None,
+             hash_mb: int = DEFAULT_HASH_MB) -> dict:
+    """Run every position across a process pool, returns the summary and per-position results"""
+    workers = workers or os.cpu_count() or 1
+    tasks = [(index, line, movetime_ms, hash_mb) for index, line in enumerate(lines)]
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [RunPosition(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(RunPosition, tasks, chunksize=1)
+    wall_seconds = time.perf_counter() - start
+
+    searched = [result for result in results if result['error'] is None]
+    solved = [result for result in searched if result['solved']]
+    total_nodes = sum(result['nodes'] for result in searched)
+    search_seconds = sum(result['time_ms'] for result in searched) / 1000.0
+    summary = {
+        'positions': len(results),
+        'searched': len(searched),
+        'solved': len(solved),
+        'errors': len(results) - len(searched),
+        'movetime_ms': movetime_ms,
+        'workers': workers,
+        'total_nodes': total_nodes,
+        'nps_per_worker': int(total_nodes / search_seconds) if search_seconds > 0 else 0,
+        'mean_solution_time_ms': (sum(result['solution_time_ms'] for result in solved) / len(solved)) if solved else None,
+        'wall_seconds': round(wall_seconds, 3),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    return {'summary': summary, 'results': results}
+
+# ===== MAIN ENTRY POINT =====
+
+def main(argv: Optional[List[str]] = None):
+    """Run an EPD suite from the command line"""
+    parser = argparse.ArgumentParser(description="Run an EPD test suite at a fixed time per position")
+    parser.add_argument("file", help="EPD file")
+    parser.add_argument("-t", "--movetime", type=int, default=DEFAULT_MOVETIME_MS, help="Milliseconds per position")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--hash", type=int, default=DEFAULT_HASH_MB, help="Transposition table size per worker (MB)")
+    parser.add_argument("-o", "--output", help="Write JSON results here for later comparison")
+    args = parser.parse_args(argv)
+
+    report = RunSuite(LoadSuite(args.file), args.movetime, args.workers, args.hash)
+    for result in report['results']:
+        label = result['id'] or f"#{result['index'] + 1}"
+        if result['error'] is not None:
+            print(f"{label:<16} skipped: {result['error']}")
+        else:
+            status = "solved" if result['solved'] else "missed"
+            when = f" at {result['solution_time_ms']} ms" if result['solved'] else ""
+            expected = " ".join(result['bm'] + ["!" + move for move in result['am']])
+            print(f"{label:<16} {status}{when}  best {result['best_move']}  expected {expected}"
+                  f"  depth {result['depth']}  {result['nps']:,} nps")
+
+    summary = report['summary']
+    print(f"\nSolved {summary['solved']}/{summary['searched']} ({summary['errors']} skipped) "
+          f"at {summary['movetime_ms']} ms/position, {summary['nps_per_worker']:,} nps per worker, "
+          f"{summary['wall_seconds']} s wall time on {summary['workers']} workers")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# FrameProfiler.py - Per-phase frame timing with rolling percentiles
+
+import csv
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+PHASES = ("ProcessEvents", "Update", "DrawBoard", "DrawPieces", "DrawUI", "Flip")
+PERCENTILES = (50, 95, 99)
+OVERLAY_REFRESH_FRAMES = 30  # Re-render the overlay text twice a second at 60 FPS, not every frame
+
+class _PhaseTimer:
+    """Context manager adding the time spent inside it to one phase of the current frame"""
+    __slots__ = ("profiler", "phase", "start")
+
+    def __init__(self, profiler: "FrameProfiler", phase: str):
+        self.profiler = profiler
+        self.phase = phase
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.current[self.phase] += time.perf_counter_ns() - self.start
+        return False
+
+class FrameProfiler:
+    """Times the phases of each frame and keeps the last frames for percentiles
+
+    Wrap each phase in `with profiler.Measure(name):` and call EndFrame() once
+    the frame is on screen. A phase may be measured several times per frame;
+    the times add up.
+    """
+
+    def __init__(self, window: int = 300, keep_all: bool = False):
+        self.current: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.samples: deque = deque(maxlen=window)  # (ns per phase..., total ns) per frame
+        self.all_samples: Optional[List[Tuple[int, ...]]] = [] if keep_all else None
+        self.frame_count = 0
+        self.overlay_visible = False
+        self._timers = {phase: _PhaseTimer(self, phase) for phase in PHASES}
+        self._overlay_rows: List[Tuple[str, ...]] = []
+        self._overlay_frame = -OVERLAY_REFRESH_FRAMES
+
+    # ===== RECORDING =====
+
+    def Measure(self, phase: str) -> _PhaseTimer:
+        """Get the timer for a phase, raises ValueError for an unknown phase"""
+        timer = self._timers.get(phase)
+        if timer is None:
+            raise ValueError(f"Unknown frame phase: {phase}")
+        return timer
+
+    def EndFrame(self):
+        """Record the current frame's phase times and start a new frame"""
+        times = tuple(self.current.values())
+        sample = times + (sum(times),)
+        self.samples.append(sample)
+        if self.all_samples is not None:
+            self.all_samples.append(sample)
+        self.frame_count += 1
+        self.DiscardFrame()
+
+    def DiscardFrame(self):
+        """Forget the times measured since the last frame (e.g. an idle pass that drew nothing)"""
+        for phase in self.current:
+            self.current[phase] = 0
+
+    # ===== STATISTICS =====
+
+    def GetPercentiles(self) -> Dict[str, Tuple[float, ...]]:
+        """Get (p50, p95, p99) in milliseconds per phase and for the whole frame"""
+        stats = {}
+        if not self.samples:
+            return stats
+        columns = zip(*self.samples)
+        for name, column in zip(PHASES + ("Total",), columns):
+            ordered = sorted(column)
+            last = len(ordered) - 1
+            stats[name] = tuple(ordered[min(last, len(ordered) * percentile // 100)] / 1e6
+                                for percentile in PERCENTILES)
+        return stats
+
+    def GetOverlayRows(self) -> List[Tuple[str, ...]]:
+        """Get the overlay table, recomputed only every OVERLAY_REFRESH_FRAMES frames"""
+        if self.frame_count - self._overlay_frame >= OVERLAY_REFRESH_FRAMES:
+            self._overlay_frame = self.frame_count
+            header = ("ms",) + tuple(f"p{percentile}" for percentile in PERCENTILES)
+            self._overlay_rows = [header] + [(name,) + tuple(f"{value:.2f}" for value in values)
+                                             for name, values in self.GetPercentiles().items()]
+        return self._overlay_rows
+
+    def ToggleOverlay(self):
+        """Show or hide the on-screen statistics"""
+        self.overlay_visible = not self.overlay_visible
+        self._overlay_frame = -OVERLAY_REFRESH_FRAMES
+
+    # ===== EXPORT =====
+
+    def WriteCSV(self, path: str):
+        """Write one row per frame (nanoseconds per phase), every frame if keep_all was set"""
+        rows = self.all_samples if self.all_samples is not None else self.samples
+        with open(path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["frame"] + [f"{name}_ns" for name in PHASES + ("Total",)])
+            first_frame = self.frame_count - len(rows)
+            for index, sample in enumerate(rows):
+                writer.writerow((first_frame + index,) + sample)
@@ -0,0 +1,305 @@
+# GameArchive.py - Compact binary game storage: one byte per move
+
+import argparse
+import bisect
+import time
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+# Handle imports for both standalone and package execution
+try:
+    from .chess_board import ChessBoard
+    from . import movegen
+    from .notation import SanToMove, MoveToSan
+    from . import pgn_reader
+    from . import pgn_writer
+except ImportError:
+    from chess_board import ChessBoard
+    import movegen
+    from notation import SanToMove, MoveToSan
+    import pgn_reader
+    import pgn_writer
+
+Move = Tuple[Tuple[int, int], Tuple[int, int]]
+
+# File layout:
+#   MAGIC
+#   per game: varint record length, then the record:
+#     varint tag count, per tag: tag name (varint id from KNOWN_TAGS, or 0 +
+#     varint length + UTF-8), varint length + UTF-8 value
+#     varint move count, then one byte per move: its index in
+#     ChessBoard.GetAllLegalMoves() for the position it was played in
+MAGIC = b"CPYGAME1"
+KNOWN_TAGS = ("Event", "Site", "Date", "Round", "White", "Black", "Result",
+              "WhiteElo", "BlackElo", "ECO", "TimeControl", "Termination", "FEN", "Opening")
+_TAG_IDS = {tag: index + 1 for index, tag in enumerate(KNOWN_TAGS)}
+
+# ===== VARINTS =====
+
+def WriteVarint(buffer: bytearray, value: int):
+    """Append an unsigned integer using 7 bits per byte (LEB128)"""
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+def ReadVarint(data: bytes, position: int) -> Tuple[int, int]:
+    """Read an unsigned LEB128 integer, returns (value, next position)"""
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+def _ReadStreamVarint(stream: BinaryIO) -> Optional[int]:
+    """Read a varint straight from a file, None at end of file"""
+    value = shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            if shift:
+                raise ValueError("Archive ends in the middle of a record length")
+            return None
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+# ===== MOVE ENCODING =====
+
+def StartBoard(headers: Dict[str, str], chess_board: Optional[ChessBoard] = None) -> ChessBoard:
+    """Set up the position a game starts from (the FEN tag, or the normal start)"""
+    chess_board = chess_board if chess_board is not None else ChessBoard()
+    if "FEN" in headers:
+        chess_board.FromFEN(headers["FEN"])
+    else:
+        chess_board.Reset()
+    return chess_board
+
+def EncodeMoves(chess_board: ChessBoard, moves: List[Move]) -> bytes:
+    """Turn moves into their indices in the legal move list (plays them on the board)"""
+    encoded = bytearray()
+    for move in moves:
+        encoded.append(MoveToIndex(chess_board, move))
+        chess_board.MakeMove(*move)
+    return bytes(encoded)
+
+# Encoding and decoding visit each position once, so they call movegen directly:
+# going through the board's move cache would only add lookups and evictions.
+
+def MoveToIndex(chess_board: ChessBoard, move: Move) -> int:
+    """Get the position of a move in GetAllLegalMoves(), raises ValueError if illegal"""
+    from_pos, to_pos = move
+    index = 0
+    board = chess_board.board
+    for square in chess_board.GetPlayerPieceSquares():
+        to_moves = movegen.GenerateMoves(board, *square)
+        if square == from_pos:
+            index += to_moves.index(to_pos)
+            break
+        index += len(to_moves)
+    else:
+        raise ValueError(f"Illegal move: {move}")
+    if index > 255:
+        raise ValueError("Position has more than 256 legal moves")
+    return index
+
+def DecodeMoves(chess_board: ChessBoard, move_indices: bytes) -> Iterator[Move]:
+    """Turn stored indices back into moves, playing each one on the board"""
+    # Both sides' piece squares are kept sorted here as the moves are played,
+    # which is cheaper than asking the board for them before every move
+    board = chess_board.board
+    white_squares = [(row, col) for row in range(8) for col in range(8) if board[row][col] in movegen.WHITE_PIECES]
+    black_squares = [(row, col) for row in range(8) for col in range(8) if board[row][col] in movegen.BLACK_PIECES]
+    own, other = (white_squares, black_squares) if chess_board.IsWhiteTurn() else (black_squares, white_squares)
+    for index in move_indices:
+        move = movegen.NthMove(board, own, index)
+        if move is None:
+            raise ValueError("Move index out of range - archive does not match the move rules")
+        from_pos, to_pos = move
+        own.remove(from_pos)
+        bisect.insort(own, to_pos)
+        if board[to_pos[0]][to_pos[1]] != ".":
+            other.remove(to_pos)
+        yield move
+        chess_board.MakeMove(*move)
+        own, other = other, own
+
+def MoveAtIndex(chess_board: ChessBoard, index: int) -> Move:
+    """Get GetAllLegalMoves()[index], generating moves only up to the piece that owns it"""
+    move = movegen.NthMove(chess_board.board, chess_board.GetPlayerPieceSquares(), index)
+    if move is None:
+        raise ValueError("Move index out of range - archive does not match the move rules")
+    return move
+
+# ===== WRITING =====
+
+class ArchiveWriter:
+    """Appends games to a binary archive"""
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.stream.write(MAGIC)
+        self.chess_board = ChessBoard()
+
+    def WriteGame(self, headers: Dict[str, str], moves: List[Move]):
+        """Encode and write one game"""
+        move_indices = EncodeMoves(StartBoard(headers, self.chess_board), moves)
+        self.WriteEncodedGame(headers, move_indices)
+
+    def WriteEncodedGame(self, headers: Dict[str, str], move_indices: bytes):
+        """Write one game whose moves are already encoded"""
+        record = bytearray()
+        WriteVarint(record, len(headers))
+        for tag, value in headers.items():
+            tag_id = _TAG_IDS.get(tag, 0)
+            WriteVarint(record, tag_id)
+            if tag_id == 0:
+                _WriteText(record, tag)
+            _WriteText(record, value)
+        WriteVarint(record, len(move_indices))
+        record += move_indices
+
+        length = bytearray()
+        WriteVarint(length, len(record))
+        self.stream.write(length)
+        self.stream.write(record)
+
+def _WriteText(buffer: bytearray, text: str):
+    """Append a length-prefixed UTF-8 string"""
+    data = text.encode("utf-8")
+    WriteVarint(buffer, len(data))
+    buffer += data
+
+# ===== READING =====
+
+class ArchiveGame:
+    """One game read from an archive; moves are decoded only when asked for"""
+    def __init__(self, headers: Dict[str, str], move_indices: bytes):
+        self.headers = headers
+        self.move_indices = move_indices
+
+    def GetMoves(self, chess_board: Optional[ChessBoard] = None) -> List[Move]:
+        """Decode the moves (leaves the board at the final position)"""
+        return list(DecodeMoves(StartBoard(self.headers, chess_board), self.move_indices))
+
+    def GetSanMoves(self, chess_board: Optional[ChessBoard] = None) -> List[str]:
+        """Decode the moves as SAN text"""
+        chess_board = StartBoard(self.headers, chess_board)
+        san_moves = []
+        for index in self.move_indices:
+            move = MoveAtIndex(chess_board, index)
+            san_moves.append(MoveToSan(chess_board, move))
+            chess_board.MakeMove(*move)
+        return san_moves
+
+def ReadArchive(source: Union[str, BinaryIO]) -> Iterator[ArchiveGame]:
+    """Yield games one at a time from an archive file"""
+    if isinstance(source, str):
+        with open(source, "rb") as archive_file:
+            yield from ReadArchive(archive_file)
+        return
+
+    if source.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a game archive")
+    while True:
+        length = _ReadStreamVarint(source)
+        if length is None:
+            return
+        record = source.read(length)
+        if len(record) != length:
+            raise ValueError("Archive ends in the middle of a game")
+        yield _ParseRecord(record)
+
+def _ParseRecord(record: bytes) -> ArchiveGame:
+    """Decode the tags and move bytes of one record"""
+    headers = {}
+    tag_count, position = ReadVarint(record, 0)
+    for _ in range(tag_count):
+        tag_id, position = ReadVarint(record, position)
+        if tag_id == 0:
+            tag, position = _ReadText(record, position)
+        else:
+            tag = KNOWN_TAGS[tag_id - 1]
+        headers[tag], position = _ReadText(record, position)
+    move_count, position = ReadVarint(record, position)
+    return ArchiveGame(headers, record[position:position + move_count])
+
+def _ReadText(data: bytes, position: int) -> Tuple[str, int]:
+    """Read a length-prefixed UTF-8 string"""
+    length, position = ReadVarint(data, position)
+    return data[position:position + length].decode("utf-8"), position + length
+
+# ===== CONVERSION =====
+
+def ConvertPgnToArchive(pgn_path: str, archive_path: str) -> Tuple[int, int]:
+    """Convert a PGN file, returns (games written, games cut short or skipped)
+
+    A game is cut short at the first move the board can't play or the archive
+    can't store (index over 255), and skipped if its FEN tag can't be loaded.
+    """
+    games = truncated = 0
+    chess_board = ChessBoard()
+    with open(archive_path, "wb") as archive_file:
+        writer = ArchiveWriter(archive_file)
+        for game in pgn_reader.ReadGames(pgn_path):
+            try:
+                StartBoard(game.headers, chess_board)
+            except ValueError:
+                truncated += 1
+                continue
+            move_indices = bytearray()
+            for san in game.moves:
+                try:
+                    move = SanToMove(chess_board, san)
+                    move_indices.append(MoveToIndex(chess_board, move))
+                except ValueError:
+                    truncated += 1
+                    break
+                chess_board.MakeMove(*move)
+            headers = dict(game.headers)
+            headers.setdefault("Result", game.result)
+            writer.WriteEncodedGame(headers, bytes(move_indices))
+            games += 1
+    return games, truncated
+
+def ConvertArchiveToPgn(archive_path: str, pgn_path: str) -> int:
+    """Convert an archive back to PGN text, returns the number of games"""
+    games = 0
+    chess_board = ChessBoard()
+    with open(pgn_path, "w", encoding="utf-8") as pgn_file:
+        for game in ReadArchive(archive_path):
+            start_board = StartBoard(game.headers, chess_board)
+            first_move_white, first_move_number = start_board.IsWhiteTurn(), start_board.GetFullmoveNumber()
+            san_moves = game.GetSanMoves(chess_board)
+            pgn_file.write(pgn_writer.FormatGame(game.headers, san_moves, game.headers.get("Result", "*"),
+                                                 first_move_white, first_move_number))
+            games += 1
+    return games
+
+# ===== MAIN ENTRY POINT =====
+
+def main(argv: Optional[List[str]] = None):
+    """Convert between PGN and the binary archive format"""
+    parser = argparse.ArgumentParser(description="Convert games between PGN and the compact binary archive")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    to_archive = subparsers.add_parser("to-archive", help="PGN -> archive")
+    to_archive.add_argument("pgn")
+    to_archive.add_argument("archive")
+    to_pgn = subparsers.add_parser("to-pgn", help="Archive -> PGN")
+    to_pgn.add_argument("archive")
+    to_pgn.add_argument("pgn")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.command == "to-archive":
+        games, truncated = ConvertPgnToArchive(args.pgn, args.archive)
+        print(f"Wrote {games} games ({truncated} cut short or skipped)")
+    else:
+        games = ConvertArchiveToPgn(args.archive, args.pgn)
+        print(f"Wrote {games} games")
+    print(f"Took {time.perf_counter() - start:.2f} s")
+
+if __name__ == '__main__':
+    main()
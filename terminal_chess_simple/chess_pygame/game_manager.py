@@ -1,16 +1,28 @@
 # GameManager.py - Main game logic controller (like a GameManager in Unity)
 
-from typing import Tuple, Set, Optional
+from __future__ import annotations  # PositionIndex is only imported for type checkers
+
+import contextlib
+from typing import TYPE_CHECKING, List, Tuple, Set, Optional
 
 # Handle imports for both standalone and package execution
 try:
     from .chess_board import ChessBoard
     from .chess_renderer import ChessRenderer
     from .input_manager import InputManager, InputEvents
+    from .frame_profiler import FrameProfiler
 except ImportError:
     from chess_board import ChessBoard
     from chess_renderer import ChessRenderer
     from input_manager import InputManager, InputEvents
+    from frame_profiler import FrameProfiler
+
+if TYPE_CHECKING:
+    # The index (with the PGN reader and SAN parser behind it) is only needed when
+    # a caller passes one in, so the GUI doesn't pay for importing it at startup
+    from .position_index import PositionIndex
+
+_NOT_PROFILED = contextlib.nullcontext()
 
 class GameState:
     """Game state constants"""
@@ -19,16 +31,33 @@ class GameState:
     PAUSED = "paused"
 
 class GameManager:
-    def __init__(self, chess_board: ChessBoard, renderer: ChessRenderer, input_manager: InputManager):
+    def __init__(self, chess_board: ChessBoard, renderer: ChessRenderer, input_manager: InputManager,
+                 dirty_rects: bool = False, profiler: Optional[FrameProfiler] = None):
         self.chess_board = chess_board
         self.renderer = renderer
         self.input_manager = input_manager
         
+        # Dirty-rect mode: redraw only the squares that changed since the last frame
+        self.dirty_rects = dirty_rects
+        self._drawn_squares: Optional[List[Tuple[str, Tuple[int, int, int]]]] = None  # (piece, color) per square
+        self._drawn_player: Optional[str] = None
+        self._player_area = None
+        
+        # Optional per-phase frame timing, with an overlay toggled by F3
+        self.profiler = profiler
+        self._overlay_area = None
+        
+        # Set by state changes that need a new frame (input sets its own flag)
+        self.frame_dirty = True
+        
         # Game state
         self.game_state = GameState.PLAYING
         self.selected_piece_pos: Optional[Tuple[int, int]] = None
         self.highlighted_moves: Set[Tuple[int, int]] = set()
         
+        # Optional game archive index for "games reaching this position" queries
+        self.position_index: Optional[PositionIndex] = None
+        
         # Register input handlers
         self._RegisterInputHandlers()
     
@@ -39,6 +68,9 @@ class GameManager:
         self.input_manager.RegisterHandler(InputEvents.QUIT, self._OnQuit)
         self.input_manager.RegisterHandler(InputEvents.ESCAPE, self._OnEscape)
         self.input_manager.RegisterHandler(InputEvents.MOUSE_CLICK, self._OnMouseClick)
+        self.input_manager.RegisterHandler(InputEvents.EXPOSE, self.InvalidateFrame)
+        self.input_manager.RegisterHandler(InputEvents.RESIZE, self._OnResize)
+        self.input_manager.RegisterHandler(InputEvents.TOGGLE_PROFILER, self._OnToggleProfiler)
     
     # ===== GAME LOOP METHODS =====
     
@@ -55,20 +87,114 @@ class GameManager:
     
     def Render(self):
         """Render the current game state"""
-        self.renderer.DrawBackground()
+        if self.dirty_rects and self._drawn_squares is not None and self.game_state == GameState.PLAYING:
+            self._RenderChanges()
+            return
+        
+        with self._Measure("DrawBoard"):
+            self.renderer.DrawBackground()
         
         if self.game_state == GameState.PLAYING:
             self._RenderGameplay()
+        self._overlay_area = self._DrawProfilerOverlay()
         
-        self.renderer.RefreshDisplay()
+        with self._Measure("Flip"):
+            self.renderer.RefreshDisplay()
     
     def _RenderGameplay(self):
         """Render gameplay elements"""
         current_player = self.chess_board.GetCurrentPlayer()
         
-        self.renderer.DrawBoard(self.selected_piece_pos or (-1, -1), self.highlighted_moves)
-        self.renderer.DrawPieces(self.chess_board)
-        self.renderer.DrawUI(current_player)
+        with self._Measure("DrawBoard"):
+            self.renderer.DrawBoard(self.selected_piece_pos or (-1, -1), self.highlighted_moves)
+        with self._Measure("DrawPieces"):
+            self.renderer.DrawPieces(self.chess_board)
+        with self._Measure("DrawUI"):
+            player_area = self.renderer.DrawUI(current_player)
+        
+        if self.dirty_rects:
+            self._drawn_squares = self._GetSquareStates()
+            self._drawn_player, self._player_area = current_player, player_area
+    
+    def _RenderChanges(self):
+        """Redraw only squares and text that differ from the last frame"""
+        changed_areas = []
+        old_overlay_area = self._overlay_area
+        if old_overlay_area is not None:
+            self._ClearOverlay(old_overlay_area)
+        
+        with self._Measure("DrawBoard"):
+            square_states = self._GetSquareStates()
+            changed_squares = []
+            for square, (state, drawn_state) in enumerate(zip(square_states, self._drawn_squares)):
+                if state != drawn_state:
+                    row, col = divmod(square, 8)
+                    self.renderer.DrawSquare(row, col, state[1])
+                    changed_squares.append((row, col, state[0]))
+                    changed_areas.append(self.renderer.GetSquareRect(row, col))
+            self._drawn_squares = square_states
+        with self._Measure("DrawPieces"):
+            for row, col, piece in changed_squares:
+                self.renderer.DrawPiece(row, col, piece)
+        
+        with self._Measure("DrawUI"):
+            current_player = self.chess_board.GetCurrentPlayer()
+            if current_player != self._drawn_player:
+                self.renderer.ClearArea(self._player_area)
+                new_area = self.renderer.DrawCurrentPlayer(current_player)
+                changed_areas.append(self._player_area.union(new_area))
+                self._drawn_player, self._player_area = current_player, new_area
+        
+        self._overlay_area = self._DrawProfilerOverlay()
+        changed_areas.extend(area for area in (old_overlay_area, self._overlay_area) if area is not None)
+        
+        # A static position updates nothing at all
+        with self._Measure("Flip"):
+            self.renderer.RefreshAreas(changed_areas)
+    
+    def _GetSquareStates(self) -> List[Tuple[str, Tuple[int, int, int]]]:
+        """What each square shows: its piece and fill color"""
+        selected_pos = self.selected_piece_pos or (-1, -1)
+        get_piece, get_color = self.chess_board.GetPiece, self.renderer.GetSquareColor
+        return [(get_piece(row, col), get_color(row, col, selected_pos, self.highlighted_moves))
+                for row in range(8) for col in range(8)]
+    
+    def _Measure(self, phase: str):
+        """Time a block as one phase of the frame (does nothing without a profiler)"""
+        return self.profiler.Measure(phase) if self.profiler is not None else _NOT_PROFILED
+    
+    def _DrawProfilerOverlay(self):
+        """Draw the frame statistics if the overlay is on, returns the area drawn or None"""
+        if self.profiler is None or not self.profiler.overlay_visible:
+            return None
+        return self.renderer.DrawOverlay(self.profiler.GetOverlayRows())
+    
+    def _ClearOverlay(self, area):
+        """Restore the screen under the overlay, and mark the squares it covered for redrawing"""
+        self.renderer.ClearArea(area)
+        for square in range(64):
+            if area.colliderect(self.renderer.GetSquareRect(*divmod(square, 8))):
+                self._drawn_squares[square] = None
+        if self._player_area is not None and area.colliderect(self._player_area):
+            self._drawn_player = None
+    
+    def InvalidateFrame(self):
+        """Force the next frame to be redrawn in full (e.g. after a resize)"""
+        self._drawn_squares = None
+        self.frame_dirty = True
+    
+    def ConsumeDirty(self) -> bool:
+        """Check whether game state asked for a new frame since the last call, and reset the flag"""
+        dirty = self.frame_dirty
+        self.frame_dirty = False
+        return dirty
+    
+    def NeedsContinuousFrames(self) -> bool:
+        """Whether frames must keep coming without input (animations, background work)"""
+        # Nothing animates yet and the GUI has no engine opponent, so the
+        # loop can sleep until the next event, unless the profiler overlay
+        # is showing live frame times
+        return self.profiler is not None and self.profiler.overlay_visible
     
     # ===== INPUT HANDLERS =====
     
@@ -82,6 +208,17 @@ class GameManager:
         print("Escape pressed - quitting game")
         self.game_state = GameState.GAME_OVER
     
+    def _OnResize(self, size: Tuple[int, int]):
+        """Handle window resize"""
+        self.renderer.Resize(size)
+        self.InvalidateFrame()
+    
+    def _OnToggleProfiler(self):
+        """Handle the profiler overlay key"""
+        if self.profiler is not None:
+            self.profiler.ToggleOverlay()
+            self.InvalidateFrame()
+    
     def _OnMouseClick(self, mouse_pos: Tuple[int, int]):
         """Handle mouse click"""
         if self.game_state != GameState.PLAYING:
@@ -165,6 +302,16 @@ class GameManager:
         """Get current player name"""
         return self.chess_board.GetCurrentPlayer()
     
+    def FindArchiveGames(self) -> List[int]:
+        """Get PGN byte offsets of archive games that reached the current position"""
+        if self.position_index is None:
+            return []
+        return self.position_index.FindGamesForBoard(self.chess_board)
+    
+    def SetPositionIndex(self, position_index: Optional[PositionIndex]):
+        """Attach (or detach with None) a game archive index"""
+        self.position_index = position_index
+    
     # ===== GAME CONTROLS =====
     
     def ResetGame(self):
@@ -172,12 +319,15 @@ class GameManager:
         self.chess_board.Reset()
         self._ClearSelection()
         self.game_state = GameState.PLAYING
+        self.InvalidateFrame()
         print("Game reset!")
     
     def PauseGame(self):
         """Pause the game"""
         self.game_state = GameState.PAUSED
+        self.frame_dirty = True
     
     def ResumeGame(self):
         """Resume the game"""
-        self.game_state = GameState.PLAYING
\ No newline at end of file
+        self.game_state = GameState.PLAYING
+        self.InvalidateFrame()
\ No newline at end of file
@@ -0,0 +1,373 @@
+# GameServer.py - Headless asyncio server hosting many ChessBoard games in one process
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import traceback
+from typing import Dict, List, Optional, Set, Tuple
+
+# Handle imports for both standalone and package execution
+try:
+    from .chess_board import ChessBoard
+    from .chess_engine import MoveToUci, UciToMove
+    from .notation import IndexToSquare
+    from . import board_snapshot
+except ImportError:
+    from chess_board import ChessBoard
+    from chess_engine import MoveToUci, UciToMove
+    from notation import IndexToSquare
+    import board_snapshot
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7878
+DEFAULT_AUTOSAVE_SECONDS = 30
+REPLY_BUFFER_DRAIN = 1 << 16    # Unsent bytes at which a connection waits for its own client
+WATCHER_BUFFER_LIMIT = 1 << 20  # Unsent bytes at which a watcher that stopped reading is dropped
+
+# Line protocol (one ASCII command per line, one reply line per command):
+#   NEW                -> GAME <id> <fen>
+#   JOIN <id>          -> GAME <id> <fen>         (also subscribes to the game's moves)
+#   MOVE <id> <uci>    -> MOVED <id> <uci> <w|b> <square>=<piece> ... [<result>]
+#                         sent to every connection watching the game; the
+#                         squares are only the ones the move changed
+#   FEN <id>           -> FEN <id> <fen>
+#   QUIT               -> BYE
+# Any failure replies ERR <id or -> <reason>. A line over 64 KiB gets an ERR reply
+# and the connection is closed, as is a watcher that falls WATCHER_BUFFER_LIMIT
+# bytes behind on MOVED lines (it has stopped reading).
+
+class HostedGame:
+    """One live game on the server"""
+    __slots__ = ("game_id", "chess_board", "result", "watchers")
+
+    def __init__(self, game_id: int, chess_board: Optional[ChessBoard] = None):
+        self.game_id = game_id
+        self.chess_board = chess_board if chess_board is not None else ChessBoard()
+        self.result: Optional[str] = None
+        self.watchers: Set[asyncio.StreamWriter] = set()
+
+        # A restored game is over if its last move took a king
+        history = self.chess_board.move_history
+        if history and history[-1].captured.lower() == 'k':
+            self.result = "0-1" if history[-1].piece.islower() else "1-0"
+
+class GameServer:
+    """Hosts games and speaks the line protocol to any number of connections
+
+    With a snapshot path, games are restored from it on start, saved to it
+    every autosave_seconds and saved again on stop.
+    """
+    def __init__(self, snapshot_path: Optional[str] = None, autosave_seconds: float = DEFAULT_AUTOSAVE_SECONDS):
+        self.games: Dict[int, HostedGame] = {}
+        self.next_game_id = 1
+        self.moves_played = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.snapshot_path = snapshot_path
+        self.autosave_seconds = autosave_seconds
+        self.autosave_task: Optional[asyncio.Task] = None
+
+    async def Start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> int:
+        """Start listening, returns the port (useful when port is 0)"""
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            self.RestoreGames()
+        if self.snapshot_path and self.autosave_seconds > 0:
+            self.autosave_task = asyncio.get_running_loop().create_task(self._Autosave())
+        self.server = await asyncio.start_server(self.HandleConnection, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def Stop(self):
+        """Stop accepting connections (and save the games)"""
+        if self.autosave_task is not None:
+            self.autosave_task.cancel()
+            self.autosave_task = None
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.snapshot_path:
+            self.SaveGames()
+
+    # ===== SNAPSHOTS =====
+
+    def SaveGames(self):
+        """Write every hosted game to the snapshot file"""
+        board_snapshot.SaveGames(self.snapshot_path,
+                                 {game_id: game.chess_board for game_id, game in self.games.items()})
+
+    def RestoreGames(self):
+        """Load every game from the snapshot file, replacing the hosted ones"""
+        boards = board_snapshot.LoadGames(self.snapshot_path)
+        self.games = {game_id: HostedGame(game_id, chess_board) for game_id, chess_board in boards.items()}
+        self.next_game_id = max(self.games, default=0) + 1
+
+    async def _Autosave(self):
+        """Save periodically so a crash loses at most one interval of moves"""
+        while True:
+            await asyncio.sleep(self.autosave_seconds)
+            try:
+                self.SaveGames()
+            except (OSError, ValueError) as e:
+                # Keep saving on later intervals; the previous snapshot file is left in place
+                print(f"Autosave failed: {e}", file=sys.stderr)
+
+    # ===== CONNECTIONS =====
+
+    async def HandleConnection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one client until it quits or disconnects"""
+        watching: List[HostedGame] = []
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Longer than the reader's limit: the rest of the line can't be found reliably
+                    writer.write(b"ERR - line too long\n")
+                    break
+                if not line:
+                    break
+                words = line.decode("ascii", "replace").split()
+                try:
+                    reply = self.HandleCommand(words, writer, watching)
+                except Exception:
+                    # A bug in one command must not take the connection down, but must not go unnoticed either
+                    print(f"Error handling command {' '.join(words)!r}:", file=sys.stderr)
+                    traceback.print_exc()
+                    reply = "ERR - internal error"
+                if reply is None:
+                    writer.write(b"BYE\n")
+                    break
+                if reply:
+                    # Replies can echo the client's words, where undecodable bytes became U+FFFD
+                    writer.write(reply.encode("ascii", "replace") + b"\n")
+                # Only wait on the socket when the client is falling behind
+                if writer.transport.get_write_buffer_size() > REPLY_BUFFER_DRAIN:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for game in watching:
+                game.watchers.discard(writer)
+            writer.close()
+
+    def HandleCommand(self, words: List[str], writer: asyncio.StreamWriter,
+                      watching: List[HostedGame]) -> Optional[str]:
+        """Run one command, returns the reply line ("" if already sent, None to hang up)"""
+        if not words:
+            return "ERR - empty command"
+        command = words[0].upper()
+
+        if command == "NEW":
+            game = self.CreateGame()
+            self._Watch(game, writer, watching)
+            return f"GAME {game.game_id} {game.chess_board.ToFEN()}"
+        if command == "QUIT":
+            return None
+        if command not in ("JOIN", "MOVE", "FEN") or len(words) < 2:
+            return f"ERR - unknown command: {' '.join(words)}"
+
+        game = self.games.get(int(words[1])) if words[1].isdigit() else None
+        if game is None:
+            return f"ERR {words[1]} no such game"
+        if command == "JOIN":
+            self._Watch(game, writer, watching)
+            return f"GAME {game.game_id} {game.chess_board.ToFEN()}"
+        if command == "FEN":
+            return f"FEN {game.game_id} {game.chess_board.ToFEN()}"
+
+        if len(words) < 3:
+            return f"ERR {game.game_id} missing move"
+        error, delta = self.PlayMove(game, words[2])
+        if error is not None:
+            return f"ERR {game.game_id} {error}"
+        message = f"MOVED {game.game_id} {delta}\n".encode("ascii")
+        for watcher in list(game.watchers):
+            # The sender drains its own buffer; other watchers are never waited on,
+            # so one that stops reading would make its buffer grow without limit
+            if watcher is not writer and watcher.transport.get_write_buffer_size() > WATCHER_BUFFER_LIMIT:
+                self._DropWatcher(watcher)
+                continue
+            watcher.write(message)
+        if writer not in game.watchers:
+            writer.write(message)
+        return ""
+
+    def _Watch(self, game: HostedGame, writer: asyncio.StreamWriter, watching: List[HostedGame]):
+        """Send this connection every move of the game from now on"""
+        if writer not in game.watchers:
+            game.watchers.add(writer)
+            watching.append(game)
+
+    def _DropWatcher(self, writer: asyncio.StreamWriter):
+        """Disconnect a watcher that stopped reading, discarding what it hasn't received"""
+        for game in self.games.values():
+            game.watchers.discard(writer)
+        # abort() rather than close(): close() would wait to send the backlog first.
+        # Its HandleConnection then sees the connection end and cleans up as usual.
+        writer.transport.abort()
+
+    # ===== GAMES =====
+
+    def CreateGame(self) -> HostedGame:
+        """Start a new game from the initial position"""
+        game = HostedGame(self.next_game_id)
+        self.games[game.game_id] = game
+        self.next_game_id += 1
+        return game
+
+    def PlayMove(self, game: HostedGame, move_text: str) -> Tuple[Optional[str], str]:
+        """Validate and play a UCI move, returns (error, state delta)"""
+        if game.result is not None:
+            return f"game over {game.result}", ""
+        try:
+            from_pos, to_pos = UciToMove(move_text)
+        except ValueError:
+            return f"bad move {move_text}", ""
+
+        chess_board = game.chess_board
+        white_moved = chess_board.IsWhiteTurn()
+        captured = chess_board.GetPiece(*to_pos)
+        if not chess_board.TryMakeMove(from_pos, to_pos):
+            return f"illegal move {move_text}", ""
+        self.moves_played += 1
+
+        # A move changes exactly two squares (no castling or en passant)
+        delta = (f"{move_text} {'w' if chess_board.IsWhiteTurn() else 'b'} "
+                 f"{IndexToSquare(*from_pos)}=. {IndexToSquare(*to_pos)}={chess_board.GetPiece(*to_pos)}")
+        if captured.lower() == 'k':
+            game.result = "1-0" if white_moved else "0-1"
+            delta += f" {game.result}"
+        return None, delta
+
+# ===== LOAD TEST =====
+
+def GenerateGameScripts(count: int, plies: int, seed: int = 1) -> List[List[str]]:
+    """Random legal games as UCI move lists, replayed by the load-test clients"""
+    rng = random.Random(seed)
+    scripts = []
+    chess_board = ChessBoard()
+    for _ in range(count):
+        chess_board.Reset()
+        moves = []
+        for _ in range(plies):
+            legal_moves = chess_board.GetAllLegalMoves()
+            if not legal_moves:
+                break
+            move = rng.choice(legal_moves)
+            if chess_board.GetPiece(*move[1]).lower() == 'k':
+                break  # Stop before the game ends so every move is accepted
+            moves.append(MoveToUci(move, chess_board))
+            chess_board.MakeMove(*move)
+        scripts.append(moves)
+    return scripts
+
+async def _LoadClient(host: str, port: int, games: int, scripts: List[List[str]], offset: int) -> int:
+    """Open one connection and play several games on it, one move in flight per game"""
+    reader, writer = await asyncio.open_connection(host, port)
+    game_ids = []
+    for _ in range(games):
+        writer.write(b"NEW\n")
+        await writer.drain()
+        game_ids.append(int((await reader.readline()).split()[1]))
+
+    # Round-robin over the games: send one move for each, then read all replies
+    moves = 0
+    cursors = [scripts[(offset + index) % len(scripts)] for index in range(games)]
+    for ply in range(max(len(script) for script in cursors)):
+        batch = [f"MOVE {game_id} {script[ply]}\n" for game_id, script in zip(game_ids, cursors) if ply < len(script)]
+        writer.write("".join(batch).encode("ascii"))
+        await writer.drain()
+        for _ in batch:
+            reply = await reader.readline()
+            if not reply.startswith(b"MOVED"):
+                raise RuntimeError(f"Server rejected a move: {reply.decode().strip()}")
+        moves += len(batch)
+
+    writer.write(b"QUIT\n")
+    await writer.drain()
+    await reader.readline()
+    writer.close()
+    return moves
+
+async def RunLoadTest(games: int, connections: int, plies: int, host: Optional[str] = None,
+                      port: int = DEFAULT_PORT) -> dict:
+    """Play many games at once against a server (started in-process unless host is given)"""
+    server = None
+    if host is None:
+        server = GameServer()
+        host, port = DEFAULT_HOST, await server.Start(DEFAULT_HOST, 0)
+
+    scripts = GenerateGameScripts(min(games, 256), plies)
+    connections = max(1, min(connections, games))
+    per_connection = [games // connections + (1 if index < games % connections else 0) for index in range(connections)]
+
+    start = time.perf_counter()
+    offsets = [sum(per_connection[:index]) for index in range(connections)]
+    totals = await asyncio.gather(*(_LoadClient(host, port, count, scripts, offset)
+                                    for count, offset in zip(per_connection, offsets)))
+    seconds = time.perf_counter() - start
+
+    if server is not None:
+        await server.Stop()
+    moves = sum(totals)
+    return {
+        'games': games,
+        'connections': connections,
+        'moves': moves,
+        'seconds': round(seconds, 3),
+        'moves_per_second': round(moves / seconds) if seconds > 0 else 0,
+        'in_process_server': server is not None,
+    }
+
+# ===== MAIN ENTRY POINT =====
+
+async def _Serve(host: str, port: int, snapshot_path: Optional[str], autosave_seconds: float):
+    """Run the server until interrupted"""
+    server = GameServer(snapshot_path, autosave_seconds)
+    start = time.perf_counter()
+    port = await server.Start(host, port)
+    if server.games:
+        print(f"Restored {len(server.games)} games in {(time.perf_counter() - start) * 1000:.0f} ms", file=sys.stderr)
+    print(f"Game server listening on {host}:{port}", file=sys.stderr)
+    try:
+        await server.server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await server.Stop()
+        print(f"{len(server.games)} games hosted, {server.moves_played} moves played", file=sys.stderr)
+
+def main(argv: Optional[List[str]] = None):
+    """Run the game server or its load test from the command line"""
+    parser = argparse.ArgumentParser(description="Headless multi-game chess server")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Host games over TCP")
+    serve_parser.add_argument("--host", default=DEFAULT_HOST)
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--snapshot", default=None, help="File to restore games from and save them to")
+    serve_parser.add_argument("--autosave", type=float, default=DEFAULT_AUTOSAVE_SECONDS,
+                              help="Seconds between snapshot saves (0 = only on shutdown)")
+
+    bench_parser = subparsers.add_parser("bench", help="Measure concurrent games and moves per second")
+    bench_parser.add_argument("--games", type=int, default=2000, help="Games played at the same time")
+    bench_parser.add_argument("--connections", type=int, default=50, help="Client connections sharing the games")
+    bench_parser.add_argument("--plies", type=int, default=40, help="Moves per game")
+    bench_parser.add_argument("--host", default=None, help="Server to load (default: start one in this process)")
+    bench_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        try:
+            asyncio.run(_Serve(args.host, args.port, args.snapshot, args.autosave))
+        except KeyboardInterrupt:
+            pass
+    else:
+        report = asyncio.run(RunLoadTest(args.games, args.connections, args.plies, args.host, args.port))
+        where = "server and clients sharing one process" if report['in_process_server'] else f"server at {args.host}"
+        print(f"{report['games']} concurrent games over {report['connections']} connections: "
+              f"{report['moves']} moves in {report['seconds']} s = {report['moves_per_second']:,} moves/s ({where})")
+
+if __name__ == '__main__':
+    main()
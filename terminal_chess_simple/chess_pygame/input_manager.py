@@ -1,18 +1,65 @@
 # InputManager.py - Handles input events (like an Input Manager in Unity)
 
-import pygame
-from typing import Tuple, Optional, Callable
+from __future__ import annotations  # pygame types in signatures must not load pygame at import
+
+import json
+import time
+from typing import Any, Callable, List, NamedTuple, Optional, TextIO, Tuple
+
+# Handle imports for both standalone and package execution
+try:
+    from .startup_profile import LazyImport
+except ImportError:
+    from startup_profile import LazyImport
+
+pygame = LazyImport("pygame")  # Loaded on first use, so LoadRecording works without pygame
 
 class InputEvents:
     """Event type constants"""
     QUIT = "quit"
     ESCAPE = "escape"
     MOUSE_CLICK = "mouse_click"
+    EXPOSE = "expose"  # Window contents were lost or uncovered and must be redrawn
+    RESIZE = "resize"  # Window size changed, data is the new (width, height)
+    TOGGLE_PROFILER = "toggle_profiler"  # F3: show or hide frame timings
+
+class RecordedEvent(NamedTuple):
+    """One input event from a recording"""
+    time: float       # Seconds since the recording started
+    event_type: str   # One of InputEvents
+    data: Any = None  # Event data, e.g. the (x, y) of a click
+
+def LoadRecording(path: str) -> List[RecordedEvent]:
+    """Read a recording written by InputManager.StartRecording, raises ValueError if it is malformed"""
+    events = []
+    with open(path, "r", encoding="utf-8") as recording_file:
+        for line_number, line in enumerate(recording_file, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                data = entry.get("data")
+                events.append(RecordedEvent(float(entry["time"]), str(entry["event"]),
+                                            tuple(data) if isinstance(data, list) else data))
+            except (ValueError, KeyError, TypeError, AttributeError) as error:
+                raise ValueError(f"{path}:{line_number}: not a recorded event ({error})")
+    return events
 
 class InputManager:
     def __init__(self):
         self.event_handlers = {}
         self._running = True
+        self.frame_dirty = True  # Set whenever an event was handled since the last render
+        self._waited_event: Optional[pygame.event.Event] = None
+        
+        # Recording writes every triggered event; replay feeds recorded events instead of pygame's queue
+        self._recording: Optional[TextIO] = None
+        self._recording_start = 0.0
+        self._replay_events: Optional[List[RecordedEvent]] = None
+        self._replay_index = 0
+        self._replay_start = 0.0
+        self._replay_real_time = False
+        self._quit_after_replay = True
     
     # ===== EVENT REGISTRATION =====
     
@@ -32,11 +79,39 @@ class InputManager:
     
     def ProcessEvents(self) -> bool:
         """Process all pygame events, returns False if should quit"""
+        if self._replay_events is not None:
+            self._ProcessReplay()
+            return self._running
+        
+        if self._waited_event is not None:
+            event, self._waited_event = self._waited_event, None
+            self._HandleEvent(event)
         for event in pygame.event.get():
             self._HandleEvent(event)
         
         return self._running
     
+    def WaitForEvents(self, timeout_ms: int) -> bool:
+        """Sleep until an event arrives (or the timeout passes), returns True if one did
+        
+        The event is handled by the next ProcessEvents call, so waiting and
+        processing can be timed separately.
+        """
+        if self._replay_events is not None:
+            return self._WaitForReplay(timeout_ms)
+        
+        event = pygame.event.wait(timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return False
+        self._waited_event = event
+        return True
+    
+    def ConsumeDirty(self) -> bool:
+        """Check whether input changed anything since the last call, and reset the flag"""
+        dirty = self.frame_dirty
+        self.frame_dirty = False
+        return dirty
+    
     def _HandleEvent(self, event: pygame.event.Event):
         """Handle individual pygame event"""
         if event.type == pygame.QUIT:
@@ -47,13 +122,25 @@ class InputManager:
             if event.key == pygame.K_ESCAPE:
                 self._TriggerEvent(InputEvents.ESCAPE)
                 self._running = False
+            elif event.key == pygame.K_F3:
+                self._TriggerEvent(InputEvents.TOGGLE_PROFILER)
         
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:  # Left mouse button
                 self._TriggerEvent(InputEvents.MOUSE_CLICK, event.pos)
+        
+        elif event.type == pygame.VIDEORESIZE:
+            self._TriggerEvent(InputEvents.RESIZE, event.size)
+        
+        elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE, pygame.WINDOWRESTORED):
+            self._TriggerEvent(InputEvents.EXPOSE)
     
     def _TriggerEvent(self, event_type: str, data=None):
         """Trigger all registered callbacks for event type"""
+        self.frame_dirty = True
+        if self._recording is not None:
+            entry = {"time": round(time.perf_counter() - self._recording_start, 4), "event": event_type, "data": data}
+            self._recording.write(json.dumps(entry) + "\n")
         if event_type in self.event_handlers:
             for callback in self.event_handlers[event_type]:
                 if data is not None:
@@ -61,6 +148,76 @@ class InputManager:
                 else:
                     callback()
     
+    # ===== RECORDING AND REPLAY =====
+    
+    def StartRecording(self, path: str):
+        """Write every event from now on to a file (one JSON object per line)
+        
+        Clicks are stored in screen pixels, so replay them in a window of the same size.
+        """
+        self.StopRecording()
+        self._recording = open(path, "w", encoding="utf-8")
+        self._recording_start = time.perf_counter()
+    
+    def StopRecording(self):
+        """Finish the recording file (does nothing if not recording)"""
+        if self._recording is not None:
+            self._recording.close()
+            self._recording = None
+    
+    def StartReplay(self, events: List[RecordedEvent], real_time: bool = False, quit_when_done: bool = True):
+        """Feed recorded events to the handlers instead of reading pygame's event queue
+        
+        As fast as possible, each ProcessEvents call triggers the next event, so
+        every event gets a frame of its own. In real time, events are triggered
+        once as much time has passed as when they were recorded.
+        """
+        self._replay_events = list(events)
+        self._replay_index = 0
+        self._replay_start = time.perf_counter()
+        self._replay_real_time = real_time
+        self._quit_after_replay = quit_when_done
+    
+    def IsReplaying(self) -> bool:
+        """Check if recorded events are still being replayed"""
+        return self._replay_events is not None
+    
+    def _ProcessReplay(self):
+        """Trigger the recorded events that are due, and finish once all were played"""
+        events = self._replay_events
+        if self._replay_index >= len(events):
+            self._replay_events = None
+            if self._quit_after_replay:
+                self._running = False
+            return
+        
+        if not self._replay_real_time:
+            self._TriggerRecordedEvent(events[self._replay_index])
+            self._replay_index += 1
+            return
+        elapsed = time.perf_counter() - self._replay_start
+        while self._replay_index < len(events) and events[self._replay_index].time <= elapsed:
+            self._TriggerRecordedEvent(events[self._replay_index])
+            self._replay_index += 1
+    
+    def _WaitForReplay(self, timeout_ms: int) -> bool:
+        """Sleep until the next recorded event is due (no sleep when replaying as fast as possible)"""
+        if not self._replay_real_time or self._replay_index >= len(self._replay_events):
+            return True
+        delay = self._replay_events[self._replay_index].time - (time.perf_counter() - self._replay_start)
+        if delay > timeout_ms / 1000:
+            time.sleep(timeout_ms / 1000)
+            return False
+        if delay > 0:
+            time.sleep(delay)
+        return True
+    
+    def _TriggerRecordedEvent(self, event: RecordedEvent):
+        """Trigger a recorded event the way _HandleEvent would have"""
+        self._TriggerEvent(event.event_type, event.data)
+        if event.event_type in (InputEvents.QUIT, InputEvents.ESCAPE):
+            self._running = False
+    
     # ===== STATE QUERIES =====
     
     def ShouldQuit(self) -> bool:
@@ -0,0 +1,75 @@
+# MoveCache.py - Remembers legal moves of positions that were already seen
+
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+DEFAULT_CACHE_SIZE = 65536  # Number of (position, square) entries kept
+
+class LegalMoveCache:
+    """Least-recently-used cache of legal moves keyed by (Zobrist key, square)
+
+    The same position reached again (a reselected piece, a repeated position in
+    analysis, a transposition in search) has the same key, so its moves can be
+    returned without generating them again.
+    """
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max(1, max_entries)
+        self.entries: "OrderedDict[Tuple[int, int], tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # ===== LOOKUP =====
+
+    def Get(self, position_key: int, square: int) -> Optional[List[Tuple[int, int]]]:
+        """Return a copy of the cached moves, or None on a miss"""
+        key = (position_key, square)
+        moves = self.entries.get(key)
+        if moves is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return list(moves)
+
+    def Put(self, position_key: int, square: int, moves: List[Tuple[int, int]]):
+        """Store moves for a square, evicting the least recently used entry if full"""
+        key = (position_key, square)
+        self.entries[key] = tuple(moves)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    # ===== MAINTENANCE =====
+
+    def Resize(self, max_entries: int):
+        """Change the capacity, dropping the oldest entries if needed"""
+        self.max_entries = max(1, max_entries)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def Clear(self):
+        """Drop all entries and reset the counters"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    # ===== STATISTICS =====
+
+    def GetHitRate(self) -> float:
+        """Fraction of lookups answered from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def GetStats(self) -> dict:
+        """Counters for display or logging"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.GetHitRate(),
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+        }
+
+# Boards share one cache by default: equal keys mean equal positions, so a
+# position analysed on one board is a hit on every other board.
+shared_cache = LegalMoveCache()
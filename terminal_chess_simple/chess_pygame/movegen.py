@@ -0,0 +1,301 @@
+# MoveGen.py - Shared move generation used by every frontend
+
+import random
+import sys
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Handle imports for both standalone and package execution
+try:
+    from .pieces import PieceFactory
+except ImportError:
+    from pieces import PieceFactory
+
+# Works on any board where board[row][col] is a piece character ("." when empty):
+# the 8x8 lists of main.py, chess_pygame_original.py and ChessBoard, or 8 strings.
+# All target squares are worked out once per square here, so generating moves is
+# only table walks and set lookups. Moves come out in the same order as pieces.py,
+# which game_archive relies on (it stores a move as its index in that order).
+
+WHITE_PIECES = frozenset("PNBRQK")
+BLACK_PIECES = frozenset("pnbrqk")
+
+_ROOK_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+_BISHOP_DIRECTIONS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+_KNIGHT_OFFSETS = [(2, 1), (2, -1), (-2, 1), (-2, -1), (1, 2), (1, -2), (-1, 2), (-1, -2)]
+_KING_OFFSETS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+
+def _Targets(row: int, col: int, offsets: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Squares one step away in each direction that are on the board"""
+    return [(row + dr, col + dc) for dr, dc in offsets if 0 <= row + dr < 8 and 0 <= col + dc < 8]
+
+def _Rays(row: int, col: int, directions: List[Tuple[int, int]]) -> List[List[Tuple[int, int]]]:
+    """For each direction, the squares from (row, col) to the board edge (empty rays left out)"""
+    rays = []
+    for dr, dc in directions:
+        ray = []
+        r, c = row + dr, col + dc
+        while 0 <= r < 8 and 0 <= c < 8:
+            ray.append((r, c))
+            r, c = r + dr, c + dc
+        if ray:
+            rays.append(ray)
+    return rays
+
+# Per square (row * 8 + col): step targets, or the rays a slider walks
+KNIGHT_TARGETS = [_Targets(row, col, _KNIGHT_OFFSETS) for row in range(8) for col in range(8)]
+KING_TARGETS = [_Targets(row, col, _KING_OFFSETS) for row in range(8) for col in range(8)]
+SLIDER_RAYS = {
+    "r": [_Rays(row, col, _ROOK_DIRECTIONS) for row in range(8) for col in range(8)],
+    "b": [_Rays(row, col, _BISHOP_DIRECTIONS) for row in range(8) for col in range(8)],
+    "q": [_Rays(row, col, _ROOK_DIRECTIONS + _BISHOP_DIRECTIONS) for row in range(8) for col in range(8)],
+}
+
+# ===== MOVE GENERATION =====
+
+def GenerateMoves(board: Sequence[Sequence[str]], row: int, col: int) -> List[Tuple[int, int]]:
+    """Get the (row, col) targets of the piece on a square ([] for an empty square or unknown piece)"""
+    piece = board[row][col]
+    if piece in WHITE_PIECES:
+        own, enemies = WHITE_PIECES, BLACK_PIECES
+    elif piece in BLACK_PIECES:
+        own, enemies = BLACK_PIECES, WHITE_PIECES
+    else:
+        return []
+    kind = piece.lower()
+
+    if kind == "p":
+        moves = []
+        step = -1 if own is WHITE_PIECES else 1
+        new_row = row + step
+        if not 0 <= new_row < 8:
+            return moves
+        forward = board[new_row]
+        if forward[col] == ".":
+            moves.append((new_row, col))
+            # Double move from the starting row
+            if row == (6 if step < 0 else 1) and board[new_row + step][col] == ".":
+                moves.append((new_row + step, col))
+        if col > 0 and forward[col - 1] in enemies:
+            moves.append((new_row, col - 1))
+        if col < 7 and forward[col + 1] in enemies:
+            moves.append((new_row, col + 1))
+        return moves
+
+    if kind == "n" or kind == "k":
+        targets = KNIGHT_TARGETS if kind == "n" else KING_TARGETS
+        return [target for target in targets[row * 8 + col] if board[target[0]][target[1]] not in own]
+
+    moves = []
+    for ray in SLIDER_RAYS[kind][row * 8 + col]:
+        for target in ray:
+            occupant = board[target[0]][target[1]]
+            if occupant == ".":
+                moves.append(target)
+            else:
+                if occupant in enemies:
+                    moves.append(target)
+                break
+    return moves
+
+def _NthMoveEntry(piece: str):
+    """(own pieces, enemy pieces, pawn step, slides?, per-square targets or rays, None for pawns)"""
+    kind = piece.lower()
+    own, enemies, step = (WHITE_PIECES, BLACK_PIECES, -1) if piece in WHITE_PIECES else (BLACK_PIECES, WHITE_PIECES, 1)
+    table = SLIDER_RAYS.get(kind) or {"n": KNIGHT_TARGETS, "k": KING_TARGETS}.get(kind)
+    return own, enemies, step, kind in SLIDER_RAYS, table
+
+# Everything NthMove needs about a piece in one lookup
+_NTH_MOVE_PIECES = {piece: _NthMoveEntry(piece) for piece in WHITE_PIECES | BLACK_PIECES}
+
+def NthMove(board: Sequence[Sequence[str]], squares: Sequence[Tuple[int, int]],
+            index: int) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """Get move number index of the pieces on squares, in GenerateMoves order (None if there are fewer)
+
+    Same as listing every piece's moves and indexing, but the pieces before
+    the one that owns the move only have their moves counted, not collected.
+    """
+    for square in squares:
+        row, col = square
+        own, enemies, step, slides, table = _NTH_MOVE_PIECES[board[row][col]]
+        targets = table[row * 8 + col] if table else None
+
+        if slides:
+            for ray in targets:
+                for target in ray:
+                    occupant = board[target[0]][target[1]]
+                    if occupant in own:
+                        break
+                    if index == 0:
+                        return square, target
+                    index -= 1
+                    if occupant != ".":
+                        break
+            continue
+
+        count = 0
+        if targets is not None:
+            for target in targets:
+                if board[target[0]][target[1]] not in own:
+                    count += 1
+        elif 0 <= row + step < 8:
+            forward = board[row + step]
+            if forward[col] == ".":
+                count += 1 + (row == (6 if step < 0 else 1) and board[row + 2 * step][col] == ".")
+            count += (col > 0 and forward[col - 1] in enemies) + (col < 7 and forward[col + 1] in enemies)
+        if index < count:
+            return square, GenerateMoves(board, row, col)[index]
+        index -= count
+    return None
+
+class _GetPieceAdapter:
+    """Gives a board[row][col] view of anything with GetPiece(row, col), for the reference pieces"""
+
+    def __init__(self, board: Sequence[Sequence[str]]):
+        self.board = board
+
+    def GetPiece(self, row: int, col: int) -> str:
+        if 0 <= row < 8 and 0 <= col < 8:
+            return self.board[row][col]
+        return "."
+
+def ReferenceMoves(board: Sequence[Sequence[str]], row: int, col: int) -> List[Tuple[int, int]]:
+    """Moves from the readable piece classes in pieces.py, the specification GenerateMoves must match"""
+    try:
+        return PieceFactory.create_piece(board[row][col]).get_moves(row, col, _GetPieceAdapter(board))
+    except ValueError:
+        return []
+
+# ===== DIFFERENTIAL CHECK =====
+
+BoardMoves = Dict[Tuple[int, int], List[Tuple[int, int]]]  # Moves of every occupied square
+
+def _Occupied(board: Sequence[Sequence[str]]) -> List[Tuple[int, int]]:
+    return [(row, col) for row in range(8) for col in range(8) if board[row][col] != "."]
+
+def _SwapBoard(rows: List[List[str]], board: Sequence[Sequence[str]],
+               generate: Callable[[int, int], List[Tuple[int, int]]],
+               put: Optional[Callable[[int, int, str], None]] = None) -> BoardMoves:
+    """Run a frontend's generator on a board by loading it into the frontend's global board for a moment
+
+    put(row, col, piece) sets one square, for frontends that track the board
+    (main.py keeps its Zobrist hash in step through set_square).
+    """
+    if put is None:
+        put = lambda row, col, piece: rows[row].__setitem__(col, piece)
+    saved = [board_row[:] for board_row in rows]
+    for row in range(8):
+        for col in range(8):
+            put(row, col, board[row][col])
+    try:
+        return {square: list(generate(*square)) for square in _Occupied(board)}
+    finally:
+        for row in range(8):
+            for col in range(8):
+                put(row, col, saved[row][col])
+
+def CollectMoveSources() -> Dict[str, Callable[[Sequence[Sequence[str]]], BoardMoves]]:
+    """Every frontend's move generation, each as f(board rows) -> moves of every occupied square
+
+    Frontends that can't be imported here (main.py lives outside the package,
+    chess_pygame_original needs pygame) are left out.
+    """
+    try:
+        from .chess_board import ChessBoard
+        from .compact_board import CompactBoard
+        from .move_cache import LegalMoveCache
+    except ImportError:
+        from chess_board import ChessBoard
+        from compact_board import CompactBoard
+        from move_cache import LegalMoveCache
+    no_cache = LegalMoveCache(1)  # Nothing is reused between positions
+
+    def BoardClassMoves(board):
+        chess_board = ChessBoard(no_cache)
+        chess_board.LoadPosition("".join("".join(board_row) for board_row in board), True)
+        compact_board = CompactBoard.FromBoard(chess_board)
+        return ({square: chess_board.GetLegalMoves(*square) for square in _Occupied(board)},
+                {square: compact_board.GetLegalMoves(*square) for square in _Occupied(board)})
+
+    sources = {
+        "pieces.py reference": lambda board: {square: ReferenceMoves(board, *square) for square in _Occupied(board)},
+        "movegen": lambda board: {square: GenerateMoves(board, *square) for square in _Occupied(board)},
+        "ChessBoard": lambda board: BoardClassMoves(board)[0],
+        "CompactBoard": lambda board: BoardClassMoves(board)[1],
+    }
+
+    try:
+        import main as terminal_game
+    except ImportError:
+        terminal_game = None
+    if terminal_game is not None:
+        sources["main.generate_moves_from"] = lambda board: _SwapBoard(
+            terminal_game.board, board, terminal_game.generate_moves_from)
+        sources["main.legal_moves_from"] = lambda board: _SwapBoard(
+            terminal_game.board, board, terminal_game.legal_moves_from, terminal_game.set_square)
+
+    try:
+        try:
+            from . import chess_pygame_original
+        except ImportError:
+            import chess_pygame_original
+    except ImportError:
+        chess_pygame_original = None
+    if chess_pygame_original is not None:
+        game = chess_pygame_original.ChessGame.__new__(chess_pygame_original.ChessGame)  # No window needed
+        sources["ChessGame.legal_moves_from"] = lambda board: _SwapBoard(
+            chess_pygame_original.board, board, game.legal_moves_from)
+    return sources
+
+def RandomBoards(count: int, seed: int = 1) -> List[List[List[str]]]:
+    """Positions with pieces scattered at random, pawns anywhere (even on the first and last rank)"""
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        squares = ["."] * 64
+        for piece in rng.sample("KQRRBBNNPPPPPPPPkqrrbbnnpppppppp", rng.randint(2, 32)):
+            squares[rng.randrange(64)] = piece
+        boards.append([squares[row * 8:row * 8 + 8] for row in range(8)])
+    return boards
+
+def CheckAgainstReference(boards: List[List[List[str]]]) -> List[str]:
+    """Compare every move source with pieces.py on every occupied square, returns the mismatches
+
+    main.generate_moves_from (the readable terminal version) lists queen
+    directions in another order, so it is compared ignoring order; every
+    other source must match move for move.
+    """
+    sources = CollectMoveSources()
+    reference = sources.pop("pieces.py reference")
+    mismatches = []
+    for board in boards:
+        expected = reference(board)
+        for name, source in sources.items():
+            for square, moves in source(board).items():
+                same = sorted(moves) == sorted(expected[square]) if name == "main.generate_moves_from" \
+                    else moves == expected[square]
+                if not same:
+                    placement = "/".join("".join(board_row) for board_row in board)
+                    mismatches.append(f"{name}: {placement} square {square}: {moves} != {expected[square]}")
+    return mismatches
+
+# ===== MAIN ENTRY POINT =====
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Check every frontend against the reference, exits with status 1 on any mismatch"""
+    import argparse  # Every frontend imports this module, and only the check needs argparse
+    parser = argparse.ArgumentParser(description="Differential check of all move generators")
+    parser.add_argument("--positions", type=int, default=2000, help="Random positions to check")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args(argv)
+
+    boards = RandomBoards(args.positions, args.seed)
+    names = [name for name in CollectMoveSources() if name != "pieces.py reference"]
+    mismatches = CheckAgainstReference(boards)
+    for mismatch in mismatches[:20]:
+        print(mismatch)
+    print(f"{len(boards)} positions, {len(names)} move sources ({', '.join(names)}): "
+          f"{len(mismatches)} mismatches")
+    return 1 if mismatches else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# Notation.py - Converts between board moves and Standard Algebraic Notation (SAN)
+
+from typing import Tuple
+
+# Handle imports for both standalone and package execution
+try:
+    from .chess_board import ChessBoard
+except ImportError:
+    from chess_board import ChessBoard
+
+Move = Tuple[Tuple[int, int], Tuple[int, int]]
+
+FILES = "abcdefgh"
+RANKS = "87654321"  # Indexed by row: row 0 is rank 8
+
+def SquareToIndex(square: str) -> Tuple[int, int]:
+    """Convert a square name like 'e4' to (row, col)"""
+    if len(square) != 2 or square[0] not in FILES or square[1] not in RANKS:
+        raise ValueError(f"Invalid square: {square!r}")
+    return RANKS.index(square[1]), FILES.index(square[0])
+
+def IndexToSquare(row: int, col: int) -> str:
+    """Convert (row, col) to a square name like 'e4'"""
+    return FILES[col] + RANKS[row]
+
+def SanToMove(chess_board: ChessBoard, san: str) -> Move:
+    """Find the move a SAN token like 'Nbd7', 'exd5' or 'e8=Q' describes
+
+    Raises ValueError if the move is malformed, illegal, ambiguous, or uses a
+    rule the board doesn't support (castling, under-promotion).
+    """
+    text = san.rstrip("+#!?")
+    if text in ("O-O", "O-O-O", "0-0", "0-0-0"):
+        raise ValueError(f"Castling is not supported: {san}")
+
+    # Promotion suffix: 'e8=Q' (standard) or 'e8Q'
+    if "=" in text:
+        text, promotion = text.split("=", 1)
+    elif len(text) > 2 and text[-1] in "QRBN" and text[-2] in "18":
+        text, promotion = text[:-1], text[-1]
+    else:
+        promotion = ""
+    if promotion and promotion != "Q":
+        raise ValueError(f"Only promotion to a queen is supported: {san}")
+
+    if len(text) < 2:
+        raise ValueError(f"Invalid SAN move: {san}")
+    piece_type = text[0] if text[0] in "NBRQK" else "P"
+    body = (text[1:] if piece_type != "P" else text).replace("x", "")
+    to_pos = SquareToIndex(body[-2:])
+    hint = body[:-2]  # Disambiguation: a file, a rank, or both
+    if len(hint) > 2 or any(c not in FILES and c not in RANKS for c in hint):
+        raise ValueError(f"Invalid SAN move: {san}")
+
+    white = chess_board.IsWhiteTurn()
+    piece = piece_type if white else piece_type.lower()
+    candidates = []
+    for row, col in chess_board.GetPieceSquares(piece):
+        if hint and any((c in FILES and FILES[col] != c) or (c in RANKS and RANKS[row] != c) for c in hint):
+            continue
+        if to_pos in chess_board.GetLegalMoves(row, col):
+            candidates.append((row, col))
+
+    if len(candidates) > 1:
+        # SAN leaves out the file/rank when the other piece is pinned, but the
+        # board has no check rules - so drop moves that expose the king.
+        candidates = [from_pos for from_pos in candidates
+                      if not _ExposesKing(chess_board, (from_pos, to_pos))]
+
+    if not candidates:
+        raise ValueError(f"Illegal move: {san}")
+    if len(candidates) > 1:
+        raise ValueError(f"Ambiguous move: {san}")
+    return candidates[0], to_pos
+
+def _ExposesKing(chess_board: ChessBoard, move: Move) -> bool:
+    """Check if the opponent could capture the mover's king after this move"""
+    king = 'K' if chess_board.IsWhiteTurn() else 'k'
+    chess_board.MakeMove(*move)
+    try:
+        king_squares = chess_board.GetPieceSquares(king)
+        return any(to_pos in king_squares for _, to_pos in chess_board.GetAllLegalMoves())
+    finally:
+        chess_board.UndoMove()
+
+def MoveToSan(chess_board: ChessBoard, move: Move) -> str:
+    """Write a legal move in SAN, e.g. 'Nf3', 'exd5', 'Rad1' or 'e8=Q'
+
+    Check and mate markers are left out: the board has no check rules.
+    """
+    (from_row, from_col), to_pos = move
+    piece = chess_board.GetPiece(from_row, from_col)
+    capture = not chess_board.IsEmpty(*to_pos)
+    target = IndexToSquare(*to_pos)
+
+    if piece.lower() == 'p':
+        text = (FILES[from_col] + "x" + target) if capture else target
+        if to_pos[0] in (0, 7):
+            text += "=Q"
+        return text
+
+    # Add the file, rank or both when another piece of the same kind can also get there
+    rivals = [(row, col) for row, col in chess_board.GetPieceSquares(piece)
+              if (row, col) != (from_row, from_col) and to_pos in chess_board.GetLegalMoves(row, col)]
+    hint = ""
+    if rivals:
+        if all(col != from_col for _, col in rivals):
+            hint = FILES[from_col]
+        elif all(row != from_row for row, _ in rivals):
+            hint = RANKS[from_row]
+        else:
+            hint = FILES[from_col] + RANKS[from_row]
+    return piece.upper() + hint + ("x" if capture else "") + target
@@ -0,0 +1,155 @@
+# PGNReader.py - Streams games out of PGN files of any size
+
+import re
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+# Handle imports for both standalone and package execution
+try:
+    from .chess_board import ChessBoard
+    from .notation import SanToMove
+except ImportError:
+    from chess_board import ChessBoard
+    from notation import SanToMove
+
+DEFAULT_CHUNK_SIZE = 1 << 16  # Bytes read from disk at a time
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+_TAG_PATTERN = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_COMMENT_PATTERN = re.compile(r"\{[^}]*\}|;[^\n]*")
+_VARIATION_PATTERN = re.compile(r"\([^()]*\)")
+_MOVE_NUMBER_PATTERN = re.compile(r"\d+\.(?:\.\.)?")
+
+class PGNGame:
+    """One game read from a PGN file"""
+    def __init__(self, headers: Dict[str, str], moves: List[str], result: str, offset: int, length: int):
+        self.headers = headers
+        self.moves = moves        # SAN moves, e.g. ['e4', 'e5', 'Nf3']
+        self.result = result      # '1-0', '0-1', '1/2-1/2' or '*'
+        self.offset = offset      # Byte offset of the game in the file
+        self.length = length      # Size of the game in bytes
+
+        # Filled in by Replay()
+        self.chess_board: Optional[ChessBoard] = None
+        self.error: Optional[str] = None
+        self.error_ply: Optional[int] = None   # Index into moves of the first bad move
+        self.error_fen: Optional[str] = None   # Position the bad move was played in
+
+    def Replay(self, chess_board: Optional[ChessBoard] = None) -> bool:
+        """Play the moves on a board (from FEN header if present), returns False on a bad FEN or the first bad move"""
+        chess_board = chess_board if chess_board is not None else ChessBoard()
+        if "FEN" in self.headers:
+            try:
+                chess_board.FromFEN(self.headers["FEN"])
+            except ValueError as e:
+                # No position to report: the game never got a board to start from
+                self.error, self.error_ply = f"Bad FEN tag: {e}", 0
+                return False
+        else:
+            chess_board.Reset()
+        self.chess_board = chess_board
+
+        for ply, san in enumerate(self.moves):
+            try:
+                move = SanToMove(chess_board, san)
+            except ValueError as e:
+                self.error, self.error_ply, self.error_fen = str(e), ply, chess_board.ToFEN()
+                return False
+            chess_board.MakeMove(*move)
+        return True
+
+# ===== READING =====
+
+def ReadGames(source: Union[str, BinaryIO], chunk_size: int = DEFAULT_CHUNK_SIZE,
+              replay: bool = False, start: int = 0, end: Optional[int] = None) -> Iterator[PGNGame]:
+    """Yield games one at a time, holding only the current game in memory
+
+    source may be a path or a binary file object. start/end limit reading to
+    a byte range; a game is read if its first byte lies inside the range.
+    With replay=True each game is played out on a ChessBoard (see PGNGame.Replay);
+    the board is reused, so game.chess_board is only valid until the next game.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as pgn_file:
+            yield from ReadGames(pgn_file, chunk_size, replay, start, end)
+        return
+
+    replay_board = ChessBoard() if replay else None
+    for game in _ParseGames(_ReadLines(source, chunk_size, start), end):
+        if replay_board is not None:
+            game.Replay(replay_board)
+        yield game
+
+def _ReadLines(stream: BinaryIO, chunk_size: int, start: int) -> Iterator[Tuple[int, bytes]]:
+    """Yield (byte offset, line) pairs, reading the stream in fixed-size chunks"""
+    stream.seek(start)
+    offset = start
+    pending = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()  # Last piece may be cut off mid-line
+        for line in lines:
+            yield offset, line
+            offset += len(line) + 1
+    if pending:
+        yield offset, pending
+
+def _ParseGames(lines: Iterator[Tuple[int, bytes]], end: Optional[int]) -> Iterator[PGNGame]:
+    """Group lines into games: a tag line after movetext starts the next game"""
+    headers: Dict[str, str] = {}
+    movetext: List[str] = []
+    game_offset: Optional[int] = None
+    game_end = 0
+
+    for offset, raw_line in lines:
+        line = raw_line.decode("utf-8", errors="replace").strip()
+        if not line or line.startswith("%"):
+            continue
+
+        if line.startswith("["):
+            if movetext:
+                yield _BuildGame(headers, movetext, game_offset, game_end)
+                headers, movetext, game_offset = {}, [], None
+            if game_offset is None:
+                if end is not None and offset >= end:
+                    return  # Next game belongs to the following byte range
+                game_offset = offset
+            tag = _TAG_PATTERN.match(line)
+            if tag:
+                headers[tag.group(1)] = tag.group(2).replace('\\"', '"').replace("\\\\", "\\")
+        else:
+            if game_offset is None:
+                if end is not None and offset >= end:
+                    return
+                game_offset = offset
+            movetext.append(line)
+        game_end = offset + len(raw_line) + 1
+
+    if game_offset is not None:
+        yield _BuildGame(headers, movetext, game_offset, game_end)
+
+def _BuildGame(headers: Dict[str, str], movetext: List[str], offset: int, game_end: int) -> PGNGame:
+    """Turn collected tag pairs and movetext into a PGNGame"""
+    moves, result = ParseMovetext("\n".join(movetext))
+    return PGNGame(headers, moves, headers.get("Result", result), offset, game_end - offset)
+
+def ParseMovetext(text: str) -> Tuple[List[str], str]:
+    """Extract the main-line SAN moves and the result from movetext"""
+    text = _COMMENT_PATTERN.sub(" ", text)
+    # Remove variations innermost-first, since they can nest
+    previous = None
+    while previous != text:
+        previous, text = text, _VARIATION_PATTERN.sub(" ", text)
+    text = _MOVE_NUMBER_PATTERN.sub(" ", text)
+
+    moves = []
+    result = "*"
+    for token in text.split():
+        if token in RESULTS:
+            result = token
+        elif not token.startswith("$"):
+            moves.append(token)
+    return moves, result
@@ -0,0 +1,142 @@
+# PGNValidator.py - Replays and validates large PGN files on every CPU core
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+# Handle imports for both standalone and package execution
+try:
+    from . import pgn_reader
+    from .chess_board import ChessBoard
+except ImportError:
+    import pgn_reader
+    from chess_board import ChessBoard
+
+CHUNKS_PER_WORKER = 4  # More chunks than workers keeps every core busy to the end
+
+# ===== SPLITTING =====
+
+def FindGameStart(pgn_file, position: int) -> int:
+    """Find the byte offset of the first game that starts at or after position
+
+    A game starts at a tag line ('[...') that follows movetext, so a split
+    never lands between the tags of one game and its moves.
+    """
+    if position <= 0:
+        return 0
+    pgn_file.seek(position - 1)
+    if pgn_file.read(1) != b"\n":
+        pgn_file.readline()  # Skip the partial line we landed in
+    offset = pgn_file.tell()
+    previous_was_tag = True  # Unknown - wait until movetext has been seen
+    for line in iter(pgn_file.readline, b""):
+        stripped = line.strip()
+        if stripped:
+            is_tag = stripped.startswith(b"[")
+            if is_tag and not previous_was_tag:
+                return offset
+            previous_was_tag = is_tag
+        offset += len(line)
+    return offset
+
+def SplitIntoRanges(path: str, chunk_count: int) -> List[Tuple[int, int]]:
+    """Cut a PGN file into (start, end) byte ranges on game boundaries"""
+    size = os.path.getsize(path)
+    chunk_count = max(1, chunk_count)
+    with open(path, "rb") as pgn_file:
+        starts = sorted({FindGameStart(pgn_file, size * i // chunk_count) for i in range(chunk_count)})
+    ends = starts[1:] + [size]
+    return [(start, end) for start, end in zip(starts, ends) if start < end]
+
+# ===== WORKER =====
+
+def ValidateRange(task: Tuple[str, int, int]) -> List[dict]:
+    """Replay every game in one byte range (runs in a worker process)
+
+    Each game is replayed here rather than by ReadGames, so a game that fails
+    in an unexpected way becomes one invalid result instead of ending the range.
+    """
+    path, start, end = task
+    results = []
+    replay_board = ChessBoard()
+    for game in pgn_reader.ReadGames(path, start=start, end=end):
+        try:
+            game.Replay(replay_board)
+        except Exception as e:
+            game.chess_board = None
+            game.error, game.error_ply = f"{type(e).__name__} while replaying: {e}", None
+        chess_board = game.chess_board
+        results.append({
+            'offset': game.offset,
+            'valid': game.error is None,
+            'moves': len(game.moves),
+            'error': game.error,
+            'error_ply': game.error_ply,
+            'error_fen': game.error_fen,
+            'final_fen': chess_board.ToFEN() if chess_board is not None else None,
+            'hash': f"{chess_board.GetHash():016x}" if chess_board is not None else None,
+        })
+    return results
+
+# ===== DRIVER =====
+
+def ValidateFile(path: str, workers: Optional[int] = None) -> Iterator[dict]:
+    """Yield one result per game, in file order, validating ranges in parallel"""
+    workers = workers or os.cpu_count() or 1
+    ranges = SplitIntoRanges(path, workers * CHUNKS_PER_WORKER)
+    tasks = [(path, start, end) for start, end in ranges]
+
+    if workers == 1:
+        yield from _NumberGames(map(ValidateRange, tasks))
+        return
+    with multiprocessing.Pool(workers) as pool:
+        # imap keeps chunk order, so merging is just concatenation
+        yield from _NumberGames(pool.imap(ValidateRange, tasks))
+
+def _NumberGames(chunk_results: Iterator[List[dict]]) -> Iterator[dict]:
+    """Flatten per-chunk results and give each game its index in the file"""
+    game_index = 0
+    for results in chunk_results:
+        for result in results:
+            result['game'] = game_index
+            game_index += 1
+            yield result
+
+def WriteResults(results: Iterator[dict], output: TextIO) -> Tuple[int, int]:
+    """Write one JSON line per game, returns (games, invalid games)"""
+    games = invalid = 0
+    for result in results:
+        output.write(json.dumps(result) + "\n")
+        games += 1
+        if not result['valid']:
+            invalid += 1
+    return games, invalid
+
+# ===== MAIN ENTRY POINT =====
+
+def main(argv: Optional[List[str]] = None):
+    """Validate a PGN file from the command line"""
+    parser = argparse.ArgumentParser(description="Replay and validate every game of a PGN file in parallel")
+    parser.add_argument("file", help="PGN file to validate")
+    parser.add_argument("-o", "--output", help="JSON-lines results file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            games, invalid = WriteResults(ValidateFile(args.file, args.workers), output)
+    else:
+        games, invalid = WriteResults(ValidateFile(args.file, args.workers), sys.stdout)
+    seconds = time.perf_counter() - start
+
+    rate = games / seconds if seconds > 0 else 0
+    print(f"{games} games, {invalid} invalid (bad FEN tag or move), {seconds:.2f} s ({rate:,.0f} games/s)",
+          file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+# PGNWriter.py - Formats games as PGN text
+
+import textwrap
+from typing import Dict, List
+
+# The Seven Tag Roster comes first, in this order, in every PGN game
+SEVEN_TAG_ROSTER = ("Event", "Site", "Date", "Round", "White", "Black", "Result")
+
+def FormatGame(headers: Dict[str, str], san_moves: List[str], result: str = "*",
+               first_move_white: bool = True, first_move_number: int = 1) -> str:
+    """Build the PGN text of one game (tags, blank line, wrapped movetext, blank line)"""
+    headers = dict(headers)
+    headers["Result"] = result
+    lines = []
+    for tag in SEVEN_TAG_ROSTER:
+        unknown = "????.??.??" if tag == "Date" else "?"
+        lines.append(_FormatTag(tag, headers.get(tag, unknown)))
+    for tag, value in headers.items():
+        if tag not in SEVEN_TAG_ROSTER:
+            lines.append(_FormatTag(tag, value))
+
+    tokens = []
+    move_number = first_move_number
+    white_to_move = first_move_white
+    for ply, san in enumerate(san_moves):
+        if white_to_move:
+            tokens.append(f"{move_number}.")
+        elif ply == 0:
+            tokens.append(f"{move_number}...")
+        tokens.append(san)
+        if not white_to_move:
+            move_number += 1
+        white_to_move = not white_to_move
+    tokens.append(result)
+
+    movetext = textwrap.fill(" ".join(tokens), width=79, break_on_hyphens=False)
+    return "\n".join(lines) + "\n\n" + movetext + "\n\n"
+
+def _FormatTag(tag: str, value: str) -> str:
+    """Format one tag pair, escaping quotes and backslashes"""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'[{tag} "{escaped}"]'
@@ -0,0 +1,207 @@
+# PositionIndex.py - On-disk index answering "which games reached this position?"
+
+import argparse
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+import time
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+# Handle imports for both standalone and package execution
+try:
+    from .chess_board import ChessBoard
+    from .notation import SanToMove
+    from . import pgn_reader
+except ImportError:
+    from chess_board import ChessBoard
+    from notation import SanToMove
+    import pgn_reader
+
+# File layout: a 16-byte header, then fixed-width records sorted by key.
+# Big-endian so records also sort correctly as raw bytes.
+MAGIC = b"CPYIDX01"
+HEADER = struct.Struct(">8sQ")   # magic, record count
+RECORD = struct.Struct(">QQ")    # Zobrist key, byte offset of the game in the PGN file
+DEFAULT_RUN_SIZE = 1 << 20       # Records sorted in memory before spilling to a temp file
+
+# ===== BUILDING =====
+
+def IterateGamePositions(pgn_path: str) -> Iterator[Tuple[int, int]]:
+    """Yield (Zobrist key, game offset) for every distinct position of every game"""
+    chess_board = ChessBoard()
+    for game in pgn_reader.ReadGames(pgn_path):
+        if "FEN" in game.headers:
+            try:
+                chess_board.FromFEN(game.headers["FEN"])
+            except ValueError:
+                continue
+        else:
+            chess_board.Reset()
+
+        seen = {chess_board.GetHash()}
+        for san in game.moves:
+            try:
+                chess_board.MakeMove(*SanToMove(chess_board, san))
+            except ValueError:
+                break  # Positions up to the first bad move are still indexed
+            seen.add(chess_board.GetHash())
+        for key in seen:
+            yield key, game.offset
+
+def BuildIndex(pgn_path: str, index_path: str, run_size: int = DEFAULT_RUN_SIZE) -> int:
+    """Write the sorted index for a PGN file, returns the number of records
+
+    Records are sorted in runs of run_size and merged from temporary files,
+    so memory use stays bounded however large the archive is.
+    """
+    run_paths: List[str] = []
+    run: List[Tuple[int, int]] = []
+    try:
+        for record in IterateGamePositions(pgn_path):
+            run.append(record)
+            if len(run) >= run_size:
+                run_paths.append(_WriteRun(run))
+                run = []
+        run.sort()
+
+        run_files = [open(path, "rb") for path in run_paths]
+        try:
+            streams = [_ReadRecords(run_file) for run_file in run_files] + [iter(run)]
+            return _WriteIndex(index_path, heapq.merge(*streams))
+        finally:
+            for run_file in run_files:
+                run_file.close()
+    finally:
+        for path in run_paths:
+            os.remove(path)
+
+def _WriteRun(run: List[Tuple[int, int]]) -> str:
+    """Sort one run and store it in a temporary file"""
+    run.sort()
+    handle, path = tempfile.mkstemp(suffix=".idxrun")
+    with os.fdopen(handle, "wb") as run_file:
+        for key, offset in run:
+            run_file.write(RECORD.pack(key, offset))
+    return path
+
+def _ReadRecords(run_file: BinaryIO) -> Iterator[Tuple[int, int]]:
+    """Stream records back out of a run file"""
+    while True:
+        data = run_file.read(RECORD.size * 4096)
+        if not data:
+            return
+        yield from RECORD.iter_unpack(data)
+
+def _WriteIndex(index_path: str, records: Iterator[Tuple[int, int]]) -> int:
+    """Write header and records, filling in the count once it is known"""
+    count = 0
+    with open(index_path, "wb") as index_file:
+        index_file.write(HEADER.pack(MAGIC, 0))
+        for key, offset in records:
+            index_file.write(RECORD.pack(key, offset))
+            count += 1
+        index_file.seek(0)
+        index_file.write(HEADER.pack(MAGIC, count))
+    return count
+
+# ===== QUERYING =====
+
+class PositionIndex:
+    """Memory-mapped view of an index file; nothing is loaded into RAM up front"""
+    def __init__(self, index_path: str):
+        self.index_file = open(index_path, "rb")
+        self.data = mmap.mmap(self.index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            self.Close()
+            raise ValueError(f"Not a position index file: {index_path}")
+
+    def FindGames(self, key: int) -> List[int]:
+        """Get the PGN byte offsets of all games that reached the position with this key"""
+        # Binary search for the first record with this key
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._KeyAt(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        offsets = []
+        position = HEADER.size + low * RECORD.size
+        end = HEADER.size + self.count * RECORD.size
+        while position < end:
+            record_key, offset = RECORD.unpack_from(self.data, position)
+            if record_key != key:
+                break
+            offsets.append(offset)
+            position += RECORD.size
+        return offsets
+
+    def FindGamesForBoard(self, chess_board: ChessBoard) -> List[int]:
+        """Get the offsets of all games that reached the board's current position"""
+        return self.FindGames(chess_board.GetHash())
+
+    def _KeyAt(self, record_index: int) -> int:
+        """Read just the key of one record"""
+        return struct.unpack_from(">Q", self.data, HEADER.size + record_index * RECORD.size)[0]
+
+    def Close(self):
+        """Release the memory map and file"""
+        self.data.close()
+        self.index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.Close()
+
+def ReadGameAt(pgn_path: str, offset: int) -> Optional[pgn_reader.PGNGame]:
+    """Load the single game starting at a byte offset"""
+    return next(pgn_reader.ReadGames(pgn_path, start=offset, end=offset + 1), None)
+
+# ===== MAIN ENTRY POINT =====
+
+def main(argv: Optional[List[str]] = None):
+    """Build or query a position index from the command line"""
+    parser = argparse.ArgumentParser(description="Index the positions of a PGN archive")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Index every position of a PGN file")
+    build_parser.add_argument("pgn", help="PGN file to index")
+    build_parser.add_argument("index", help="Index file to write")
+    build_parser.add_argument("--run-size", type=int, default=DEFAULT_RUN_SIZE, help="Records sorted in memory at once")
+
+    query_parser = subparsers.add_parser("query", help="List games that reached a position")
+    query_parser.add_argument("index", help="Index file")
+    query_parser.add_argument("--fen", default=None, help="Position to look up (default: starting position)")
+    query_parser.add_argument("--pgn", default=None, help="PGN file the index was built from, to print game headers")
+    query_parser.add_argument("--limit", type=int, default=20, help="Games to print")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        start = time.perf_counter()
+        count = BuildIndex(args.pgn, args.index, args.run_size)
+        print(f"Indexed {count} positions in {time.perf_counter() - start:.2f} s")
+    else:
+        chess_board = ChessBoard()
+        if args.fen:
+            chess_board.FromFEN(args.fen)
+        with PositionIndex(args.index) as index:
+            start = time.perf_counter()
+            offsets = index.FindGamesForBoard(chess_board)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"{len(offsets)} games reached this position ({elapsed_ms:.3f} ms, {index.count} records)")
+        for offset in offsets[:args.limit]:
+            game = ReadGameAt(args.pgn, offset) if args.pgn else None
+            if game is None:
+                print(f"  offset {offset}")
+            else:
+                players = f"{game.headers.get('White', '?')} - {game.headers.get('Black', '?')}"
+                print(f"  offset {offset}: {players} {game.result}")
+
+if __name__ == '__main__':
+    main()
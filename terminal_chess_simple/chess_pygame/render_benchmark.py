@@ -0,0 +1,203 @@
+# RenderBenchmark.py - Headless frame-time measurements for the pygame renderer
+
+import argparse
+import contextlib
+import io
+import os
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Render without a window unless a display driver was chosen explicitly
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+# Handle imports for both standalone and package execution
+try:
+    from .chess_board import ChessBoard
+    from .chess_renderer import ChessRenderer, DisplaySettings
+    from .game_manager import GameManager
+    from .input_manager import InputManager
+except ImportError:
+    from chess_board import ChessBoard
+    from chess_renderer import ChessRenderer, DisplaySettings
+    from game_manager import GameManager
+    from input_manager import InputManager
+
+# A middlegame with pieces on most files, so every glyph gets drawn
+SAMPLE_FEN = "r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/3P1N2/PPP2PPP/RNBQK2R w - - 0 5"
+
+# Opening replayed by the frame benchmarks (these rules have no castling), one
+# click to select and one to move per ply, so every other frame shows highlights
+REPLAY_MOVES = ("e2e4 e7e5 g1f3 b8c6 f1c4 g8f6 d2d3 f8c5 c2c3 d7d6 b1d2 a7a6 "
+                "d1e2 c8g4 h2h3 g4h5 g2g4 h5g6 c4b3 d8e7 b3a4 b7b5 a4b3 c6a5").split()
+PERCENTILES = (50, 95, 99)
+
+def TimePhases(phases: Dict[str, Callable[[], None]], frames: int) -> Dict[str, float]:
+    """Run each phase once per frame, returns mean milliseconds per phase"""
+    totals = {name: 0 for name in phases}
+    for _ in range(frames):
+        for name, phase in phases.items():
+            start = time.perf_counter_ns()
+            phase()
+            totals[name] += time.perf_counter_ns() - start
+    return {name: total / frames / 1e6 for name, total in totals.items()}
+
+def BenchmarkRenderer(frames: int = 300) -> Dict[str, float]:
+    """Time each drawing phase of ChessRenderer on a fixed position"""
+    pygame.init()
+    screen = pygame.display.set_mode((DisplaySettings.WINDOW_WIDTH, DisplaySettings.WINDOW_HEIGHT))
+    renderer = ChessRenderer(screen)
+    chess_board = ChessBoard()
+    chess_board.FromFEN(SAMPLE_FEN)
+    selected = (5, 5)
+    highlights = set(chess_board.GetLegalMoves(*selected))
+
+    timings = TimePhases({
+        "DrawBackground": renderer.DrawBackground,
+        "DrawBoard": lambda: renderer.DrawBoard(selected, highlights),
+        "DrawPieces": lambda: renderer.DrawPieces(chess_board),
+        "DrawUI": lambda: renderer.DrawUI(chess_board.GetCurrentPlayer()),
+        "RefreshDisplay": renderer.RefreshDisplay,
+    }, frames)
+    pygame.quit()
+    return timings
+
+def BenchmarkStaticFrames(frames: int = 300) -> Dict[str, float]:
+    """Time GameManager.Render on an unchanging position, full redraw vs dirty rects"""
+    pygame.init()
+    screen = pygame.display.set_mode((DisplaySettings.WINDOW_WIDTH, DisplaySettings.WINDOW_HEIGHT))
+    timings = {}
+    for label, dirty_rects in (("Full redraw", False), ("Dirty rects", True)):
+        chess_board = ChessBoard()
+        chess_board.FromFEN(SAMPLE_FEN)
+        game_manager = GameManager(chess_board, ChessRenderer(screen), InputManager(), dirty_rects)
+        game_manager.Render()
+        timings[label] = TimePhases({label: game_manager.Render}, frames)[label]
+    pygame.quit()
+    return timings
+
+# ===== REPLAYED GAME =====
+
+def BuildReplayClicks(moves: Sequence[str] = REPLAY_MOVES) -> List[Tuple[int, int]]:
+    """Turn moves like 'e2e4' into the board squares to click, raises ValueError on an illegal move"""
+    chess_board = ChessBoard()
+    clicks = []
+    for move in moves:
+        from_pos = (8 - int(move[1]), ord(move[0]) - ord("a"))
+        to_pos = (8 - int(move[3]), ord(move[2]) - ord("a"))
+        if not chess_board.TryMakeMove(from_pos, to_pos):
+            raise ValueError(f"Illegal replay move: {move}")
+        clicks += [from_pos, to_pos]
+    return clicks
+
+def SummarizeFrames(frame_times_ns: List[int]) -> Dict[str, float]:
+    """Get frames per second and per-frame percentiles (ms) from frame times"""
+    ordered = sorted(frame_times_ns)
+    last = len(ordered) - 1
+    summary = {"FPS": len(ordered) / (sum(ordered) / 1e9) if sum(ordered) else 0.0}
+    for percentile in PERCENTILES:
+        summary[f"p{percentile}"] = ordered[min(last, len(ordered) * percentile // 100)] / 1e6
+    return summary
+
+def ReplayFrames(click: Callable[[Tuple[int, int]], None], render: Callable[[], None],
+                 reset: Callable[[], None], clicks: List[Tuple[int, int]], frames: int) -> List[int]:
+    """Apply one click and render one frame, over and over, returns each render's time in ns
+
+    Only rendering is timed; the game restarts whenever the clicks run out.
+    """
+    frame_times = []
+    reset()
+    render()
+    for frame in range(frames):
+        if frame and frame % len(clicks) == 0:
+            reset()
+        click(clicks[frame % len(clicks)])
+        start = time.perf_counter_ns()
+        render()
+        frame_times.append(time.perf_counter_ns() - start)
+    return frame_times
+
+def BenchmarkReplay(frames: int = 600) -> Dict[str, Dict[str, float]]:
+    """Replay the same game in the clean renderer (both modes) and in chess_pygame_original"""
+    pygame.init()
+    screen = pygame.display.set_mode((DisplaySettings.WINDOW_WIDTH, DisplaySettings.WINDOW_HEIGHT))
+    clicks = BuildReplayClicks()
+    results = {}
+    
+    # Both games print every selection and move
+    with contextlib.redirect_stdout(io.StringIO()):
+        for label, dirty_rects in (("Clean, full redraw", False), ("Clean, dirty rects", True)):
+            renderer = ChessRenderer(screen)
+            game_manager = GameManager(ChessBoard(), renderer, InputManager(), dirty_rects)
+            
+            def ClickSquare(square, game_manager=game_manager, renderer=renderer):
+                x, y = renderer.BoardToScreen(*square)
+                game_manager._OnMouseClick((x + renderer.square_size // 2, y + renderer.square_size // 2))
+            
+            results[label] = SummarizeFrames(ReplayFrames(
+                ClickSquare, game_manager.Render, game_manager.ResetGame, clicks, frames))
+        
+        results["Original"] = SummarizeFrames(_ReplayOriginal(clicks, frames))
+    pygame.quit()
+    return results
+
+def _ReplayOriginal(clicks: List[Tuple[int, int]], frames: int) -> List[int]:
+    """Replay the clicks in chess_pygame_original.ChessGame, drawing frames the way its loop does"""
+    # Imported here: the module keeps its board in a global, which this replay resets
+    try:
+        from . import chess_pygame_original as original
+    except ImportError:
+        import chess_pygame_original as original
+    start_position = [board_row[:] for board_row in ChessBoard().board]
+    game = original.ChessGame()
+    
+    def Reset():
+        original.board[:] = [board_row[:] for board_row in start_position]
+        game.turn_white = True
+        game.selected_piece = None
+        game.highlighted_moves = set()
+    
+    def ClickSquare(square):
+        x, y = game.board_to_screen(*square)
+        game.handle_click((x + original.SQUARE_SIZE // 2, y + original.SQUARE_SIZE // 2))
+    
+    def Render():
+        game.screen.fill(original.BG_COLOR)
+        game.draw_board()
+        game.draw_pieces()
+        game.draw_ui()
+        pygame.display.flip()
+    
+    try:
+        return ReplayFrames(ClickSquare, Render, Reset, clicks, frames)
+    finally:
+        Reset()
+
+# ===== MAIN ENTRY POINT =====
+
+def main(argv: Optional[List[str]] = None):
+    """Print per-phase frame times"""
+    parser = argparse.ArgumentParser(description="Headless renderer benchmark (SDL dummy video driver)")
+    parser.add_argument("--frames", type=int, default=300, help="Frames to render")
+    parser.add_argument("--replay-frames", type=int, default=600, help="Frames of the replayed game")
+    args = parser.parse_args(argv)
+
+    timings = BenchmarkRenderer(args.frames)
+    for name, milliseconds in timings.items():
+        print(f"{name:<16} {milliseconds:8.3f} ms")
+    total = sum(timings.values())
+    print(f"{'Frame':<16} {total:8.3f} ms  = {1000 / total if total > 0 else 0:,.0f} FPS")
+    
+    print("\nGameManager.Render, position not changing:")
+    for name, milliseconds in BenchmarkStaticFrames(args.frames).items():
+        print(f"{name:<16} {milliseconds:8.3f} ms")
+    
+    print(f"\nReplayed game, {args.replay_frames} frames (ms per frame):")
+    print(f"{'':<20} {'FPS':>9}" + "".join(f"{'p' + str(percentile):>9}" for percentile in PERCENTILES))
+    for name, summary in BenchmarkReplay(args.replay_frames).items():
+        print(f"{name:<20} {summary['FPS']:9,.0f}"
+              + "".join(f"{summary['p' + str(percentile)]:9.3f}" for percentile in PERCENTILES))
+
+if __name__ == '__main__':
+    main()
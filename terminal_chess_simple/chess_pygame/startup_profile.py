@@ -0,0 +1,187 @@
+# StartupProfile.py - Lazy imports and cold-start timing (budget check: python -m chess_pygame.startup_profile)
+
+import contextlib
+import importlib.util
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Where main.py and launcher.py live
+
+# Cold start of each frontend in a fresh interpreter: (code run with python -c, budget in ms).
+# The budgets leave about three times the time taken on a typical desktop, so only real
+# regressions fail, such as pygame imported at module level or a heavy module pulled in
+# by an import that doesn't need it.
+STARTUP_TARGETS: Dict[str, Tuple[str, int]] = {
+    "launcher": ("import launcher", 75),
+    "terminal game": ("import main", 125),
+    "curses game": ("import curses_chess", 125),
+    "UCI engine": ("import chess_pygame.uci_runner", 125),
+    "clean GUI, first frame": ("from chess_pygame.chess_game_runner import ChessGameRunner\n"
+                               "ChessGameRunner().game_manager.Render()", 500),
+    "original GUI, window open": ("from chess_pygame.chess_pygame_original import ChessGame\n"
+                                  "ChessGame()", 500),
+}
+
+# Lets the GUI targets run without a display or sound card, and quietly
+HEADLESS_ENVIRONMENT = {"SDL_VIDEODRIVER": "dummy", "SDL_AUDIODRIVER": "dummy", "PYGAME_HIDE_SUPPORT_PROMPT": "1"}
+
+# ===== LAZY IMPORTS =====
+
+def LazyImport(name: str):
+    """Get a module that is only executed on first attribute access
+
+    Raises ImportError straight away if the module isn't installed, so
+    `except ImportError` around the import still works as before.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+# ===== STARTUP PROFILE =====
+
+class StartupProfile:
+    """Wall time of a frontend's startup steps, in the order they ran
+
+    Timing costs microseconds, so frontends always time their startup and
+    only print the report when asked (--startup-profile).
+    """
+
+    def __init__(self):
+        self.steps: List[Tuple[str, float]] = []  # (label, seconds)
+
+    @contextlib.contextmanager
+    def Measure(self, label: str) -> Iterator[None]:
+        """Time the code inside the with block as one step"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((label, time.perf_counter() - start))
+
+    def Load(self, name: str):
+        """Import a module now, timed as its own step, finishing a LazyImport (cheap if already loaded)"""
+        with self.Measure(f"import {name}"):
+            importlib.import_module(name).__dict__  # Any attribute access runs a lazily imported module
+
+    def Report(self, entry_module: str, stream: TextIO = sys.stdout):
+        """Print the import time of entry_module's imports and the timed startup steps"""
+        print("=" * 50, file=stream)
+        print("STARTUP PROFILE (ms)", file=stream)
+        modules = ImportTimes(entry_module)
+        if modules:
+            print("Imports, measured in a fresh interpreter (python -X importtime):", file=stream)
+            for name, self_ms, total_ms in modules:
+                print(f"  {name:<40} {total_ms:8.1f}  (own code {self_ms:.1f})", file=stream)
+        if self.steps:
+            print("Startup steps:", file=stream)
+            for label, seconds in self.steps:
+                print(f"  {label:<40} {seconds * 1000:8.1f}", file=stream)
+            print(f"  {'total':<40} {sum(seconds for _, seconds in self.steps) * 1000:8.1f}", file=stream)
+        print("=" * 50, file=stream)
+
+def ImportTimes(entry_module: str, limit: int = 12) -> List[Tuple[str, float, float]]:
+    """Import a module in a fresh interpreter, get (name, own ms, total ms) for it and its direct imports
+
+    The module itself comes first, then its imports, slowest first. Returns []
+    if the import fails.
+    """
+    import subprocess  # Only needed here, and it is a noticeable import itself
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {entry_module}"],
+                            cwd=PROJECT_DIR, env=dict(os.environ, **HEADLESS_ENVIRONMENT),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        return []
+
+    # Lines look like "import time:   self |   cumulative |   name", indented two spaces per
+    # nesting level, and a module is listed after everything it imported
+    lines = []
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if not line.startswith("import time:") or len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        lines.append((name.strip(), int(fields[0].split(":")[1]) / 1000, int(fields[1]) / 1000, depth))
+
+    entry_index = max((index for index, line in enumerate(lines) if line[0] == entry_module and line[3] == 0),
+                      default=None)
+    if entry_index is None:
+        return []
+    imports = []
+    for name, self_ms, total_ms, depth in reversed(lines[:entry_index]):
+        if depth == 0:
+            break  # Before the entry module: interpreter startup
+        if depth == 1:
+            imports.append((name, self_ms, total_ms))
+    imports.sort(key=lambda module: module[2], reverse=True)
+    return [lines[entry_index][:3]] + imports[:limit]
+
+# ===== COLD-START BUDGETS =====
+
+def MeasureColdStart(code: str, runs: int) -> Optional[float]:
+    """Median wall time in ms of running code in a fresh interpreter, None if it failed"""
+    import subprocess
+    environment = dict(os.environ, **HEADLESS_ENVIRONMENT)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_DIR, env=environment,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            return None
+    return sorted(times)[len(times) // 2]
+
+def CheckBudgets(targets: Dict[str, Tuple[str, int]], runs: int = 5, budget_factor: float = 1.0,
+                 stream: TextIO = sys.stdout) -> List[str]:
+    """Time each target's cold start and print it against its budget, returns the targets over budget"""
+    failures = []
+    print(f"{'cold start':<28} {'median ms':>10} {'budget ms':>10}", file=stream)
+    for name, (code, budget_ms) in targets.items():
+        budget_ms *= budget_factor
+        elapsed_ms = MeasureColdStart(code, runs)
+        if elapsed_ms is None:
+            failures.append(name)
+            print(f"{name:<28} {'failed':>10} {budget_ms:10.0f}", file=stream)
+            continue
+        over = elapsed_ms > budget_ms
+        if over:
+            failures.append(name)
+        print(f"{name:<28} {elapsed_ms:10.1f} {budget_ms:10.0f}{'  OVER BUDGET' if over else ''}", file=stream)
+    return failures
+
+# ===== MAIN ENTRY POINT =====
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Check every frontend's cold start against its budget, exits with status 1 if any is over"""
+    import argparse  # The frontends import this module for LazyImport, keep that cheap
+    parser = argparse.ArgumentParser(description="Cold-start time budget check for all frontends")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target (the median counts)")
+    parser.add_argument("--budget-factor", type=float, default=1.0,
+                        help="Multiply every budget, e.g. 2 on a slow machine")
+    parser.add_argument("--target", action="append", choices=list(STARTUP_TARGETS),
+                        help="Only check this target (can be repeated)")
+    parser.add_argument("--imports", metavar="MODULE", help="Show the import times of one module and exit")
+    args = parser.parse_args(argv)
+
+    if args.imports:
+        StartupProfile().Report(args.imports)
+        return 0
+    targets = {name: STARTUP_TARGETS[name] for name in args.target} if args.target else STARTUP_TARGETS
+    failures = CheckBudgets(targets, args.runs, args.budget_factor)
+    if failures:
+        print(f"Over budget or failed: {', '.join(failures)}")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
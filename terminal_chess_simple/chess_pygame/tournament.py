@@ -0,0 +1,355 @@
+# Tournament.py - Concurrent engine-vs-engine matches with Elo and SPRT
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import shlex
+import subprocess
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Handle imports for both standalone and package execution
+try:
+    from .chess_board import ChessBoard
+    from .chess_engine import ChessEngine, SearchLimits, MoveToUci, UciToMove
+    from .notation import MoveToSan
+    from . import pgn_writer
+except ImportError:
+    from chess_board import ChessBoard
+    from chess_engine import ChessEngine, SearchLimits, MoveToUci, UciToMove
+    from notation import MoveToSan
+    import pgn_writer
+
+BUILTIN = "builtin"       # Engine spec for the in-process ChessEngine
+DEFAULT_MAX_PLIES = 300   # Longer games are adjudicated as draws
+DEFAULT_HASH_MB = 16
+
+class MatchSettings:
+    """Per-move limits and game rules shared by every game of a match"""
+    def __init__(self, movetime_ms: Optional[int] = 100, nodes: Optional[int] = None,
+                 max_plies: int = DEFAULT_MAX_PLIES, hash_mb: int = DEFAULT_HASH_MB):
+        self.movetime_ms = movetime_ms
+        self.nodes = nodes
+        self.max_plies = max_plies
+        self.hash_mb = hash_mb
+
+# ===== PLAYERS =====
+
+class BuiltinPlayer:
+    """The project's own engine, searched in this process"""
+    def __init__(self, settings: MatchSettings):
+        self.settings = settings
+        self.engine = ChessEngine(settings.hash_mb)
+
+    def NewGame(self):
+        self.engine.NewGame()
+
+    def ChooseMove(self, chess_board: ChessBoard, start_fen: str, uci_moves: List[str]) -> Optional[str]:
+        limits = SearchLimits()
+        limits.movetime = self.settings.movetime_ms
+        limits.nodes = self.settings.nodes
+        result = self.engine.Search(chess_board, limits)
+        return MoveToUci(result.best_move, chess_board) if result.best_move else None
+
+    def Close(self):
+        pass
+
+class UciPlayer:
+    """Any UCI engine run as a subprocess, e.g. another checkout of this project"""
+    def __init__(self, command: str, settings: MatchSettings):
+        self.settings = settings
+        self.process = subprocess.Popen(shlex.split(command), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        text=True, bufsize=1)
+        self._Send("uci")
+        self._WaitFor("uciok")
+        self._Send(f"setoption name Hash value {settings.hash_mb}")
+
+    def NewGame(self):
+        self._Send("ucinewgame")
+        self._Send("isready")
+        self._WaitFor("readyok")
+
+    def ChooseMove(self, chess_board: ChessBoard, start_fen: str, uci_moves: List[str]) -> Optional[str]:
+        position = f"position fen {start_fen}"
+        if uci_moves:
+            position += " moves " + " ".join(uci_moves)
+        self._Send(position)
+        if self.settings.nodes is not None:
+            self._Send(f"go nodes {self.settings.nodes}")
+        else:
+            self._Send(f"go movetime {self.settings.movetime_ms}")
+        reply = self._WaitFor("bestmove").split()
+        if len(reply) < 2 or reply[1] in ("0000", "(none)"):
+            return None
+        return reply[1]
+
+    def Close(self):
+        try:
+            self._Send("quit")
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+    def _Send(self, command: str):
+        self.process.stdin.write(command + "\n")
+        self.process.stdin.flush()
+
+    def _WaitFor(self, prefix: str) -> str:
+        for line in self.process.stdout:
+            if line.startswith(prefix):
+                return line.strip()
+        raise RuntimeError(f"Engine exited while waiting for '{prefix}'")
+
+def CreatePlayer(spec: str, settings: MatchSettings):
+    """Build a player from 'builtin' or a UCI engine command line"""
+    return BuiltinPlayer(settings) if spec == BUILTIN else UciPlayer(spec, settings)
+
+# ===== GAMES =====
+
+def RandomOpening(rng: random.Random, plies: int) -> List[str]:
+    """Play a few random moves from the start position, as UCI text"""
+    chess_board = ChessBoard()
+    moves = []
+    for _ in range(plies):
+        legal_moves = chess_board.GetAllLegalMoves()
+        if not legal_moves:
+            break
+        move = rng.choice(legal_moves)
+        moves.append(MoveToUci(move, chess_board))
+        chess_board.MakeMove(*move)
+    return moves
+
+def PlayGame(task: Tuple[int, List[str], bool, str, str, MatchSettings]) -> dict:
+    """Play one game (runs in a worker process), returns the result and its PGN"""
+    game_index, opening, a_is_white, spec_a, spec_b, settings = task
+    white_spec, black_spec = (spec_a, spec_b) if a_is_white else (spec_b, spec_a)
+    players = {True: CreatePlayer(white_spec, settings), False: CreatePlayer(black_spec, settings)}
+
+    chess_board = ChessBoard()
+    start_fen = chess_board.ToFEN()
+    uci_moves: List[str] = []
+    san_moves: List[str] = []
+    repetitions: Dict[int, int] = {chess_board.GetHash(): 1}
+    result, termination = "1/2-1/2", "max plies"
+    try:
+        for player in players.values():
+            player.NewGame()
+        for ply in range(settings.max_plies):
+            white_to_move = chess_board.IsWhiteTurn()
+            if ply < len(opening):
+                move_text = opening[ply]
+            else:
+                move_text = players[white_to_move].ChooseMove(chess_board, start_fen, uci_moves)
+
+            if move_text is None:
+                result, termination = "1/2-1/2", "no legal moves"
+                break
+            try:
+                move = UciToMove(move_text)
+            except ValueError:
+                move = None
+            if move is None or not chess_board.CanPlayerMovePiece(*move[0]) or \
+                    move[1] not in chess_board.GetLegalMoves(*move[0]):
+                result, termination = ("0-1" if white_to_move else "1-0"), f"illegal move {move_text}"
+                break
+
+            captured = chess_board.GetPiece(*move[1])
+            san_moves.append(MoveToSan(chess_board, move))
+            uci_moves.append(move_text)
+            chess_board.MakeMove(*move)
+
+            # No check rules: the game is won by capturing the king
+            if captured.lower() == 'k':
+                result, termination = ("1-0" if white_to_move else "0-1"), "king captured"
+                break
+            if chess_board.halfmove_clock >= 100:
+                result, termination = "1/2-1/2", "fifty-move rule"
+                break
+            key = chess_board.GetHash()
+            repetitions[key] = repetitions.get(key, 0) + 1
+            if repetitions[key] >= 3:
+                result, termination = "1/2-1/2", "threefold repetition"
+                break
+    finally:
+        for player in players.values():
+            player.Close()
+
+    white_name, black_name = ("A", "B") if a_is_white else ("B", "A")
+    headers = {
+        "Event": "Self-play match",
+        "Round": str(game_index + 1),
+        "White": f"{white_name}: {white_spec}",
+        "Black": f"{black_name}: {black_spec}",
+        "Termination": termination,
+    }
+    white_score = {"1-0": 1.0, "0-1": 0.0}.get(result, 0.5)
+    return {
+        'game': game_index,
+        'result': result,
+        'score_a': white_score if a_is_white else 1.0 - white_score,
+        'termination': termination,
+        'plies': len(san_moves),
+        'pgn': pgn_writer.FormatGame(headers, san_moves, result),
+    }
+
+# ===== STATISTICS =====
+
+def ScoreToElo(score: float) -> float:
+    """Elo difference that gives an expected score"""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+def EloToScore(elo: float) -> float:
+    """Expected score for an Elo difference"""
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+def EloEstimate(wins: int, draws: int, losses: int) -> Tuple[float, float]:
+    """Elo difference of A over B and its 95% error margin"""
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0, float("inf")
+    score = (wins + 0.5 * draws) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = 1.96 * math.sqrt(variance / games)
+    return ScoreToElo(score), (ScoreToElo(min(score + margin, 1)) - ScoreToElo(max(score - margin, 0))) / 2
+
+class SPRT:
+    """Sequential probability ratio test of H0: elo = elo0 against H1: elo = elo1"""
+    def __init__(self, elo0: float = 0.0, elo1: float = 5.0, alpha: float = 0.05, beta: float = 0.05):
+        self.elo0, self.elo1 = elo0, elo1
+        self.lower_bound = math.log(beta / (1 - alpha))
+        self.upper_bound = math.log((1 - beta) / alpha)
+
+    def LogLikelihoodRatio(self, wins: int, draws: int, losses: int) -> float:
+        """Normal approximation of the trinomial log-likelihood ratio"""
+        games = wins + draws + losses
+        if games == 0 or wins + losses == 0:
+            return 0.0
+        score = (wins + 0.5 * draws) / games
+        variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+        if variance <= 0:
+            return 0.0
+        score0, score1 = EloToScore(self.elo0), EloToScore(self.elo1)
+        return games * (score1 - score0) * (2 * score - score0 - score1) / (2 * variance)
+
+    def Decide(self, wins: int, draws: int, losses: int) -> Optional[str]:
+        """'H1' (A is stronger), 'H0' (it isn't), or None to keep playing"""
+        llr = self.LogLikelihoodRatio(wins, draws, losses)
+        if llr >= self.upper_bound:
+            return "H1"
+        if llr <= self.lower_bound:
+            return "H0"
+        return None
+
+# ===== DRIVER =====
+
+def GenerateTasks(spec_a: str, spec_b: str, settings: MatchSettings, games: int,
+                  opening_plies: int, seed: int) -> Iterator[tuple]:
+    """Each random opening is played twice, with colours swapped"""
+    rng = random.Random(seed)
+    for game_index in range(games):
+        if game_index % 2 == 0:
+            opening = RandomOpening(rng, opening_plies)
+        yield (game_index, opening, game_index % 2 == 0, spec_a, spec_b, settings)
+
+def RunMatch(spec_a: str, spec_b: str, settings: MatchSettings, games: int = 1000,
+             concurrency: Optional[int] = None, opening_plies: int = 6, seed: int = 1,
+             sprt: Optional[SPRT] = None, pgn_path: Optional[str] = None) -> dict:
+    """Play games in parallel until the game limit or an SPRT decision"""
+    concurrency = concurrency or os.cpu_count() or 1
+    wins = draws = losses = 0
+    decision = None
+    start = time.perf_counter()
+
+    pgn_file = open(pgn_path, "w", encoding="utf-8") if pgn_path else None
+    pool = multiprocessing.Pool(concurrency)
+    try:
+        tasks = GenerateTasks(spec_a, spec_b, settings, games, opening_plies, seed)
+        for game in pool.imap_unordered(PlayGame, tasks):
+            if game['score_a'] == 1.0:
+                wins += 1
+            elif game['score_a'] == 0.0:
+                losses += 1
+            else:
+                draws += 1
+            if pgn_file is not None:
+                pgn_file.write(game['pgn'])
+
+            elo, margin = EloEstimate(wins, draws, losses)
+            llr = sprt.LogLikelihoodRatio(wins, draws, losses) if sprt else None
+            llr_text = f"  LLR {llr:+.2f} [{sprt.lower_bound:.2f}, {sprt.upper_bound:.2f}]" if sprt else ""
+            print(f"Game {wins + draws + losses:>5}: {game['result']:<7} ({game['termination']})  "
+                  f"A +{wins} ={draws} -{losses}  Elo {elo:+.1f} +/- {margin:.1f}{llr_text}", file=sys.stderr)
+
+            if sprt is not None:
+                decision = sprt.Decide(wins, draws, losses)
+                if decision is not None:
+                    break  # Conclusive - don't wait for the remaining games
+    finally:
+        pool.terminate()
+        pool.join()
+        if pgn_file is not None:
+            pgn_file.close()
+
+    elo, margin = EloEstimate(wins, draws, losses)
+    return {
+        'engine_a': spec_a,
+        'engine_b': spec_b,
+        'games': wins + draws + losses,
+        'wins': wins,
+        'draws': draws,
+        'losses': losses,
+        'elo': round(elo, 1),
+        'elo_margin': round(margin, 1),
+        'sprt': None if sprt is None else {
+            'elo0': sprt.elo0, 'elo1': sprt.elo1,
+            'llr': round(sprt.LogLikelihoodRatio(wins, draws, losses), 3),
+            'lower_bound': round(sprt.lower_bound, 3), 'upper_bound': round(sprt.upper_bound, 3),
+            'decision': decision,
+        },
+        'movetime_ms': settings.movetime_ms,
+        'nodes': settings.nodes,
+        'concurrency': concurrency,
+        'wall_seconds': round(time.perf_counter() - start, 2),
+    }
+
+# ===== MAIN ENTRY POINT =====
+
+def main(argv: Optional[List[str]] = None):
+    """Run a self-play match from the command line"""
+    parser = argparse.ArgumentParser(description="Engine-vs-engine match with Elo estimate and SPRT")
+    parser.add_argument("--engine-a", default=BUILTIN, help="'builtin' or a UCI engine command (the candidate)")
+    parser.add_argument("--engine-b", default=BUILTIN, help="'builtin' or a UCI engine command (the baseline)")
+    parser.add_argument("--games", type=int, default=1000, help="Maximum number of games")
+    parser.add_argument("--movetime", type=int, default=100, help="Milliseconds per move")
+    parser.add_argument("--nodes", type=int, default=None, help="Nodes per move (overrides --movetime)")
+    parser.add_argument("--hash", type=int, default=DEFAULT_HASH_MB, help="Hash size per engine (MB)")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES, help="Adjudicate as a draw after this many plies")
+    parser.add_argument("-c", "--concurrency", type=int, default=None, help="Games played at once (default: all cores)")
+    parser.add_argument("--opening-plies", type=int, default=6, help="Random moves played before the engines take over")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for opening randomization")
+    parser.add_argument("--no-sprt", action="store_true", help="Play all games without early stopping")
+    parser.add_argument("--elo0", type=float, default=0.0, help="SPRT H0 Elo")
+    parser.add_argument("--elo1", type=float, default=5.0, help="SPRT H1 Elo")
+    parser.add_argument("--alpha", type=float, default=0.05, help="SPRT false-positive rate")
+    parser.add_argument("--beta", type=float, default=0.05, help="SPRT false-negative rate")
+    parser.add_argument("--pgn", default="match.pgn", help="PGN output file")
+    parser.add_argument("--summary", default=None, help="JSON summary output file")
+    args = parser.parse_args(argv)
+
+    settings = MatchSettings(None if args.nodes else args.movetime, args.nodes, args.max_plies, args.hash)
+    sprt = None if args.no_sprt else SPRT(args.elo0, args.elo1, args.alpha, args.beta)
+    summary = RunMatch(args.engine_a, args.engine_b, settings, args.games, args.concurrency,
+                       args.opening_plies, args.seed, sprt, args.pgn)
+
+    print(json.dumps(summary, indent=2))
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as summary_file:
+            json.dump(summary, summary_file, indent=2)
+
+if __name__ == '__main__':
+    main()
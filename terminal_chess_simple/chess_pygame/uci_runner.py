@@ -0,0 +1,252 @@
+# UCIRunner.py - Universal Chess Interface entry point for chess GUIs and match tools
+
+import sys
+import threading
+from typing import List, Optional, TextIO
+
+# Handle imports for both standalone and package execution
+try:
+    from .chess_board import ChessBoard
+    from .chess_engine import ChessEngine, SearchLimits, MoveToUci, UciToMove, MATE_SCORE, MAX_DEPTH
+except ImportError:
+    from chess_board import ChessBoard
+    from chess_engine import ChessEngine, SearchLimits, MoveToUci, UciToMove, MATE_SCORE, MAX_DEPTH
+
+ENGINE_NAME = "Chess_Py"
+ENGINE_AUTHOR = "Chess_Py contributors"
+
+class UCIOptions:
+    """Option limits advertised to the GUI"""
+    HASH_DEFAULT = 16
+    HASH_MIN = 1
+    HASH_MAX = 1024
+    THREADS_DEFAULT = 1
+    THREADS_MIN = 1
+    THREADS_MAX = 64
+
+class UCIRunner:
+    """Reads UCI commands from stdin and answers on stdout
+
+    The command loop and the search run on different threads, so "stop"
+    and "ponderhit" are acted on while the engine is still thinking.
+    """
+    def __init__(self, input_stream: TextIO = sys.stdin, output_stream: TextIO = sys.stdout):
+        self.input_stream = input_stream
+        self.output_stream = output_stream
+        self.output_lock = threading.Lock()
+
+        self.engine = ChessEngine(UCIOptions.HASH_DEFAULT)
+        self.chess_board = ChessBoard()
+        self.threads = UCIOptions.THREADS_DEFAULT
+        self.search_thread: Optional[threading.Thread] = None
+        self.search_limits: Optional[SearchLimits] = None
+
+    # ===== MAIN LOOP =====
+
+    def Run(self):
+        """Process commands until 'quit' or end of input"""
+        for line in self.input_stream:
+            if not self.HandleCommand(line):
+                break
+        self._StopSearch()
+
+    def HandleCommand(self, line: str) -> bool:
+        """Handle one command line, returns False when the engine should exit"""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+
+        if command == "uci":
+            self._OnUci()
+        elif command == "isready":
+            self.Send("readyok")
+        elif command == "setoption":
+            self._OnSetOption(args)
+        elif command == "ucinewgame":
+            self._StopSearch()
+            self.engine.NewGame()
+            self.chess_board.Reset()
+        elif command == "position":
+            self._StopSearch()
+            self._OnPosition(args)
+        elif command == "go":
+            self._StopSearch()
+            self._OnGo(args)
+        elif command == "stop":
+            self._StopSearch()
+        elif command == "ponderhit":
+            self._OnPonderHit()
+        elif command == "quit":
+            return False
+        return True
+
+    def Send(self, text: str):
+        """Write one line to the GUI (safe to call from the search thread)"""
+        with self.output_lock:
+            self.output_stream.write(text + "\n")
+            self.output_stream.flush()
+
+    # ===== COMMAND HANDLERS =====
+
+    def _OnUci(self):
+        """Identify the engine and list its options"""
+        self.Send(f"id name {ENGINE_NAME}")
+        self.Send(f"id author {ENGINE_AUTHOR}")
+        self.Send(f"option name Hash type spin default {UCIOptions.HASH_DEFAULT} "
+                  f"min {UCIOptions.HASH_MIN} max {UCIOptions.HASH_MAX}")
+        self.Send(f"option name Threads type spin default {UCIOptions.THREADS_DEFAULT} "
+                  f"min {UCIOptions.THREADS_MIN} max {UCIOptions.THREADS_MAX}")
+        self.Send("option name Ponder type check default false")
+        self.Send("uciok")
+
+    def _OnSetOption(self, args: List[str]):
+        """Handle 'setoption name <id> [value <x>]'"""
+        if "name" not in args:
+            return
+        name_end = args.index("value") if "value" in args else len(args)
+        name = " ".join(args[args.index("name") + 1:name_end]).lower()
+        value = " ".join(args[name_end + 1:])
+
+        if name == "hash":
+            size_mb = self._ParseSpin(value, UCIOptions.HASH_MIN, UCIOptions.HASH_MAX)
+            if size_mb is not None:
+                self._StopSearch()
+                self.engine.SetHashSize(size_mb)
+        elif name == "threads":
+            threads = self._ParseSpin(value, UCIOptions.THREADS_MIN, UCIOptions.THREADS_MAX)
+            if threads is not None:
+                self.threads = threads
+                if threads > 1:
+                    # Python threads share one interpreter lock, so extra search
+                    # threads would only slow the single search down.
+                    self.Send("info string Threads accepted; search runs on one thread")
+
+    def _OnPosition(self, args: List[str]):
+        """Handle 'position startpos|fen <fen> [moves ...]'"""
+        if not args:
+            return
+        moves_at = args.index("moves") if "moves" in args else len(args)
+        if args[0] == "startpos":
+            self.chess_board.Reset()
+        elif args[0] == "fen":
+            try:
+                self.chess_board.FromFEN(" ".join(args[1:moves_at]))
+            except ValueError as e:
+                self.Send(f"info string {e}")
+                return
+        else:
+            return
+
+        for move_text in args[moves_at + 1:]:
+            try:
+                from_pos, to_pos = UciToMove(move_text)
+            except ValueError:
+                self.Send(f"info string illegal move {move_text}")
+                return
+            if not self.chess_board.TryMakeMove(from_pos, to_pos):
+                self.Send(f"info string illegal move {move_text}")
+                return
+
+    def _OnGo(self, args: List[str]):
+        """Handle 'go' and start searching on a background thread"""
+        limits = SearchLimits()
+        int_fields = ("depth", "nodes", "movetime", "wtime", "btime", "winc", "binc", "movestogo")
+        i = 0
+        while i < len(args):
+            token = args[i]
+            if token in int_fields and i + 1 < len(args):
+                try:
+                    setattr(limits, token, int(args[i + 1]))
+                except ValueError:
+                    pass
+                i += 2
+                continue
+            if token == "infinite":
+                limits.infinite = True
+            elif token == "ponder":
+                limits.ponder = True
+            i += 1
+
+        # Remember whose clock applies now: once the search runs, the board belongs to its thread
+        limits.white_to_move = self.chess_board.IsWhiteTurn()
+        self.search_limits = limits
+        self.search_thread = threading.Thread(target=self._SearchWorker, args=(limits,), daemon=True)
+        self.search_thread.start()
+
+    def _OnPonderHit(self):
+        """The opponent played the expected move - switch to a timed search"""
+        limits = self.search_limits
+        if limits is None or not limits.ponder:
+            return
+        limits.ponder = False
+        self.engine.SetDeadline(limits.GetTimeBudget(limits.white_to_move))
+
+    # ===== SEARCH THREAD =====
+
+    def _SearchWorker(self, limits: SearchLimits):
+        """Run one search and report the best move"""
+        result = self.engine.Search(self.chess_board, limits, self._SendInfo)
+
+        # In infinite and ponder mode the GUI must say when to reply
+        while (limits.infinite or limits.ponder) and not self.engine.stop_event.is_set():
+            self.engine.stop_event.wait(0.01)
+
+        if result.best_move is None:
+            self.Send("bestmove 0000")
+            return
+        text = f"bestmove {MoveToUci(result.best_move, self.chess_board)}"
+        if result.ponder_move is not None:
+            self.chess_board.MakeMove(*result.best_move)
+            text += f" ponder {MoveToUci(result.ponder_move, self.chess_board)}"
+            self.chess_board.UndoMove()
+        self.Send(text)
+
+    def _SendInfo(self, info: dict):
+        """Report the progress of an iteration"""
+        score = info['score']
+        if abs(score) >= MATE_SCORE - MAX_DEPTH:
+            # The search has no checkmate test: a mate scores at the king capture that
+            # follows it. Mating in n moves captures at ply 2n, being mated in n at 2n + 1
+            plies = MATE_SCORE - abs(score)
+            mate_in = max(1, plies // 2)
+            if score < 0:
+                mate_in = -mate_in
+            score_text = f"mate {mate_in}"
+        else:
+            score_text = f"cp {score}"
+
+        pv_text = []
+        for move in info['pv']:
+            pv_text.append(MoveToUci(move, self.chess_board))
+            self.chess_board.MakeMove(*move)
+        for _ in info['pv']:
+            self.chess_board.UndoMove()
+
+        self.Send(f"info depth {info['depth']} score {score_text} nodes {info['nodes']} "
+                  f"nps {info['nps']} time {info['time_ms']} pv {' '.join(pv_text)}")
+
+    def _StopSearch(self):
+        """Stop a running search and wait for its bestmove"""
+        if self.search_thread is not None:
+            self.engine.Stop()
+            self.search_thread.join()
+            self.search_thread = None
+            self.search_limits = None
+
+    @staticmethod
+    def _ParseSpin(value: str, minimum: int, maximum: int) -> Optional[int]:
+        """Parse a spin option value and clamp it to its range"""
+        try:
+            return max(minimum, min(maximum, int(value)))
+        except ValueError:
+            return None
+
+# ===== MAIN ENTRY POINT =====
+
+def main():
+    """Speak UCI over stdin/stdout"""
+    UCIRunner().Run()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+# Zobrist.py - Position hashing keys shared by the board, engine and tools
+
+import random
+from typing import Dict, List
+
+# Squares are numbered row * 8 + col, matching ChessBoard's row/col layout
+# (square 0 = a8, square 63 = h1).
+PIECE_CHARS = "PNBRQKpnbrqk"
+
+# A fixed seed keeps keys identical between runs, so hashes written to disk
+# by one process can be looked up by another.
+_rng = random.Random(0x5EED_C4E55)
+
+PIECE_KEYS: Dict[str, List[int]] = {
+    piece: [_rng.getrandbits(64) for _ in range(64)] for piece in PIECE_CHARS
+}
+SIDE_KEY: int = _rng.getrandbits(64)  # XORed in when black is to move
+
+def ComputeHash(board: List[List[str]], white_to_move: bool) -> int:
+    """Compute the Zobrist key of a list-of-lists board from scratch"""
+    key = 0 if white_to_move else SIDE_KEY
+    for row in range(8):
+        board_row = board[row]
+        for col in range(8):
+            piece = board_row[col]
+            if piece != ".":
+                key ^= PIECE_KEYS[piece][row * 8 + col]
+    return key
@@ -0,0 +1,221 @@
+# Full-screen terminal chess with curses (same rules as main.py)
+# Arrow keys (or h/j/k/l) move the cursor, Enter or space picks a piece and then its
+# destination, Esc cancels the selection, q quits.
+#
+# The board is drawn once. After that only squares whose look changed are written to
+# curses' virtual screen, and curses sends just the differences to the terminal, so
+# moving the cursor costs a few bytes instead of a whole board. That keeps the game
+# responsive over slow or high-latency connections.
+
+import contextlib
+import curses
+import io
+
+import main
+
+SQUARE_WIDTH = 3  # Each square is " P ", wide enough to show the cursor clearly
+BOARD_TOP = 2     # Screen row of rank 8
+BOARD_LEFT = 3    # Screen column of file a
+STATUS_ROW = BOARD_TOP + 10
+HELP_TEXT = "Arrows/hjkl move, Enter/space select, Esc cancel, q quit"
+# Smallest screen the board and status line fit on (one spare column, as curses
+# can't write the last cell of a row without moving past it)
+MIN_ROWS = STATUS_ROW + 2
+MIN_COLS = BOARD_LEFT + 8 * SQUARE_WIDTH + 1
+
+# Keys that move the cursor: (row change, column change)
+CURSOR_KEYS = {
+    curses.KEY_UP: (-1, 0), curses.KEY_DOWN: (1, 0), curses.KEY_LEFT: (0, -1), curses.KEY_RIGHT: (0, 1),
+    ord('k'): (-1, 0), ord('j'): (1, 0), ord('h'): (0, -1), ord('l'): (0, 1),
+}
+SELECT_KEYS = (ord(' '), ord('\n'), curses.KEY_ENTER)
+ESCAPE_KEY = 27
+
+class CursesChess:
+    """The game on a curses screen: board, cursor, selection and a status line"""
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.turn_white = True
+        self.cursor = (6, 4)   # Start on e2
+        self.selected = None   # (row, col) of the picked piece
+        self.message = ""
+        self.drawn = [[None] * 8 for _ in range(8)]  # (character, attribute) on screen per square
+        self.drawn_status = None
+        self.too_small = False  # Screen can't fit the board, only a message is shown
+        self._setup_colors()
+
+    # DRAWING
+    def _setup_colors(self):
+        """Pick an attribute for every piece color and background (plain attributes without color support)"""
+        curses.curs_set(0)  # The board shows its own cursor
+        # (white piece?, background) -> attribute, background being "plain", "move" or "selected"
+        self.piece_attributes = {
+            (white, background): curses.A_BOLD | extra
+            for white in (True, False)
+            for background, extra in (("plain", 0), ("move", curses.A_UNDERLINE), ("selected", curses.A_STANDOUT))}
+        self.empty_move_attribute = curses.A_BOLD
+        if not curses.has_colors():
+            return
+        curses.start_color()
+        curses.use_default_colors()
+        # Same colors as main.py: red for White, blue for Black, green for available moves.
+        # A color pair sets both colors, so each piece color needs a pair per background.
+        backgrounds = {"plain": -1, "move": curses.COLOR_GREEN, "selected": curses.COLOR_YELLOW}
+        number = 1
+        for white, foreground in ((True, curses.COLOR_RED), (False, curses.COLOR_BLUE)):
+            for background, background_color in backgrounds.items():
+                curses.init_pair(number, foreground, background_color)
+                self.piece_attributes[white, background] = curses.color_pair(number) | curses.A_BOLD
+                number += 1
+        curses.init_pair(number, curses.COLOR_GREEN, -1)
+        self.empty_move_attribute = curses.color_pair(number) | curses.A_BOLD
+
+    def draw_frame(self):
+        """Draw everything that never changes: file and rank labels and the key help
+
+        On a screen too small for the board, only says so (the game goes on
+        once the terminal is made bigger again).
+        """
+        self.screen.erase()
+        rows, cols = self.screen.getmaxyx()
+        self.too_small = rows < MIN_ROWS or cols < MIN_COLS
+        if self.too_small:
+            message = f"Terminal too small: need {MIN_COLS}x{MIN_ROWS}, have {cols}x{rows}"
+            self.screen.addstr(0, 0, message[:cols - 1])
+            return
+        for c in range(8):
+            self.screen.addstr(BOARD_TOP - 1, BOARD_LEFT + c * SQUARE_WIDTH + 1, "abcdefgh"[c])
+        for r in range(8):
+            self.screen.addstr(BOARD_TOP + r, 1, str(8 - r))
+        self.screen.addstr(STATUS_ROW + 1, 0, HELP_TEXT[:cols - 1])
+
+    def square_look(self, r, c, highlighted):
+        """What a square shows: its character and attribute"""
+        piece = main.board[r][c]
+        if piece == '.':
+            character, attribute = (curses.ACS_BULLET, self.empty_move_attribute) if highlighted else ('.', 0)
+        else:
+            background = "selected" if (r, c) == self.selected else "move" if highlighted else "plain"
+            character, attribute = piece, self.piece_attributes[piece.isupper(), background]
+        if (r, c) == self.cursor:
+            attribute |= curses.A_REVERSE
+        return character, attribute
+
+    def highlighted_squares(self):
+        """Moves of the selected piece, or a preview for the player's own piece under the cursor"""
+        r, c = self.selected or self.cursor
+        piece = main.board[r][c]
+        if piece == '.' or piece.isupper() != self.turn_white:
+            return set()
+        return set(main.legal_moves_from(r, c))
+
+    def update_screen(self):
+        """Write only the squares and status text that changed, then let curses send the difference"""
+        if self.too_small:
+            self.screen.noutrefresh()
+            curses.doupdate()
+            return
+        highlighted = self.highlighted_squares()
+        for r in range(8):
+            for c in range(8):
+                look = self.square_look(r, c, (r, c) in highlighted)
+                if look != self.drawn[r][c]:
+                    character, attribute = look
+                    x = BOARD_LEFT + c * SQUARE_WIDTH
+                    self.screen.addstr(BOARD_TOP + r, x, " " * SQUARE_WIDTH, attribute)
+                    self.screen.addch(BOARD_TOP + r, x + 1, character, attribute)
+                    self.drawn[r][c] = look
+
+        player = "White" if self.turn_white else "Black"
+        status = f"{player} to move. {self.message}"
+        if status != self.drawn_status:
+            self.screen.move(STATUS_ROW, 0)
+            self.screen.clrtoeol()
+            self.screen.addstr(STATUS_ROW, 0, status[:self.screen.getmaxyx()[1] - 1])
+            self.drawn_status = status
+        self.screen.noutrefresh()
+        curses.doupdate()
+
+    # INPUT HANDLING
+    def handle_key(self, key):
+        """React to one key press, returns False to quit"""
+        if key in (ord('q'), ord('Q')):
+            return False
+        if key == curses.KEY_RESIZE:
+            self.redraw_all()
+        elif self.too_small:
+            pass  # The board can't be seen, so don't let keys change it
+        elif key in CURSOR_KEYS:
+            dr, dc = CURSOR_KEYS[key]
+            self.cursor = ((self.cursor[0] + dr) % 8, (self.cursor[1] + dc) % 8)
+        elif key in SELECT_KEYS:
+            self.press_square(*self.cursor)
+        elif key == ESCAPE_KEY:
+            self.selected = None
+            self.message = ""
+        return True
+
+    def press_square(self, r, c):
+        """Pick a piece, move the picked piece, or switch to another piece"""
+        piece = main.board[r][c]
+        if self.selected is not None and (r, c) in main.legal_moves_from(*self.selected):
+            self.make_move(self.selected, (r, c))
+        elif piece != '.' and piece.isupper() == self.turn_white:
+            self.selected = (r, c)
+            self.message = f"Picked {piece} at {main.index_to_coord(r, c)}"
+        elif self.selected is not None:
+            self.selected = None
+            self.message = "Can't move there"
+        else:
+            self.message = "Pick one of your own pieces"
+
+    def make_move(self, from_pos, to_pos):
+        """Play a move with main.py's rules (it has already been checked)"""
+        (r1, c1), (r2, c2) = from_pos, to_pos
+        main.set_square(r2, c2, main.board[r1][c1])
+        main.set_square(r1, c1, '.')
+        # promote_if_needed prints its news; show it on the status line instead
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            main.promote_if_needed(r2, c2)
+        self.message = f"Last move {main.index_to_coord(r1, c1)}-{main.index_to_coord(r2, c2)}"
+        if printed.getvalue():
+            self.message += ", pawn promoted to queen"
+        self.turn_white = not self.turn_white
+        self.selected = None
+
+    def redraw_all(self):
+        """Forget what is on screen and draw it all again (after a resize)"""
+        self.drawn = [[None] * 8 for _ in range(8)]
+        self.drawn_status = None
+        self.draw_frame()
+
+    def run(self):
+        """Main loop: sleep until a key arrives, handle every waiting key, then update once"""
+        self.draw_frame()
+        self.update_screen()
+        while True:
+            keys = [self.screen.getch()]
+            # When keys pile up (a held arrow key, a slow link) skip the frames in between
+            self.screen.nodelay(True)
+            while True:
+                key = self.screen.getch()
+                if key == -1:
+                    break
+                keys.append(key)
+            self.screen.nodelay(False)
+
+            for key in keys:
+                if not self.handle_key(key):
+                    return
+            self.update_screen()
+
+def run_game(screen):
+    """Set up the screen curses.wrapper gives us and play"""
+    screen.keypad(True)
+    curses.set_escdelay(25)  # Esc cancels at once instead of waiting for an escape sequence
+    CursesChess(screen).run()
+
+if __name__ == '__main__':
+    curses.wrapper(run_game)
@@ -3,6 +3,8 @@
 Chess Game Launcher - Choose between Terminal and Pygame versions
 """
 
+import contextlib
+import importlib.util
 import sys
 import os
 
@@ -48,14 +50,19 @@ def get_choice():
             print("\n👋 Goodbye!")
             return 4
 
-def launch_terminal_chess():
+def timed(startup_profile, label):
+    """Time a step of starting a game when --startup-profile was given"""
+    return startup_profile.Measure(label) if startup_profile else contextlib.nullcontext()
+
+def launch_terminal_chess(startup_profile=None):
     """Launch the terminal version"""
     print("\n🚀 Launching Terminal Chess...")
     print("=" * 30)
     try:
         # Import and run the terminal version
-        import main
-        main.main()
+        with timed(startup_profile, "import main"):
+            import main
+        main.main(startup_profile=startup_profile)
     except ImportError:
         print("❌ Error: main.py not found!")
         input("Press Enter to return to menu...")
@@ -63,17 +70,23 @@ def launch_terminal_chess():
         print(f"❌ Error launching terminal chess: {e}")
         input("Press Enter to return to menu...")
 
-def launch_pygame_chess():
+def require_pygame():
+    """Raise ImportError if pygame isn't installed, without paying for importing it"""
+    if importlib.util.find_spec("pygame") is None:
+        raise ImportError("No module named 'pygame'")
+
+def launch_pygame_chess(startup_profile=None):
     """Launch the pygame version"""
     print("\n🚀 Launching Pygame Chess...")
     print("=" * 30)
     try:
         # Check if pygame is available
-        import pygame
+        require_pygame()
         
         # Import and run the pygame version
-        from chess_pygame import chess_pygame_original
-        chess_pygame_original.main()
+        with timed(startup_profile, "import chess_pygame.chess_pygame_original"):
+            from chess_pygame import chess_pygame_original
+        chess_pygame_original.main(startup_profile)
         
     except ImportError as e:
         if 'pygame' in str(e):
@@ -86,17 +99,18 @@ def launch_pygame_chess():
         print(f"❌ Error launching pygame chess: {e}")
         input("Press Enter to return to menu...")
 
-def launch_clean_architecture_chess():
+def launch_clean_architecture_chess(startup_profile=None):
     """Launch the clean architecture pygame version"""
     print("\n🚀 Launching Clean Architecture Chess...")
     print("=" * 40)
     try:
         # Check if pygame is available
-        import pygame
+        require_pygame()
         
         # Import and run the clean architecture version
-        from chess_pygame import chess_game_runner
-        chess_game_runner.main()
+        with timed(startup_profile, "import chess_pygame.chess_game_runner"):
+            from chess_pygame import chess_game_runner
+        chess_game_runner.main(["--startup-profile"] if startup_profile else [], startup_profile)
         
     except ImportError as e:
         if 'pygame' in str(e):
@@ -111,20 +125,25 @@ def launch_clean_architecture_chess():
         input("Press Enter to return to menu...")
 
 def main():
-    """Main launcher loop"""
+    """Main launcher loop (--startup-profile: print how long the chosen game took to start)"""
+    profile_startup = "--startup-profile" in sys.argv[1:]
+    if profile_startup:
+        from chess_pygame.startup_profile import StartupProfile
+    
     while True:
         # Clear screen (works on Windows and Unix)
         os.system('cls' if os.name == 'nt' else 'clear')
         
         show_menu()
         choice = get_choice()
+        startup_profile = StartupProfile() if profile_startup else None  # Fresh for each game
         
         if choice == 1:
-            launch_terminal_chess()
+            launch_terminal_chess(startup_profile)
         elif choice == 2:
-            launch_pygame_chess()
+            launch_pygame_chess(startup_profile)
         elif choice == 3:
-            launch_clean_architecture_chess()
+            launch_clean_architecture_chess(startup_profile)
         elif choice == 4:
             print("\n👋 Thanks for playing chess!")
             sys.exit(0)
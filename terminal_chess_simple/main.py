@@ -3,6 +3,15 @@
 # Designed for teaching - readable and easy to extend.
 # Limitations: no castling, no en-passant, simple pawn promotion to Queen, no check/checkmate detection.
 
+import contextlib
+import io
+import shutil
+import sys
+import time
+
+from chess_pygame import movegen, zobrist
+from chess_pygame.move_cache import LegalMoveCache
+
 # GAME BOARD REPRESENTATION
 # The chess board is a 2D list (8x8 grid)
 # - Lowercase letters = Black pieces (r=rook, n=knight, b=bishop, q=queen, k=king, p=pawn)
@@ -20,6 +29,25 @@ board = [
     ["R","N","B","Q","K","B","N","R"]   # White back rank (rank 1)
 ]
 
+# LEGAL-MOVE CACHE
+# Every arrangement of pieces gets a (practically) unique number, its Zobrist hash.
+# Moves found for a square are remembered under (hash, square), so asking about the
+# same position again (e.g. listing pieces, then selecting one) skips the work.
+# Moves from a square don't depend on whose turn it is, so the hash only covers pieces.
+board_hash = zobrist.ComputeHash(board, True)
+move_cache = LegalMoveCache()
+
+def set_square(r, c, piece):
+    """Put a piece (or '.') on a square and keep board_hash in step with the board"""
+    global board_hash
+    square = r * 8 + c
+    old_piece = board[r][c]
+    if old_piece != '.':
+        board_hash ^= zobrist.PIECE_KEYS[old_piece][square]  # XOR the old piece out
+    if piece != '.':
+        board_hash ^= zobrist.PIECE_KEYS[piece][square]      # XOR the new piece in
+    board[r][c] = piece
+
 # COLOR CODES FOR TERMINAL OUTPUT
 class Colors:
     RED = '\033[91m'      # Red for White pieces
@@ -37,36 +65,135 @@ def colorize_piece(piece):
     else:  # Black pieces (lowercase)
         return f"{Colors.BLUE}{Colors.BOLD}{piece}{Colors.RESET}"
 
+def printed_square(piece, highlighted):
+    """How print_board shows one square"""
+    if highlighted and piece == '.':
+        # Highlight empty squares that are valid moves
+        return f"{Colors.GREEN}{Colors.BOLD}●{Colors.RESET}"
+    if highlighted:
+        # Highlight pieces that can be captured (show original piece in green brackets)
+        return f"{Colors.GREEN}[{colorize_piece(piece)}]{Colors.RESET}"
+    return colorize_piece(piece)
+
+# PRECOMPUTED BOARD TEXT
+# There are only 13 square contents (12 pieces or empty), each plain or highlighted, so
+# every square's text is built once here instead of on every redraw. Each entry starts
+# with the space that separates it from the square before it.
+PRINTED_SQUARES = {(piece, highlighted): " " + printed_square(piece, highlighted)
+                   for piece in "PNBRQKpnbrqk." for highlighted in (False, True)}
+BOARD_TOP = "\n    a b c d e f g h\n  +----------------+\n"  # Column labels (files) and border
+RANK_STARTS = [f"{8 - i} |" for i in range(8)]  # Row 0 is rank 8
+BOARD_BOTTOM = ("  +----------------+\n"
+                f"  {Colors.RED}■{Colors.RESET} = White pieces    {Colors.BLUE}■{Colors.RESET} = Black pieces"
+                f"    {Colors.GREEN}●{Colors.RESET} = Available moves\n")
+
 # DISPLAY FUNCTIONS
+def render_board(highlighted_squares=None):
+    """Build everything print_board shows as one string, with a single join"""
+    squares = PRINTED_SQUARES
+    parts = [BOARD_TOP]
+    for i, row in enumerate(board):
+        parts.append(RANK_STARTS[i])
+        if highlighted_squares:
+            parts.extend([squares[piece, (i, j) in highlighted_squares] for j, piece in enumerate(row)])
+        else:
+            parts.extend([squares[piece, False] for piece in row])
+        parts.append(" |\n")
+    parts.append(BOARD_BOTTOM)
+    return "".join(parts)
+
 def print_board(highlighted_squares=None):
     """Display the chess board in a user-friendly format with coordinates and colors
     
     Args:
         highlighted_squares: Set of (row, col) tuples to highlight in green
     """
-    if highlighted_squares is None:
-        highlighted_squares = set()
-        
-    print("\n    a b c d e f g h")  # Column labels (files)
-    print("  +----------------+")
-    for i,row in enumerate(board):
-        rank = 8 - i  # Convert array index to chess rank (8,7,6...1)
-        colored_pieces = []
-        for j, piece in enumerate(row):
-            if (i, j) in highlighted_squares and piece == '.':
-                # Highlight empty squares that are valid moves
-                colored_pieces.append(f"{Colors.GREEN}{Colors.BOLD}●{Colors.RESET}")
-            elif (i, j) in highlighted_squares:
-                # Highlight pieces that can be captured (show original piece but with green background)
-                colored_piece = colorize_piece(piece)
-                colored_pieces.append(f"{Colors.GREEN}[{colored_piece}]{Colors.RESET}")
-            else:
-                colored_pieces.append(colorize_piece(piece))
-        
-        colored_row = " ".join(colored_pieces)
-        print(f"{rank} | {colored_row} |")
-    print("  +----------------+")
-    print(f"  {Colors.RED}■{Colors.RESET} = White pieces    {Colors.BLUE}■{Colors.RESET} = Black pieces    {Colors.GREEN}●{Colors.RESET} = Available moves")
+    sys.stdout.write(render_board(highlighted_squares))  # One write for the whole board
+
+# IN-PLACE BOARD REDRAW
+# print_board() prints the whole board again every time, which is a lot of text over a
+# slow connection when only two squares changed. BoardDisplay remembers what each square
+# shows on screen and uses ANSI escape codes to move the cursor to just the changed ones.
+# The board stays at the top of the terminal; prompts and messages scroll underneath it.
+BOARD_SCREEN_LINES = 12  # Column labels, border, 8 ranks, border, legend
+
+def square_text(piece, highlighted):
+    """What one square shows: always one character wide, so squares never shift"""
+    if highlighted and piece == '.':
+        return f"{Colors.GREEN}{Colors.BOLD}●{Colors.RESET}"
+    if highlighted:
+        # Green background instead of print_board's [x] brackets, which would push the row sideways
+        return f"\033[42m{colorize_piece(piece)}{Colors.RESET}"
+    return colorize_piece(piece)
+
+SQUARE_TEXTS = {(piece, highlighted): square_text(piece, highlighted)
+                for piece in "PNBRQKpnbrqk." for highlighted in (False, True)}
+
+class BoardDisplay:
+    """Draws the board once, then rewrites only the squares that changed"""
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+        self.cells = None  # Text of each square as it is on screen (None = nothing drawn yet)
+        self.bytes_written = 0
+
+    def draw(self, highlighted_squares=None):
+        """Bring the board on screen up to date with one write"""
+        if highlighted_squares is None:
+            highlighted_squares = set()
+        texts = SQUARE_TEXTS
+        cells = [[texts[piece, (i, j) in highlighted_squares] for j, piece in enumerate(row)]
+                 for i, row in enumerate(board)]
+
+        if self.cells is None:
+            parts = self._full_frame(cells)
+        else:
+            parts = []
+            for i in range(8):
+                for j in range(8):
+                    if cells[i][j] != self.cells[i][j]:
+                        # Rank i is on screen line 3 + i, file j in column 5 + 2j (both counted from 1)
+                        parts.append(f"\033[{3 + i};{5 + 2 * j}H{cells[i][j]}")
+            if parts:
+                # Save the cursor, update the squares, put the cursor back at the prompt
+                parts = ["\0337"] + parts + ["\0338"]
+        self.cells = cells
+
+        if parts:
+            text = "".join(parts)
+            self.stream.write(text)
+            self.stream.flush()
+            self.bytes_written += len(text.encode("utf-8"))
+
+    def _full_frame(self, cells):
+        """Clear the screen and draw everything, leaving the cursor below the board"""
+        parts = ["\033[H\033[2J", "    a b c d e f g h\n", "  +----------------+\n"]
+        for i, row in enumerate(cells):
+            parts.append(f"{8 - i} | {' '.join(row)} |\n")
+        parts.append("  +----------------+\n")
+        parts.append(f"  {Colors.RED}■{Colors.RESET} = White pieces    {Colors.BLUE}■{Colors.RESET} = Black pieces"
+                     f"    {Colors.GREEN}●{Colors.RESET} = Available moves")
+        # Keep scrolling text below the board, so the board never moves
+        height = shutil.get_terminal_size().lines
+        if height > BOARD_SCREEN_LINES + 2:
+            parts.append(f"\033[{BOARD_SCREEN_LINES + 1};{height}r")
+        parts.append(f"\033[{BOARD_SCREEN_LINES + 1};1H")
+        return parts
+
+    def close(self):
+        """Give the whole terminal back to normal scrolling"""
+        if self.cells is not None:
+            self.stream.write(f"\033[r\033[{shutil.get_terminal_size().lines};1H\n")
+            self.stream.flush()
+
+display = None  # Set to a BoardDisplay to redraw in place instead of printing the board again
+
+def show_board(highlighted_squares=None):
+    """Show the board the chosen way (printed in full, or redrawn in place)"""
+    if display is not None:
+        display.draw(highlighted_squares)
+    else:
+        print_board(highlighted_squares)
 
 # COORDINATE CONVERSION FUNCTIONS
 def coord_to_index(s):
@@ -107,10 +234,25 @@ def path_clear(r1,c1,r2,c2):
 
 # MOVE GENERATION AND VALIDATION
 def legal_moves_from(r,c):
+    """Get all legal moves for a piece at position (r,c), using the cache when possible
+    
+    Returns a list of (row, col) tuples representing valid destination squares.
+    """
+    moves = move_cache.Get(board_hash, r * 8 + c)
+    if moves is None:
+        # The shared, table-driven generator every frontend uses; generate_moves_from
+        # below spells out the same rules step by step
+        moves = movegen.GenerateMoves(board, r, c)
+        move_cache.Put(board_hash, r * 8 + c, moves)
+    return moves
+
+def generate_moves_from(r,c):
     """Generate all legal moves for a piece at position (r,c)
     
     This is the core function that implements chess movement rules for each piece type.
     Returns a list of (row, col) tuples representing valid destination squares.
+    The game itself calls the faster chess_pygame.movegen; running
+    python -m chess_pygame.movegen checks that both agree.
     """
     piece = board[r][c]
     if piece == ".": return []  # No piece at this position
@@ -249,7 +391,7 @@ def show_piece_moves(piece_positions):
         all_moves.update(moves)
     
     # Display the board with highlighted available moves
-    print_board(all_moves)
+    show_board(all_moves)
     
     print("\nPiece details:")
     for i, (r, c) in enumerate(piece_positions):
@@ -297,18 +439,36 @@ def promote_if_needed(r,c):
         if (piece.isupper() and r == 0) or (piece.islower() and r == 7):
             # Promote to queen (keep same color)
             old_piece = colorize_piece(piece)
-            board[r][c] = 'Q' if piece.isupper() else 'q'
+            set_square(r, c, 'Q' if piece.isupper() else 'q')
             new_piece = colorize_piece(board[r][c])
             print(f"Pawn promoted! {old_piece} → {new_piece}")
 
 # MAIN GAME LOOP
-def main():
+def main(redraw_in_place=False, startup_profile=None):
+    """Start the game, optionally redrawing the board in place (see BoardDisplay)
+    
+    startup_profile (a chess_pygame.startup_profile.StartupProfile) prints how long
+    starting up took before the first board.
+    """
+    global display
+    if startup_profile is not None:
+        startup_profile.Report("main")
+    if redraw_in_place:
+        display = BoardDisplay()
+    try:
+        play()
+    finally:
+        if display is not None:
+            display.close()
+            display = None
+
+def play():
     """Main game loop - handles player turns and input processing"""
     turn_white = True  # White moves first in chess
     
     while True:
         # Display current board state
-        print_board()
+        show_board()
         
         # Prompt current player for input
         player = "White" if turn_white else "Black"
@@ -352,7 +512,7 @@ def main():
                             continue
                         
                         # Show the board with highlighted moves for the selected piece
-                        print_board(set(moves))
+                        show_board(set(moves))
                         
                         # Show selected piece and its moves
                         selected_piece = colorize_piece(board[r1][c1])
@@ -369,8 +529,8 @@ def main():
                                 continue
                                 
                             # Execute the move
-                            board[r2][c2] = board[r1][c1]  # Move piece to destination
-                            board[r1][c1] = "."             # Clear starting square
+                            set_square(r2, c2, board[r1][c1])  # Move piece to destination
+                            set_square(r1, c1, ".")             # Clear starting square
                             promote_if_needed(r2, c2)       # Handle pawn promotion
                             turn_white = not turn_white      # Switch turns
                             
@@ -415,14 +575,77 @@ def main():
                 continue
                 
             # Execute the move
-            board[r2][c2] = board[r1][c1]  # Move piece to destination
-            board[r1][c1] = "."             # Clear starting square
+            set_square(r2, c2, board[r1][c1])  # Move piece to destination
+            set_square(r1, c1, ".")             # Clear starting square
             promote_if_needed(r2,c2)        # Handle pawn promotion
             turn_white = not turn_white      # Switch turns
 
+# OUTPUT SIZE REPORT
+# A short opening where each move is first selected (board with highlights), then played
+SAMPLE_MOVES = ["e2e4", "e7e5", "g1f3", "b8c6", "f1c4", "g8f6", "d2d3", "f8c5", "b1c3", "d7d6"]
+
+def measure_board_output(moves=SAMPLE_MOVES):
+    """Count the bytes print_board and BoardDisplay write for the same moves
+    
+    Returns (print_board bytes, BoardDisplay bytes). The board is put back afterwards.
+    """
+    global board_hash
+    saved_board, saved_hash = [row[:] for row in board], board_hash
+    printed = io.StringIO()
+    redrawn = BoardDisplay(io.StringIO())
+    try:
+        for views in ("print", "redraw"):
+            board[:] = [row[:] for row in saved_board]
+            board_hash = saved_hash
+            for move in moves:
+                r1, c1 = coord_to_index(move[:2])
+                r2, c2 = coord_to_index(move[2:])
+                for highlighted in (set(legal_moves_from(r1, c1)), None):
+                    if views == "print":
+                        with contextlib.redirect_stdout(printed):
+                            print_board(highlighted)
+                    else:
+                        redrawn.draw(highlighted)
+                    if highlighted is not None:
+                        set_square(r2, c2, board[r1][c1])
+                        set_square(r1, c1, ".")
+                        promote_if_needed(r2, c2)
+    finally:
+        board[:] = saved_board
+        board_hash = saved_hash
+    return len(printed.getvalue().encode("utf-8")), redrawn.bytes_written
+
+def benchmark_print_board(repeats=20000):
+    """Time print_board into an in-memory stream, returns microseconds per board (plain, highlighted)"""
+    highlighted = set(legal_moves_from(7, 1)) | {(1, 2), (1, 4)}  # Empty squares and captures
+    timings = []
+    for squares in (None, highlighted):
+        stream = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(stream):
+            for _ in range(repeats):
+                print_board(squares)
+        timings.append((time.perf_counter() - start) / repeats * 1e6)
+    return tuple(timings)
+
+def report_board_output():
+    """Print how many bytes each way of showing the board costs per move"""
+    printed, redrawn = measure_board_output()
+    moves = len(SAMPLE_MOVES)
+    print(f"{moves} moves, each shown with highlights and then played:")
+    print(f"  print_board:  {printed:6} bytes ({printed / moves:.0f} per move)")
+    print(f"  BoardDisplay: {redrawn:6} bytes ({redrawn / moves:.0f} per move, including the first full frame)")
+
 # PROGRAM ENTRY POINT
 if __name__ == '__main__':
     """Start the chess game when script is run directly"""
+    if "--report-bytes" in sys.argv[1:]:
+        report_board_output()
+        sys.exit()
+    if "--benchmark-print" in sys.argv[1:]:
+        plain, highlighted = benchmark_print_board()
+        print(f"print_board to io.StringIO: {plain:.1f} µs per board, {highlighted:.1f} µs with highlights")
+        sys.exit()
     print("Welcome to Simple Terminal Chess!")
     print("Features:")
     print(f"- {Colors.RED}Red pieces{Colors.RESET} = White, {Colors.BLUE}Blue pieces{Colors.RESET} = Black")
@@ -430,5 +653,10 @@ if __name__ == '__main__':
     print("- Type piece letters (p/r/n/b/q/k) to see available pieces")
     print("- Or use traditional notation like 'e2 e4'")
     print("- Type 'quit' to exit")
+    print("- Start with --redraw to update the board in place instead of printing it again")
     print("\nLet's play!")
-    main()
+    startup_profile = None
+    if "--startup-profile" in sys.argv[1:]:
+        from chess_pygame.startup_profile import StartupProfile
+        startup_profile = StartupProfile()
+    main(redraw_in_place="--redraw" in sys.argv[1:], startup_profile=startup_profile)